@@ -0,0 +1,244 @@
+"""
+Per-article result cache.
+
+Top stories come back across topics and refreshes, and each time the fast
+pipeline would scrape them, spend LLM tokens summarizing them and score
+them again. This cache keeps each article's summary, sentiment, confidence
+and VADER compound score in SQLite, keyed by canonical URL plus a hash of
+the content:
+
+- ``fingerprint`` hashes what we know before scraping (headline and
+  publish date). A match skips scraping and summarization entirely.
+- ``content_hash`` hashes the scraped text. When the fingerprint changed
+  but the page did not (a retitled or re-dated story), the article was
+  scraped again but still skips the LLM.
+
+Entries expire after ``max_age`` seconds. Past ``max_entries`` the least
+recently used entries are evicted.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from news_crew.paths import local_store_path
+from news_crew.urls import canonical_url
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS article_results (
+    url_key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    content_hash TEXT,
+    summary TEXT NOT NULL,
+    sentiment TEXT,
+    confidence REAL,
+    compound REAL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_article_results_last_used ON article_results (last_used);
+"""
+
+_RESULT_FIELDS = ("summary", "sentiment", "confidence", "compound")
+
+
+def _sha256(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def fingerprint(article: Dict[str, Any]) -> str:
+    """Hash of the article metadata known before scraping."""
+    return _sha256(
+        (article.get("headline") or "").strip(),
+        (article.get("publish_date") or "").strip(),
+    )
+
+
+def content_hash(content: str) -> str:
+    return _sha256(" ".join(content.split()))
+
+
+class ArticleCache:
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        max_age: float = 7 * 24 * 3600,
+        max_entries: int = 50000,
+    ):
+        self.path = str(path)
+        self.max_age = max_age
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(article_results)")
+        }
+        if "compound" not in columns:
+            # Caches created before compound scores were kept
+            self._conn.execute("ALTER TABLE article_results ADD COLUMN compound REAL")
+        self._conn.commit()
+
+        self._hits = 0
+        self._content_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # ---------------- Lookups ----------------
+    def _lookup(
+        self, articles: List[Dict[str, Any]], field: str, key_fn
+    ) -> Dict[str, Dict[str, Any]]:
+        wanted = {}
+        for a in articles:
+            url = a.get("url") or ""
+            url_key = canonical_url(url)
+            if url_key:
+                wanted[url_key] = (url, key_fn(a))
+        if not wanted:
+            return {}
+
+        now = time.time()
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            keys = list(wanted)
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                rows = self._conn.execute(
+                    f"SELECT url_key, {field}, {', '.join(_RESULT_FIELDS)} "
+                    "FROM article_results WHERE created_at >= ? "
+                    f"AND url_key IN ({','.join('?' * len(chunk))})",
+                    [now - self.max_age, *chunk],
+                ).fetchall()
+                for url_key, stored_key, *result in rows:
+                    url, expected = wanted[url_key]
+                    if stored_key == expected:
+                        found[url] = dict(zip(_RESULT_FIELDS, result))
+            if found:
+                self._conn.executemany(
+                    "UPDATE article_results SET last_used = ? WHERE url_key = ?",
+                    [(now, canonical_url(url)) for url in found],
+                )
+                self._conn.commit()
+        return found
+
+    def get_many(self, articles: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Cached results ({summary, sentiment, confidence, compound}) by article
+        URL for articles whose URL and fingerprint match a live entry.
+        """
+        found = self._lookup(articles, "fingerprint", fingerprint)
+        with self._lock:
+            self._hits += len(found)
+            self._misses += len(articles) - len(found)
+        return found
+
+    def get_many_by_content(
+        self, articles: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Like get_many, for scraped articles, matching on their "content" hash."""
+        with_content = [a for a in articles if a.get("content")]
+        found = self._lookup(
+            with_content, "content_hash", lambda a: content_hash(a["content"])
+        )
+        with self._lock:
+            # These were counted as misses by get_many
+            self._content_hits += len(found)
+            self._misses -= len(found)
+        return found
+
+    # ---------------- Writes ----------------
+    def put_many(self, articles: Iterable[Dict[str, Any]]) -> int:
+        """Store summarized + scored articles. Returns how many were written."""
+        now = time.time()
+        rows = []
+        for a in articles:
+            url_key = canonical_url(a.get("url") or "")
+            if not url_key or not a.get("summary"):
+                continue
+            rows.append(
+                (
+                    url_key,
+                    fingerprint(a),
+                    content_hash(a["content"]) if a.get("content") else None,
+                    a["summary"],
+                    a.get("sentiment"),
+                    a.get("confidence"),
+                    a.get("compound"),
+                    now,
+                    now,
+                )
+            )
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO article_results (url_key, fingerprint, "
+                "content_hash, summary, sentiment, confidence, compound, created_at, "
+                "last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._evict(now)
+        return len(rows)
+
+    def _evict(self, now: float) -> None:
+        # Caller holds self._lock inside a transaction
+        expired = self._conn.execute(
+            "DELETE FROM article_results WHERE created_at < ?", (now - self.max_age,)
+        ).rowcount
+        over = self._conn.execute(
+            "DELETE FROM article_results WHERE url_key IN ("
+            "SELECT url_key FROM article_results ORDER BY last_used DESC "
+            "LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        self._evictions += expired + over
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM article_results")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM article_results"
+            ).fetchone()[0]
+            lookups = self._hits + self._content_hits + self._misses
+            return {
+                "hits": self._hits,
+                "content_hits": self._content_hits,
+                "misses": self._misses,
+                "hit_rate": (
+                    round((self._hits + self._content_hits) / lookups, 3)
+                    if lookups
+                    else 0.0
+                ),
+                "evictions": self._evictions,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "max_age": self.max_age,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _configured_cache() -> Optional[ArticleCache]:
+    if os.getenv("NEWS_ARTICLE_CACHE", "1") != "1":
+        return None
+    return ArticleCache(
+        os.getenv("NEWS_ARTICLE_CACHE_PATH")
+        or local_store_path("article_cache.sqlite3"),
+        max_age=float(os.getenv("NEWS_ARTICLE_CACHE_MAX_AGE", str(7 * 24 * 3600))),
+        max_entries=int(os.getenv("NEWS_ARTICLE_CACHE_MAX_ENTRIES", "50000")),
+    )
+
+
+# Shared by every pipeline run in this process; None when disabled
+article_cache = _configured_cache()
@@ -0,0 +1,664 @@
+"""
+Persistent article store.
+
+Every finished pipeline run upserts its articles into one SQLite database.
+Writes go through one connection; reads use a small pool of read-only
+connections, so in WAL mode API reads never wait on a writer (an in-memory
+store has only the one connection). Rows are keyed
+by canonical URL, so the same story fetched under different topics or runs
+is stored once and simply linked to each topic it appeared under.
+Headline, summary and source are indexed with FTS5 for full-text search;
+topic, source and publish_date have ordinary indexes for filtering and
+sorting. Each topic also has a versioned feed, so clients can fetch only
+what changed, and hourly/daily sentiment rollups per topic and per source,
+kept up to date as articles are written, so trend charts never rescan the
+articles.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from news_crew.paths import local_store_path
+from news_crew.result_cache import normalize_topic
+from news_crew.urls import canonical_url
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    headline TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    sentiment TEXT,
+    confidence REAL,
+    compound REAL,
+    source TEXT NOT NULL DEFAULT '',
+    publish_date TEXT NOT NULL DEFAULT '',
+    also_reported_by TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source);
+CREATE INDEX IF NOT EXISTS idx_articles_publish_date ON articles (publish_date);
+
+CREATE TABLE IF NOT EXISTS article_topics (
+    topic TEXT NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (topic, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_article_topics_article ON article_topics (article_id);
+"""
+
+# External-content FTS table kept in sync by triggers
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+    headline, summary, source, content='articles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, headline, summary, source)
+    VALUES (new.id, new.headline, new.summary, new.source);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, headline, summary, source)
+    VALUES ('delete', old.id, old.headline, old.summary, old.source);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, headline, summary, source)
+    VALUES ('delete', old.id, old.headline, old.summary, old.source);
+    INSERT INTO articles_fts (rowid, headline, summary, source)
+    VALUES (new.id, new.headline, new.summary, new.source);
+END;
+"""
+
+# Per-topic feed: an article gets a new, globally increasing version when it
+# is first linked to a topic and whenever its content changes, so "version >
+# N" is everything a client that has seen version N is missing
+_FEED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS topic_feed (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    added_at REAL NOT NULL,
+    UNIQUE (topic, article_id)
+);
+CREATE INDEX IF NOT EXISTS idx_topic_feed_article ON topic_feed (article_id);
+-- Stores created before the feed existed: one version per existing link
+INSERT OR IGNORE INTO topic_feed (topic, article_id, added_at)
+SELECT topic, article_id, last_seen FROM article_topics
+WHERE NOT EXISTS (SELECT 1 FROM topic_feed)
+ORDER BY last_seen;
+"""
+
+# A change to any of these gives the article a new feed version
+_FEED_CONTENT = "id, headline, summary, sentiment, url"
+
+# Sentiment per time bucket, for dimension "topic" (normalized topic) or
+# "source". Sums rather than means, so an article's contribution can be added
+# and later taken back out when it is re-scored.
+_ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sentiment_rollups (
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL COLLATE NOCASE,
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    positive INTEGER NOT NULL DEFAULT 0,
+    neutral INTEGER NOT NULL DEFAULT 0,
+    negative INTEGER NOT NULL DEFAULT 0,
+    compound_sum REAL NOT NULL DEFAULT 0,
+    confidence_sum REAL NOT NULL DEFAULT 0,
+    confidence_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, key, granularity, bucket)
+) WITHOUT ROWID;
+"""
+
+_ROLLUP_ADD = """
+INSERT INTO sentiment_rollups (
+    dimension, key, granularity, bucket, positive, neutral, negative,
+    compound_sum, confidence_sum, confidence_count
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (dimension, key, granularity, bucket) DO UPDATE SET
+    positive = positive + excluded.positive,
+    neutral = neutral + excluded.neutral,
+    negative = negative + excluded.negative,
+    compound_sum = compound_sum + excluded.compound_sum,
+    confidence_sum = confidence_sum + excluded.confidence_sum,
+    confidence_count = confidence_count + excluded.confidence_count
+"""
+
+ROLLUP_DIMENSIONS = ("topic", "source")
+ROLLUP_GRANULARITIES = ("hour", "day")
+_SENTIMENTS = ("positive", "neutral", "negative")
+
+# Fields a feed request may project to (see ArticleStore.feed)
+FEED_FIELDS = (
+    "headline",
+    "summary",
+    "sentiment",
+    "confidence",
+    "compound",
+    "source",
+    "url",
+    "publish_date",
+    "also_reported_by",
+    "first_seen",
+    "last_seen",
+)
+
+_UPSERT = """
+INSERT INTO articles (
+    url_key, url, headline, summary, sentiment, confidence, compound, source,
+    publish_date, also_reported_by, first_seen, last_seen
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (url_key) DO UPDATE SET
+    url = excluded.url,
+    headline = excluded.headline,
+    summary = CASE WHEN excluded.summary != '' THEN excluded.summary ELSE summary END,
+    sentiment = COALESCE(excluded.sentiment, sentiment),
+    confidence = COALESCE(excluded.confidence, confidence),
+    compound = COALESCE(excluded.compound, compound),
+    source = excluded.source,
+    publish_date = CASE WHEN excluded.publish_date != '' THEN excluded.publish_date
+                        ELSE publish_date END,
+    also_reported_by = COALESCE(excluded.also_reported_by, also_reported_by),
+    last_seen = excluded.last_seen
+"""
+
+_COLUMNS = (
+    "a.id, a.url, a.headline, a.summary, a.sentiment, a.confidence, a.compound, "
+    "a.source, "
+    "a.publish_date, a.also_reported_by, a.first_seen, a.last_seen"
+)
+
+_FTS_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word must match, the last one
+    as a prefix (so "electric veh" finds "electric vehicles").
+    """
+    tokens = _FTS_TOKEN_RE.findall(text)
+    if not tokens:
+        return ""
+    quoted = [f'"{t}"' for t in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+class ArticleStore:
+    def __init__(self, path: Union[str, os.PathLike], max_readers: int = 8):
+        self.path = str(path)
+        self.max_readers = max_readers
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}
+        if "compound" not in columns:
+            # Stores created before the sentiment rollups
+            self._conn.execute("ALTER TABLE articles ADD COLUMN compound REAL")
+        self._conn.executescript(_FEED_SCHEMA)
+        self._conn.executescript(_ROLLUP_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE
+            self.has_fts = False
+        self._conn.commit()
+        with self._lock, self._conn:
+            self._backfill_rollups()
+
+        # Idle read-only connections, at most max_readers of them. Another
+        # connection to an in-memory database would open a new, empty one.
+        self._shared_reads = self.path in ("", ":memory:")
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """
+        A read-only connection for one query. In WAL mode it reads the last
+        committed state without waiting for self._lock or a running write.
+        """
+        if self._shared_reads:
+            with self._lock:
+                yield self._conn
+            return
+        with self._readers_lock:
+            conn = self._readers.pop() if self._readers else None
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=ON")
+        try:
+            yield conn
+        finally:
+            with self._readers_lock:
+                keep = len(self._readers) < self.max_readers
+                if keep:
+                    self._readers.append(conn)
+            if not keep:
+                conn.close()
+
+    # ---------------- Writes ----------------
+    def upsert_many(
+        self, articles: Iterable[Dict[str, Any]], topic: Optional[str] = None
+    ) -> int:
+        """
+        Insert or update articles in one transaction, keyed by canonical URL,
+        and link them to ``topic``. Returns the number of articles written.
+        """
+        now = time.time()
+        rows = []
+        for a in articles:
+            url = a.get("url") or ""
+            key = canonical_url(url)
+            if not key:
+                continue
+            also = a.get("also_reported_by")
+            rows.append(
+                (
+                    key,
+                    url,
+                    a.get("headline") or "",
+                    a.get("summary") or "",
+                    a.get("sentiment"),
+                    a.get("confidence"),
+                    a.get("compound"),
+                    a.get("source") or "",
+                    a.get("publish_date") or "",
+                    json.dumps(also) if also else None,
+                    now,
+                    now,
+                )
+            )
+        if not rows:
+            return 0
+
+        topic_key = normalize_topic(topic) if topic else None
+        keys = [row[0] for row in rows]
+        with self._lock, self._conn:
+            before = self._snapshot(keys)
+            self._conn.executemany(_UPSERT, rows)
+            if topic_key:
+                self._conn.executemany(
+                    "INSERT INTO article_topics (topic, article_id, last_seen) "
+                    "SELECT ?, id, ? FROM articles WHERE url_key = ? "
+                    "ON CONFLICT (topic, article_id) DO UPDATE SET last_seen = excluded.last_seen",
+                    [(topic_key, now, row[0]) for row in rows],
+                )
+                self._conn.executemany(
+                    "INSERT INTO topic_feed (topic, article_id, added_at) "
+                    "SELECT ?, id, ? FROM articles WHERE url_key = ? "
+                    "ON CONFLICT (topic, article_id) DO NOTHING",
+                    [(topic_key, now, row[0]) for row in rows],
+                )
+            after = self._snapshot(keys)
+            self._bump_feed_versions(
+                [
+                    i
+                    for i, state in after.items()
+                    if i in before and before[i]["content"] != state["content"]
+                ]
+            )
+            self._add_rollups(before.values(), after.values())
+        return len(rows)
+
+    def _snapshot(self, keys: Optional[List[str]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Per article id: its feed content and what it adds to the sentiment
+        rollups. All articles when ``keys`` is None. Caller holds self._lock.
+        """
+        sql = (
+            f"SELECT {_FEED_CONTENT}, compound, confidence, source, publish_date, "
+            "first_seen, (SELECT group_concat(topic, char(31)) FROM article_topics "
+            "WHERE article_id = articles.id) AS topics FROM articles"
+        )
+        if keys is None:
+            queries = [(sql, [])]
+        else:
+            queries = [
+                (f"{sql} WHERE url_key IN ({','.join('?' * len(chunk))})", chunk)
+                for chunk in (keys[i : i + 500] for i in range(0, len(keys), 500))
+            ]
+        snapshot = {}
+        for query, params in queries:
+            for row in self._conn.execute(query, params):
+                snapshot[row["id"]] = {
+                    "content": tuple(row)[:5],
+                    "rollups": _rollup_contributions(row),
+                }
+        return snapshot
+
+    def _add_rollups(
+        self,
+        before: Iterable[Dict[str, Any]],
+        after: Iterable[Dict[str, Any]],
+    ) -> None:
+        # Caller holds self._lock, inside a transaction. Applies the
+        # difference, so rewriting an unchanged article is a no-op.
+        delta: Dict[tuple, List[float]] = defaultdict(lambda: [0] * 6)
+        for states, sign in ((before, -1), (after, 1)):
+            for state in states:
+                for bucket, values in state["rollups"]:
+                    totals = delta[bucket]
+                    for i, value in enumerate(values):
+                        totals[i] += sign * value
+        self._conn.executemany(
+            _ROLLUP_ADD,
+            [(*bucket, *totals) for bucket, totals in delta.items() if any(totals)],
+        )
+
+    def _backfill_rollups(self) -> None:
+        # Caller holds self._lock, inside a transaction. Stores created
+        # before the rollups: count every article once.
+        if self._conn.execute("SELECT 1 FROM sentiment_rollups LIMIT 1").fetchone():
+            return
+        self._add_rollups((), self._snapshot().values())
+
+    def _bump_feed_versions(self, article_ids: List[int]) -> None:
+        # Caller holds self._lock, inside a transaction. Re-inserting the
+        # feed rows gives them new, higher versions.
+        for article_id in article_ids:
+            entries = self._conn.execute(
+                "SELECT topic, added_at FROM topic_feed WHERE article_id = ?",
+                (article_id,),
+            ).fetchall()
+            self._conn.execute(
+                "DELETE FROM topic_feed WHERE article_id = ?", (article_id,)
+            )
+            self._conn.executemany(
+                "INSERT INTO topic_feed (topic, article_id, added_at) VALUES (?, ?, ?)",
+                [(topic, article_id, added_at) for topic, added_at in entries],
+            )
+
+    # ---------------- Reads ----------------
+    def search(
+        self,
+        query: Optional[str] = None,
+        topic: Optional[str] = None,
+        source: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Articles matching every given filter. With ``query`` results are ranked
+        by FTS relevance, otherwise newest first. ``since``/``until`` compare
+        against publish_date (ISO-8601 strings).
+        """
+        joins: List[str] = []
+        where: List[str] = []
+        params: List[Any] = []
+        order = "a.publish_date DESC, a.id DESC"
+
+        fts = _fts_query(query) if query else ""
+        if fts and self.has_fts:
+            joins.append("JOIN articles_fts f ON f.rowid = a.id")
+            where.append("articles_fts MATCH ?")
+            params.append(fts)
+            order = "bm25(articles_fts), a.publish_date DESC"
+        elif query:
+            where.append("(a.headline LIKE ? OR a.summary LIKE ?)")
+            params += [f"%{query}%", f"%{query}%"]
+
+        if topic:
+            joins.append("JOIN article_topics t ON t.article_id = a.id")
+            where.append("t.topic = ?")
+            params.append(normalize_topic(topic))
+        if source:
+            where.append("a.source = ? COLLATE NOCASE")
+            params.append(source)
+        if sentiment:
+            where.append("a.sentiment = ? COLLATE NOCASE")
+            params.append(sentiment)
+        if since:
+            where.append("a.publish_date >= ?")
+            params.append(since)
+        if until:
+            where.append("a.publish_date <= ?")
+            params.append(until)
+
+        sql = f"SELECT {_COLUMNS} FROM articles a {' '.join(joins)}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ? OFFSET ?"
+        params += [limit, offset]
+
+        with self._read() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [_row_to_article(r) for r in rows]
+
+    def feed_version(self, topic: str) -> int:
+        """The topic's current feed version (0 before anything was stored)."""
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT MAX(version) FROM topic_feed WHERE topic = ?",
+                (normalize_topic(topic),),
+            ).fetchone()
+        return row[0] or 0
+
+    def feed(
+        self,
+        topic: str,
+        since: int = 0,
+        cursor: Optional[int] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        A page of the topic's feed, newest version first: articles added or
+        changed after version ``since`` and, when paging, below ``cursor``.
+        Each carries its "version". Returns (articles, next cursor or None).
+        """
+        where = ["t.topic = ?", "t.version > ?"]
+        params: List[Any] = [normalize_topic(topic), since]
+        if cursor is not None:
+            where.append("t.version < ?")
+            params.append(cursor)
+        with self._read() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS}, t.version FROM topic_feed t "
+                "JOIN articles a ON a.id = t.article_id "
+                f"WHERE {' AND '.join(where)} ORDER BY t.version DESC LIMIT ?",
+                [*params, limit + 1],
+            ).fetchall()
+        articles = [_row_to_article(r) for r in rows[:limit]]
+        next_cursor = articles[-1]["version"] if len(rows) > limit else None
+        return articles, next_cursor
+
+    def sentiment_timeseries(
+        self,
+        dimension: str,
+        key: str,
+        granularity: str = "day",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Sentiment per ``granularity`` bucket for one topic or source, oldest
+        first: counts per sentiment, total, and mean compound and confidence
+        (None when nothing was scored). Buckets are UTC ISO-8601 start times,
+        by publish date (first seen when it has none). Empty buckets are
+        left out.
+        """
+        if dimension not in ROLLUP_DIMENSIONS:
+            raise ValueError(f"Unknown dimension {dimension!r}")
+        if granularity not in ROLLUP_GRANULARITIES:
+            raise ValueError(f"Unknown granularity {granularity!r}")
+        where = ["dimension = ?", "key = ?", "granularity = ?"]
+        params: List[Any] = [
+            dimension,
+            normalize_topic(key) if dimension == "topic" else key.strip(),
+            granularity,
+        ]
+        if since is not None:
+            where.append("bucket >= ?")
+            params.append(_bucket_starts(since)[granularity])
+        if until is not None:
+            where.append("bucket <= ?")
+            params.append(_bucket_starts(until)[granularity])
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT bucket, positive, neutral, negative, compound_sum, "
+                "confidence_sum, confidence_count FROM sentiment_rollups "
+                f"WHERE {' AND '.join(where)} ORDER BY bucket",
+                params,
+            ).fetchall()
+
+        series = []
+        for row in rows:
+            count = row["positive"] + row["neutral"] + row["negative"]
+            if count <= 0:
+                continue
+            series.append(
+                {
+                    "bucket": row["bucket"],
+                    "positive": row["positive"],
+                    "neutral": row["neutral"],
+                    "negative": row["negative"],
+                    "count": count,
+                    "mean_compound": round(row["compound_sum"] / count, 4),
+                    "mean_confidence": (
+                        round(row["confidence_sum"] / row["confidence_count"], 4)
+                        if row["confidence_count"] > 0
+                        else None
+                    ),
+                }
+            )
+        return series
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._read() as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM articles a WHERE a.url_key = ?",
+                (canonical_url(url),),
+            ).fetchone()
+        return _row_to_article(row) if row else None
+
+    def get_many(self, urls: Iterable[str]) -> List[Dict[str, Any]]:
+        """Stored articles for ``urls`` (unknown URLs are skipped)."""
+        keys = list(dict.fromkeys(canonical_url(u) for u in urls))
+        return self._select_in("a.url_key", keys)
+
+    def by_ids(self, ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        return {a["id"]: a for a in self._select_in("a.id", list(ids))}
+
+    def _select_in(self, column: str, values: List[Any]) -> List[Dict[str, Any]]:
+        rows = []
+        with self._read() as conn:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(values), 500):
+                chunk = values[i : i + 500]
+                rows += conn.execute(
+                    f"SELECT {_COLUMNS} FROM articles a "
+                    f"WHERE {column} IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+        return [_row_to_article(r) for r in rows]
+
+    def topics(self, url: str) -> List[str]:
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT t.topic FROM article_topics t JOIN articles a ON a.id = t.article_id "
+                "WHERE a.url_key = ? ORDER BY t.last_seen DESC",
+                (canonical_url(url),),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._read() as conn:
+            articles = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            topics = conn.execute(
+                "SELECT COUNT(DISTINCT topic) FROM article_topics"
+            ).fetchone()[0]
+        return {"articles": articles, "topics": topics, "full_text": self.has_fts}
+
+    def close(self) -> None:
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        with self._lock:
+            self._conn.close()
+
+
+def _bucket_starts(moment: datetime) -> Dict[str, str]:
+    moment = moment.astimezone(timezone.utc)
+    return {
+        "hour": moment.strftime("%Y-%m-%dT%H:00:00Z"),
+        "day": moment.strftime("%Y-%m-%dT00:00:00Z"),
+    }
+
+
+def _published_at(publish_date: str, first_seen: float) -> datetime:
+    try:
+        moment = datetime.fromisoformat(publish_date.strip().replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return datetime.fromtimestamp(first_seen, timezone.utc)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def _rollup_contributions(row: sqlite3.Row) -> List[Tuple[tuple, tuple]]:
+    """
+    (rollup bucket, (positive, neutral, negative, compound, confidence,
+    confidence count)) for every bucket a stored article counts in.
+    """
+    sentiment = (row["sentiment"] or "").strip().lower()
+    if sentiment not in _SENTIMENTS:
+        return []
+    confidence = row["confidence"]
+    compound = row["compound"]
+    if compound is None:
+        # Scored without a compound (LLM sentiment, summary cache entries
+        # from before it kept compound): the confidence is its magnitude
+        sign = {"positive": 1, "neutral": 0, "negative": -1}[sentiment]
+        compound = sign * (confidence or 0.0)
+    values = (
+        int(sentiment == "positive"),
+        int(sentiment == "neutral"),
+        int(sentiment == "negative"),
+        compound,
+        confidence or 0.0,
+        int(confidence is not None),
+    )
+
+    keys = [("topic", t) for t in (row["topics"] or "").split("\x1f") if t]
+    if row["source"]:
+        keys.append(("source", row["source"].strip()))
+    starts = _bucket_starts(_published_at(row["publish_date"], row["first_seen"]))
+    return [
+        ((dimension, key, granularity, starts[granularity]), values)
+        for dimension, key in keys
+        for granularity in ROLLUP_GRANULARITIES
+    ]
+
+
+def _row_to_article(row: sqlite3.Row) -> Dict[str, Any]:
+    article = dict(row)
+    also = article.pop("also_reported_by")
+    if also:
+        article["also_reported_by"] = json.loads(also)
+    return article
+
+
+# Shared by the pipeline (writes) and the API (reads)
+article_store = ArticleStore(
+    os.getenv("NEWS_ARTICLE_DB") or local_store_path("articles.sqlite3")
+)
@@ -0,0 +1,8 @@
+"""
+End-to-end benchmark harness.
+
+Runs the pipeline, /api/news and /api/news-stream against local fakes of
+GNews, Ollama, the article pages and the LLM (see news_crew.bench.fakes) and
+reports latency percentiles, per-stage timings, throughput and peak RSS as
+JSON. Usage: ``python -m news_crew.bench --help``.
+"""
@@ -0,0 +1,4 @@
+from news_crew.bench.harness import main
+
+if __name__ == "__main__":
+    main()
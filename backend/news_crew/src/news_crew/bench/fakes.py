@@ -0,0 +1,316 @@
+"""
+Local stand-ins for every external service the pipeline talks to.
+
+Each fake is a small threaded HTTP server on 127.0.0.1 with a configurable
+per-request latency, and answers deterministically, so runs are comparable
+across commits and cost nothing:
+
+- FakeGNews:  /api/v4/top-headlines and /api/v4/search
+- FakeOllama: /api/embeddings (and the batch /api/embed)
+- FakePages:  /article/<n>, an HTML news page (run several, one per
+  loopback address, so per-domain scraping limits behave as with real sites)
+- FakeLLM:    /v1/chat/completions (OpenAI-compatible) with canned answers,
+  streamed as server-sent events when the request asks for "stream"
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+_WORDS = (
+    "market policy energy climate election court health science storm vote "
+    "rates trade tech budget rally talks report study launch deal"
+).split()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: "FakeServer"
+
+    def log_message(self, format, *args):  # keep benchmark output clean
+        pass
+
+    def _reply(self, status: int, body: Any, content_type="application/json"):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        parts = urlsplit(self.path)
+        self.fake.count_request()
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        status, payload, content_type = self.fake.handle(
+            method, parts.path, parse_qs(parts.query), body
+        )
+        self._reply(status, payload, content_type)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+class FakeServer:
+    """Base class: serve ``handle`` on an ephemeral port in a daemon thread."""
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1"):
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self.httpd = ThreadingHTTPServer((host, 0), handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            name=type(self).__name__,
+            daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> "FakeServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, List[str]], body: bytes
+    ) -> Tuple[int, Any, str]:
+        raise NotImplementedError
+
+
+def _seed(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+
+class FakeGNews(FakeServer):
+    """
+    Articles are drawn from a fixed pool of ``article_pool`` stories, picked
+    by a hash of the query, so different topics and search variants overlap
+    the way real coverage does.
+    """
+
+    def __init__(
+        self, pages_urls: List[str], article_pool: int = 200, latency: float = 0.05
+    ):
+        super().__init__(latency)
+        self.pages_urls = pages_urls
+        self.article_pool = article_pool
+
+    def article(self, n: int) -> Dict[str, Any]:
+        words = [_WORDS[(n * 7 + i * 3) % len(_WORDS)] for i in range(6)]
+        return {
+            "title": f"Story {n}: {' '.join(words).capitalize()}",
+            "description": f"Coverage of {' and '.join(words[:3])} (story {n}).",
+            "url": f"{self.pages_urls[n % len(self.pages_urls)]}/article/{n}",
+            "publishedAt": f"2026-01-{n % 28 + 1:02d}T{n % 24:02d}:00:00Z",
+            "source": {"name": f"Outlet {n % 12}"},
+        }
+
+    def handle(self, method, path, query, body):
+        if path not in ("/api/v4/top-headlines", "/api/v4/search"):
+            return 404, {"errors": ["not found"]}, "application/json"
+        q = query.get("q", [""])[0]
+        count = int(query.get("max", ["10"])[0])
+        start = _seed(f"{path}|{q}|{query.get('from', [''])[0]}") % self.article_pool
+        articles = [
+            self.article((start + i * 3) % self.article_pool) for i in range(count)
+        ]
+        return (
+            200,
+            {"totalArticles": len(articles), "articles": articles},
+            "application/json",
+        )
+
+
+class FakeOllama(FakeServer):
+    """Deterministic bag-of-words embeddings of ``dim`` dimensions."""
+
+    def __init__(self, dim: int = 1024, latency: float = 0.01):
+        super().__init__(latency)
+        self.dim = dim
+
+    def embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for word in re.findall(r"\w+", text.lower()):
+            vector[_seed(word) % self.dim] += 1.0
+        return vector
+
+    def handle(self, method, path, query, body):
+        payload = json.loads(body or b"{}")
+        if path == "/api/embeddings":
+            return (
+                200,
+                {"embedding": self.embed(payload.get("prompt", ""))},
+                "application/json",
+            )
+        if path == "/api/embed":
+            texts = payload.get("input", [])
+            texts = [texts] if isinstance(texts, str) else texts
+            return (
+                200,
+                {"embeddings": [self.embed(t) for t in texts]},
+                "application/json",
+            )
+        return 404, {"error": "not found"}, "application/json"
+
+
+class FakePages(FakeServer):
+    """HTML article pages of ``paragraphs`` paragraphs with some boilerplate."""
+
+    def __init__(
+        self, paragraphs: int = 12, latency: float = 0.1, host: str = "127.0.0.1"
+    ):
+        super().__init__(latency, host)
+        self.paragraphs = paragraphs
+
+    def handle(self, method, path, query, body):
+        match = re.fullmatch(r"/article/(\d+)", path)
+        if not match:
+            return 404, b"<html><body>Not found</body></html>", "text/html"
+        n = int(match.group(1))
+        paragraphs = "".join(
+            f"<p>Paragraph {i} of story {n}: officials said the "
+            f"{_WORDS[(n + i) % len(_WORDS)]} outlook improved while analysts "
+            f"warned of {_WORDS[(n * i + 5) % len(_WORDS)]} risks ahead.</p>"
+            for i in range(self.paragraphs)
+        )
+        page = (
+            "<html><head><title>Story</title><script>var ads = 1;</script></head>"
+            "<body><nav>Home | World | Business</nav>"
+            f"<article><h1>Story {n}</h1>{paragraphs}</article>"
+            "<footer>Copyright</footer></body></html>"
+        )
+        return 200, page.encode("utf-8"), "text/html; charset=utf-8"
+
+
+class FakeLLM(FakeServer):
+    """
+    OpenAI-compatible chat completions with canned answers. When the prompt
+    contains a JSON array of articles, the answer echoes it back with a
+    summary (and sentiment) per article, which is what every task expects.
+    """
+
+    def __init__(self, latency: float = 0.5):
+        super().__init__(latency)
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    @staticmethod
+    def _find_articles(prompt: str) -> Optional[List[Dict[str, Any]]]:
+        decoder = json.JSONDecoder()
+        for match in re.finditer(r"\[\s*\{", prompt):
+            try:
+                value, _ = decoder.raw_decode(prompt, match.start())
+            except ValueError:
+                continue
+            if isinstance(value, list) and all(
+                isinstance(v, dict) and "url" in v for v in value
+            ):
+                return value
+        return None
+
+    def answer(self, prompt: str) -> str:
+        if "quality" in prompt and "entities" in prompt:
+            # CrewAI's post-task evaluation (long-term memory)
+            return json.dumps({"suggestions": [], "quality": 8, "entities": []})
+
+        articles = self._find_articles(prompt) or []
+        answer = [
+            {
+                "headline": a.get("headline", ""),
+                "source": a.get("source", ""),
+                "url": a.get("url", ""),
+                "publish_date": a.get("publish_date", ""),
+                "summary": f"{a.get('headline', 'The story')} was reported by "
+                f"{a.get('source', 'the outlet')}; officials expect steady progress.",
+                "sentiment": "positive",
+                "confidence": 0.6,
+            }
+            for a in articles
+        ]
+        return (
+            "Thought: I now can give a great answer\n"
+            f"Final Answer: {json.dumps(answer)}"
+        )
+
+    def handle(self, method, path, query, body):
+        if not path.endswith("/chat/completions"):
+            return 404, {"error": {"message": "not found"}}, "application/json"
+        payload = json.loads(body or b"{}")
+        prompt = "\n".join(
+            m.get("content") or ""
+            for m in payload.get("messages", [])
+            if isinstance(m.get("content"), str)
+        )
+        content = self.answer(prompt)
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        with self._lock:
+            self.prompt_tokens += usage["prompt_tokens"]
+            self.completion_tokens += usage["completion_tokens"]
+        if payload.get("stream"):
+            return 200, self._stream(payload, content, usage), "text/event-stream"
+        return (
+            200,
+            {
+                "id": f"chatcmpl-{self.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "bench"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            },
+            "application/json",
+        )
+
+    def _stream(self, payload: Dict[str, Any], content: str, usage: Dict) -> bytes:
+        """The answer as OpenAI stream chunks of 16 characters, then usage."""
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None):
+            return {
+                "id": f"chatcmpl-{self.requests}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": payload.get("model", "bench"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+
+        events = [chunk({"role": "assistant", "content": ""})]
+        events += [
+            chunk({"content": content[i : i + 16]}) for i in range(0, len(content), 16)
+        ]
+        events.append(chunk({}, "stop"))
+        events.append({**chunk({}), "choices": [], "usage": usage})
+        body = "".join(f"data: {json.dumps(e)}\n\n" for e in events)
+        return (body + "data: [DONE]\n\n").encode("utf-8")
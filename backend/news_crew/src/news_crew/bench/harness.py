@@ -0,0 +1,382 @@
+"""
+Benchmark driver.
+
+Every external service is replaced by a local fake and all state (caches,
+article store, vector index, CrewAI memory) goes to a temporary directory,
+so a run is isolated from the developer's data and repeatable. The fakes
+are configured through the same environment variables the app reads, which
+is why news_crew modules are only imported once they are running.
+
+Targets:
+    pipeline  run_news_pipeline() called directly from a thread pool
+    api       GET /api/news on an in-process uvicorn server
+    stream    GET /api/news-stream on the same server (SSE)
+
+Output (stdout or --output) is one JSON document:
+    {"config": {...}, "git_commit": str, "targets": {name: {
+        "requests", "errors", "wall_s", "throughput_rps",
+        "latency_ms": {p50, p90, p99, max, mean},
+        "first_article_ms": {...}        # stream only
+        "stages": {stage: {count, p50, p90, p99, max, mean}},
+        "peak_rss_mb"}},
+     "fakes": {name: requests served}}
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from news_crew.bench.fakes import FakeGNews, FakeLLM, FakeOllama, FakePages
+
+TARGETS = ("pipeline", "api", "stream")
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+    return {
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 2),
+        "mean": round(sum(ordered) / len(ordered), 2),
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux (bytes on macOS)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class StageRecorder:
+    """Collects stage_completed durations from progress events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, List[float]] = {}
+
+    def record(self, event: Dict[str, Any]) -> None:
+        if event.get("type") == "stage_completed" and "duration_ms" in event:
+            with self._lock:
+                self.stages.setdefault(event["stage"], []).append(event["duration_ms"])
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {"count": len(values), **percentiles(values)}
+                for name, values in sorted(self.stages.items())
+            }
+
+
+# ---------------- Environment ----------------
+def start_fakes(args: argparse.Namespace) -> Dict[str, Any]:
+    pages = [
+        FakePages(latency=args.page_latency, host=f"127.0.0.{i + 1}").start()
+        for i in range(args.page_hosts)
+    ]
+    return {
+        "gnews": FakeGNews(
+            [p.url for p in pages],
+            article_pool=args.article_pool,
+            latency=args.gnews_latency,
+        ).start(),
+        "ollama": FakeOllama(dim=args.embed_dim, latency=args.embed_latency).start(),
+        "pages": pages,
+        "llm": FakeLLM(latency=args.llm_latency).start(),
+    }
+
+
+def configure_environment(fakes: Dict[str, Any], workdir: Path) -> None:
+    os.environ.update(
+        {
+            "GNEWS_BASE_URL": f"{fakes['gnews'].url}/api/v4",
+            "GNEWS_API_KEY": "bench",
+            "GNEWS_RATE_PER_SEC": "1000",
+            "GNEWS_BURST": "1000",
+            "OLLAMA_BASE_URL": fakes["ollama"].url,
+            "MODEL": "openai/bench-llm",
+            "OPENAI_API_BASE": f"{fakes['llm'].url}/v1",
+            "OPENAI_API_KEY": "bench",
+            "SCRAPER_BACKEND": "local",
+            "EXTRACT_FALLBACK": "none",
+            "NEWS_STORE_DIR": str(workdir / "local_store"),
+            "CREWAI_STORAGE_DIR": str(workdir / "crewai_storage"),
+            "CREWAI_DISABLE_TELEMETRY": "true",
+            "OTEL_SDK_DISABLED": "true",
+            "ANONYMIZED_TELEMETRY": "False",
+            "NEWS_WARM_CREWS": "0",
+        }
+    )
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------------- Load generation ----------------
+def run_load(
+    request_fn: Callable[[str], Dict[str, Any]],
+    topics: List[str],
+    concurrency: int,
+) -> Dict[str, Any]:
+    """Call ``request_fn(topic)`` for every topic, ``concurrency`` at a time."""
+    latencies: List[float] = []
+    first_articles: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def one(topic: str) -> None:
+        started = time.perf_counter()
+        try:
+            outcome = request_fn(topic) or {}
+        except Exception as e:
+            outcome = {"error": f"{type(e).__name__}: {e}"}
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            if outcome.get("error"):
+                errors.append(str(outcome["error"]))
+            else:
+                latencies.append(elapsed)
+            if outcome.get("first_article_ms") is not None:
+                first_articles.append(outcome["first_article_ms"])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, topics))
+    wall = time.perf_counter() - started
+
+    report = {
+        "requests": len(topics),
+        "errors": len(errors),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 3) if wall else 0.0,
+        "latency_ms": percentiles(latencies),
+    }
+    if first_articles:
+        report["first_article_ms"] = percentiles(first_articles)
+    if errors:
+        report["error_samples"] = sorted(set(errors))[:5]
+    return report
+
+
+def pipeline_target(mode: str, use_cache: bool, recorder: StageRecorder):
+    from news_crew.pipeline import run_news_pipeline
+
+    def request(topic: str) -> Dict[str, Any]:
+        return run_news_pipeline(
+            topic, mode=mode, use_cache=use_cache, on_event=recorder.record
+        )
+
+    return request
+
+
+def api_target(base_url: str, mode: str, timeout: float):
+    session = requests.Session()
+
+    def request(topic: str) -> Dict[str, Any]:
+        resp = session.get(
+            f"{base_url}/api/news",
+            params={"topic": topic, "mode": mode},
+            timeout=timeout,
+        )
+        if resp.status_code != 200:
+            return {"error": f"HTTP {resp.status_code}"}
+        return resp.json()
+
+    return request
+
+
+def stream_target(base_url: str, mode: str, timeout: float, recorder: StageRecorder):
+    def request(topic: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        first_article_ms = None
+        result: Dict[str, Any] = {}
+        event_name = None
+        with requests.get(
+            f"{base_url}/api/news-stream",
+            params={"topic": topic, "mode": mode},
+            stream=True,
+            timeout=timeout,
+        ) as resp:
+            if resp.status_code != 200:
+                return {"error": f"HTTP {resp.status_code}"}
+            for line in resp.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event_name = line[len("event:") :].strip()
+                elif line.startswith("data:"):
+                    data = line[len("data:") :].strip()
+                    if event_name == "stage":
+                        recorder.record(json.loads(data))
+                    elif event_name == "article" and first_article_ms is None:
+                        first_article_ms = (time.perf_counter() - started) * 1000
+                    elif event_name is None and data.startswith("{"):
+                        result = json.loads(data)
+                elif not line:
+                    if event_name == "end":
+                        break
+                    event_name = None
+        return {**result, "first_article_ms": first_article_ms}
+
+    return request
+
+
+def serve_app() -> tuple:
+    """Start the FastAPI app on an ephemeral port; returns (base_url, server)."""
+    import socket
+
+    import uvicorn
+
+    from news_crew.main import app
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, name="bench-uvicorn", daemon=True).start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("uvicorn did not start")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", server
+
+
+# ---------------- CLI ----------------
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m news_crew.bench",
+        description="Benchmark the news pipeline against local fake services.",
+    )
+    parser.add_argument(
+        "--targets",
+        default="pipeline,api,stream",
+        help=f"comma-separated subset of {','.join(TARGETS)}",
+    )
+    parser.add_argument("--mode", choices=("fast", "full"), default="fast")
+    parser.add_argument("--requests", type=int, default=20, help="per target")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--topics",
+        type=int,
+        default=0,
+        help="cycle through this many distinct topics (0: every request unique)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="bypass the topic result cache (pipeline target)",
+    )
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds")
+    parser.add_argument(
+        "--llm-stream",
+        action="store_true",
+        help="stream LLM output (NEWS_LLM_STREAM=1) so articles arrive mid-answer",
+    )
+    parser.add_argument("--page-latency", type=float, default=0.1, help="seconds")
+    parser.add_argument("--gnews-latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--embed-latency", type=float, default=0.01, help="seconds")
+    parser.add_argument("--embed-dim", type=int, default=1024)
+    parser.add_argument("--article-pool", type=int, default=200)
+    parser.add_argument("--page-hosts", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=300, help="per request")
+    parser.add_argument("--output", help="write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        raise SystemExit(f"Unknown targets: {', '.join(sorted(unknown))}")
+
+    fakes = start_fakes(args)
+    with tempfile.TemporaryDirectory(prefix="news-bench-") as tmp:
+        configure_environment(fakes, Path(tmp))
+        if args.llm_stream:
+            os.environ["NEWS_LLM_STREAM"] = "1"
+
+        report: Dict[str, Any] = {
+            "config": {k: v for k, v in vars(args).items() if k != "output"},
+            "git_commit": git_commit(),
+            "targets": {},
+        }
+        server = base_url = None
+        # Verbose crews print to stdout; keep it for the report
+        with contextlib.redirect_stdout(sys.stderr):
+            for target in targets:
+                # Fresh topics per target, so one target's cached results do
+                # not flatter the next
+                distinct = args.topics or args.requests
+                topics = [
+                    f"{target} topic {i % distinct}" for i in range(args.requests)
+                ]
+                recorder = StageRecorder()
+                if target == "pipeline":
+                    request_fn = pipeline_target(args.mode, not args.no_cache, recorder)
+                else:
+                    if server is None:
+                        base_url, server = serve_app()
+                    if target == "api":
+                        request_fn = api_target(base_url, args.mode, args.timeout)
+                    else:
+                        request_fn = stream_target(
+                            base_url, args.mode, args.timeout, recorder
+                        )
+
+                result = run_load(request_fn, topics, args.concurrency)
+                if recorder.stages:
+                    result["stages"] = recorder.summary()
+                result["peak_rss_mb"] = peak_rss_mb()
+                report["targets"][target] = result
+
+        if server is not None:
+            server.should_exit = True
+
+    report["fakes"] = {
+        "gnews_requests": fakes["gnews"].requests,
+        "ollama_requests": fakes["ollama"].requests,
+        "page_requests": sum(p.requests for p in fakes["pages"]),
+        "llm_requests": fakes["llm"].requests,
+        "llm_prompt_tokens": fakes["llm"].prompt_tokens,
+        "llm_completion_tokens": fakes["llm"].completion_tokens,
+    }
+    for fake in [fakes["gnews"], fakes["ollama"], fakes["llm"], *fakes["pages"]]:
+        fake.stop()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+    return report
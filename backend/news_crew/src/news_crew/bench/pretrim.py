@@ -0,0 +1,329 @@
+"""
+Benchmark for news_crew.pretrim on a fixed, generated corpus.
+
+    python -m news_crew.bench.pretrim --articles 200 --budgets 200,400,800
+
+Every article is built from sentences whose role is known: key facts (what
+a summary must say), background detail, and the boilerplate extraction
+leaves behind. For each token budget the report compares pretrim with plain
+truncation to the same budget (what the old character cap did):
+
+- tokens: mean content tokens per article, and summarizer prompt tokens
+  for a batch of MAX_ARTICLES articles, against the untrimmed content;
+- trim_ms: time spent trimming one article;
+- key_fact_recall: share of key facts still in the content;
+- reference_recall: ROUGE-1 recall of the key facts by the content;
+- boilerplate_kept: share of boilerplate sentences still in the content.
+
+With --live each article is also summarized by the configured LLM (MODEL,
+as for the crews) from its full and its trimmed content; the report then
+has the measured LLM latency and the ROUGE-1 F1 of each summary against
+the key facts. The corpus is the same for the same --seed and --articles,
+so reports compare across commits.
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from news_crew.bench.harness import git_commit, percentiles
+from news_crew.pretrim import estimate_tokens, trim_text
+from news_crew.stages import MAX_ARTICLES
+
+_SUBJECTS = [
+    ("The central bank", "interest rates", "inflation", "borrowing costs"),
+    ("The city council", "housing plan", "rents", "new apartments"),
+    ("The health ministry", "vaccine rollout", "clinics", "booster doses"),
+    ("The carmaker", "battery plant", "electric vehicles", "factory jobs"),
+    ("The weather service", "storm warning", "coastal flooding", "evacuations"),
+    ("The football club", "stadium deal", "season tickets", "match days"),
+    ("The chip maker", "quarterly results", "AI demand", "data centres"),
+    ("The climate summit", "emissions pact", "coal plants", "clean energy"),
+]
+_PLACES = ["Berlin", "Lagos", "Toronto", "Mumbai", "Sydney", "Denver", "Lyon"]
+_PEOPLE = ["Ana Ruiz", "Tom Berg", "Li Wei", "Sara Okafor", "James Hill"]
+# Background copy: loosely related colour that a summary can leave out
+_BACKGROUND = [
+    "The {noun} on the {place} waterfront was renovated in {year} and now houses a {venue}.",
+    "Local schools in {place} reopened {n} weeks ago after the summer holidays.",
+    "Traffic near the {noun} was heavier than usual on {day} morning.",
+    "A separate {event} drew {n} thousand visitors to the old town of {place}.",
+    "The region around {place} has a long history of {industry} and trade.",
+    "Analysts said wider markets were mixed on {day}, with little change in {industry} shares.",
+    "In {year} a different agency published a review of the {noun} in {place}.",
+    "Several smaller groups also held meetings about the {event} on {day}.",
+    "The {venue} next to the {noun} has been run by the same family since {year}.",
+    "Weather in {place} stayed mild, with {n} millimetres of rain over the {event}.",
+]
+_FILL = {
+    "noun": ["library", "bridge", "market hall", "railway station", "museum"],
+    "venue": ["cafe", "bookshop", "gallery", "bakery", "cinema"],
+    "event": ["food festival", "marathon", "trade fair", "concert series"],
+    "industry": ["textile", "shipping", "mining", "software", "tourism"],
+    "day": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+}
+_BOILERPLATE = [
+    "Sign up for our newsletter to get the latest headlines in your inbox.",
+    "Share this article on Facebook, X or by email with your friends.",
+    "We use cookies to improve your experience on our website.",
+    "Read more: the stories our editors are following this week.",
+    "Advertisement - scroll down to continue reading this story.",
+    "Copyright 2025 All rights reserved by the publisher and its partners.",
+    "Follow us on social media for breaking news and live updates.",
+    "Related coverage: more from our politics and business desks today.",
+]
+
+
+def _article(rng: random.Random, n: int) -> Dict[str, Any]:
+    subject, thing, effect, people = rng.choice(_SUBJECTS)
+    place = rng.choice(_PLACES)
+    person = rng.choice(_PEOPLE)
+    pct = rng.randint(2, 40)
+    headline = f"{subject} in {place} announces {thing} affecting {effect}"
+    key = [
+        f"{subject} in {place} announced a {thing} on Monday that will change "
+        f"{effect} for {people}.",
+        f"Officials said the {thing} is expected to shift {effect} by {pct} "
+        f"percent over the next year.",
+        f"{person}, who leads the {thing}, said {people} would see the first "
+        f"effects within {rng.randint(2, 9)} months.",
+        f"Critics warned that the {thing} could raise {effect} for {people} in "
+        f"{place} before it brings benefits.",
+    ]
+    detail = [
+        f"The {thing} follows months of debate in {place} about {effect}.",
+        f"Residents interviewed on Monday were divided over the {thing}.",
+        f"Similar plans elsewhere changed {effect} more slowly than expected.",
+        f"A final vote on parts of the {thing} is planned for next spring.",
+        f"Opposition members asked for an independent review of {effect}.",
+    ]
+    background = {
+        rng.choice(_BACKGROUND).format(
+            place=rng.choice(_PLACES),
+            year=rng.randint(1950, 2020),
+            n=rng.randint(2, 90),
+            **{k: rng.choice(v) for k, v in _FILL.items()},
+        )
+        for _ in range(rng.randint(8, 40))
+    }
+    body = [("detail", s) for s in rng.sample(detail, rng.randint(2, len(detail)))]
+    body += [("background", s) for s in sorted(background)]
+    rng.shuffle(body)
+    # The lead states the news; the other key facts are anywhere in the body
+    for s in key[1:]:
+        body.insert(rng.randint(0, len(body)), ("key", s))
+    sentences: List[Tuple[str, str]] = [("key", key[0])] + body
+    boilerplate = rng.sample(_BOILERPLATE, rng.randint(3, 6))
+    for s in boilerplate:
+        sentences.insert(rng.randint(0, len(sentences)), ("boilerplate", s))
+    # Menus and share prompts often appear twice on a page
+    sentences.append(("boilerplate", boilerplate[0]))
+
+    paragraphs, current = [], []
+    for _, text in sentences:
+        current.append(text)
+        if len(current) >= rng.randint(1, 3):
+            paragraphs.append(" ".join(current))
+            current = []
+    if current:
+        paragraphs.append(" ".join(current))
+    return {
+        "headline": headline,
+        "source": f"Outlet {n % 12}",
+        "url": f"https://example.com/story/{n}",
+        "publish_date": "2025-09-12T10:00:00Z",
+        "content": "\n".join(paragraphs),
+        "key_facts": key,
+        "boilerplate": sorted(set(boilerplate)),
+    }
+
+
+def build_corpus(articles: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [_article(rng, n) for n in range(articles)]
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def rouge1(candidate: str, reference: str) -> Dict[str, float]:
+    cand, ref = _words(candidate), _words(reference)
+    if not cand or not ref:
+        return {"recall": 0.0, "precision": 0.0, "f1": 0.0}
+    counts: Dict[str, int] = {}
+    for w in ref:
+        counts[w] = counts.get(w, 0) + 1
+    overlap = 0
+    for w in cand:
+        if counts.get(w, 0) > 0:
+            counts[w] -= 1
+            overlap += 1
+    recall, precision = overlap / len(ref), overlap / len(cand)
+    f1 = 2 * recall * precision / (recall + precision) if overlap else 0.0
+    return {"recall": recall, "precision": precision, "f1": f1}
+
+
+def truncate(text: str, max_tokens: int) -> str:
+    """The old approach: the first ``max_tokens`` worth of characters."""
+    return text[: max_tokens * 4]
+
+
+def _prompt_tokens(articles: List[Dict[str, Any]], field: str) -> float:
+    """Mean summarizer input tokens for batches of MAX_ARTICLES articles."""
+    batches = [
+        articles[i : i + MAX_ARTICLES] for i in range(0, len(articles), MAX_ARTICLES)
+    ]
+    sizes = [
+        estimate_tokens(
+            json.dumps(
+                [
+                    {
+                        "headline": a["headline"],
+                        "source": a["source"],
+                        "url": a["url"],
+                        "publish_date": a["publish_date"],
+                        "content": a[field],
+                    }
+                    for a in batch
+                ]
+            )
+        )
+        for batch in batches
+    ]
+    return round(sum(sizes) / len(sizes), 1)
+
+
+def _quality(articles: List[Dict[str, Any]], field: str) -> Dict[str, float]:
+    key_kept = key_total = boiler_kept = boiler_total = 0
+    recall = 0.0
+    for a in articles:
+        text = a[field]
+        key_kept += sum(1 for s in a["key_facts"] if s in text)
+        key_total += len(a["key_facts"])
+        boiler_kept += sum(1 for s in a["boilerplate"] if s in text)
+        boiler_total += len(a["boilerplate"])
+        recall += rouge1(text, " ".join(a["key_facts"]))["recall"]
+    return {
+        "key_fact_recall": round(key_kept / key_total, 3),
+        "reference_recall": round(recall / len(articles), 3),
+        "boilerplate_kept": round(boiler_kept / boiler_total, 3),
+    }
+
+
+def _summarize_live(llm, article: Dict[str, Any], field: str) -> Tuple[str, float]:
+    prompt = (
+        "Write a clean 2-3 line professional summary of this news article.\n"
+        f"Headline: {article['headline']}\nSource: {article['source']}\n"
+        f"Content: {article[field]}"
+    )
+    started = time.perf_counter()
+    summary = llm.call([{"role": "user", "content": prompt}])
+    return str(summary or ""), time.perf_counter() - started
+
+
+def _live(corpus: List[Dict[str, Any]], fields: List[str]) -> Dict[str, Any]:
+    from crewai.utilities.llm_utils import create_llm
+
+    llm = create_llm()
+    report = {}
+    for field in fields:
+        latencies, f1 = [], 0.0
+        for a in corpus:
+            summary, seconds = _summarize_live(llm, a, field)
+            latencies.append(seconds * 1000)
+            f1 += rouge1(summary, " ".join(a["key_facts"]))["f1"]
+        report[field] = {
+            "llm_ms": percentiles(latencies),
+            "summary_rouge1_f1": round(f1 / len(corpus), 3),
+        }
+    return report
+
+
+def run(
+    articles: int = 200,
+    budgets: Tuple[int, ...] = (200, 400, 800),
+    seed: int = 7,
+    live: int = 0,
+) -> Dict[str, Any]:
+    corpus = build_corpus(articles, seed)
+    full_tokens = [estimate_tokens(a["content"]) for a in corpus]
+    report: Dict[str, Any] = {
+        "commit": git_commit(),
+        "articles": articles,
+        "seed": seed,
+        "full": {
+            "content_tokens": round(sum(full_tokens) / len(corpus), 1),
+            "prompt_tokens": _prompt_tokens(corpus, "content"),
+            **_quality(corpus, "content"),
+        },
+        "budgets": {},
+    }
+
+    for budget in budgets:
+        trim_ms = []
+        for a in corpus:
+            started = time.perf_counter()
+            a["trimmed"] = trim_text(a["content"], a["headline"], max_tokens=budget)
+            trim_ms.append((time.perf_counter() - started) * 1000)
+            a["truncated"] = truncate(a["content"], budget)
+        entry = {}
+        for field in ("trimmed", "truncated"):
+            tokens = sum(estimate_tokens(a[field]) for a in corpus) / len(corpus)
+            entry[field] = {
+                "content_tokens": round(tokens, 1),
+                "prompt_tokens": _prompt_tokens(corpus, field),
+                **_quality(corpus, field),
+            }
+        entry["trimmed"]["trim_ms"] = percentiles(trim_ms)
+        entry["trimmed"]["prompt_token_reduction"] = round(
+            1 - entry["trimmed"]["prompt_tokens"] / report["full"]["prompt_tokens"], 3
+        )
+        if live:
+            entry["live"] = _live(corpus[:live], ["content", "trimmed"])
+        report["budgets"][str(budget)] = entry
+    return report
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m news_crew.bench.pretrim",
+        description="Token and quality effect of pre-trimming article content.",
+    )
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument(
+        "--budgets", default="200,400,800", help="comma-separated token budgets"
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--live",
+        type=int,
+        default=0,
+        metavar="N",
+        help="also summarize the first N articles with the configured LLM",
+    )
+    parser.add_argument("--output", help="write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    report = run(
+        articles=args.articles,
+        budgets=tuple(int(b) for b in args.budgets.split(",") if b.strip()),
+        seed=args.seed,
+        live=args.live,
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@
 # # Initialize Serper news search tool
 # news_search_tool = SerperDevTool(type="news")
 # scrape_tool = HyperbrowserLoadTool(
-#     api_key="hb_a0082f6b4485ff0233409f73f88d"
+#     api_key=os.getenv("HYPERBROWSER_API_KEY")
 # )  # Or use environment variable
 
 
@@ -91,26 +91,71 @@ from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
 from crewai_tools import SerperDevTool
-from news_crew.tools.gnews_top_headlines_tool import GNewsTopHeadlinesTool
-from crewai_tools import HyperbrowserLoadTool
-from news_crew.tools.local_vader_tool import VaderSentimentTool
+from news_crew.tools.gnews_top_headlines_tool import (
+    GNewsMultiQueryTool,
+    GNewsTopHeadlinesTool,
+)
+from news_crew.tools.article_content_tool import ArticleContentTool
+from news_crew.tools.local_vader_tool import (
+    VaderBatchSentimentTool,
+    VaderSentimentTool,
+)
 from crewai.utilities.paths import db_storage_path
-from news_crew.tools.ollama_embeddings import OllamaEmbeddings
+from news_crew.tools.ollama_embeddings import (
+    CachedOllamaEmbeddingFunction,
+    OllamaEmbeddings,
+)
 from crewai.knowledge.knowledge import Knowledge
+from crewai.utilities.llm_utils import create_llm
+from news_crew import metrics, progress
+from news_crew.llm_cache import cached_llm
 import os
 from pathlib import Path
 
 
 storage_dir = Path(__file__).parent / "crewai_storage"
-os.environ["CREWAI_STORAGE_DIR"] = str(storage_dir)
+# Overridable so benchmarks and tests can keep their memory out of the repo
+os.environ.setdefault("CREWAI_STORAGE_DIR", str(storage_dir))
+
+# Agent tool calls and LLM calls show up in /api/metrics
+metrics.install_crewai_listeners()
+# Streamed LLM output reaches the pipeline's incremental article parser
+progress.install_crewai_listeners()
+
+
+def agent_llm():
+    """
+    LLM for every agent: CrewAI's default (configured from MODEL etc.) behind
+    the prompt cache (news_crew.llm_cache, NEWS_LLM_CACHE). With
+    NEWS_LLM_STREAM=1 it streams, so articles reach clients while the model is
+    still writing them.
+    """
+    llm = create_llm()
+    if os.getenv("NEWS_LLM_STREAM") == "1":
+        llm.stream = True
+    return cached_llm(llm)
+
 
 # Initialize Serper news search tool
 news_search_tool = SerperDevTool(type="news")
 
-# Initialize scrapers
-hyperbrowser_tool = HyperbrowserLoadTool(
-    api_key="hb_a0082f6b4485ff0233409f73f88d"  # Or use env variable
-)
+# Article pages are extracted locally; Hyperbrowser is only the fallback
+# (news_crew.extractor, HYPERBROWSER_API_KEY)
+article_content_tool = ArticleContentTool()
+
+# Memory embedder shared by every crew: local Ollama through a pooled,
+# batched client with an on-disk cache, so unchanged articles are not re-embedded
+OLLAMA_EMBEDDER = {
+    "provider": "custom",
+    "config": {
+        "embedder": CachedOllamaEmbeddingFunction(
+            OllamaEmbeddings(
+                model="mxbai-embed-large",  # You already pulled this
+                base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+            )
+        ),
+    },
+}
 
 
 @CrewBase
@@ -139,7 +184,8 @@ class NewsCrew:
     def fetcher_agent(self) -> Agent:
         return Agent(
             config=self.agents_config["fetcher_agent"],  # from agents.yaml
-            tools=[GNewsTopHeadlinesTool()],
+            tools=[GNewsMultiQueryTool(), GNewsTopHeadlinesTool()],
+            llm=agent_llm(),
             verbose=True,
             memory=False,
         )
@@ -148,6 +194,7 @@ class NewsCrew:
     def cleaner_agent(self) -> Agent:
         return Agent(
             config=self.agents_config["cleaner_agent"],  # from agents.yaml
+            llm=agent_llm(),
             verbose=True,
             memory=False,
         )
@@ -156,7 +203,8 @@ class NewsCrew:
     def summarizer_agent(self) -> Agent:
         return Agent(
             config=self.agents_config["summarizer_agent"],
-            tools=[hyperbrowser_tool],  # single unified tool
+            tools=[article_content_tool],  # single unified tool
+            llm=agent_llm(),
             verbose=True,
             memory=True,
         )
@@ -165,18 +213,21 @@ class NewsCrew:
     def sentiment_agent(self) -> Agent:
         return Agent(
             config=self.agents_config["sentiment_agent"],
-            tools=[VaderSentimentTool()],
+            tools=[VaderBatchSentimentTool(), VaderSentimentTool()],
+            llm=agent_llm(),
             verbose=True,
             memory=False,
         )
 
-    @agent
-    def knowledge_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["knowledge_agent"],
-            verbose=True,
-            memory=True,  # ✅ Turn on memory
-        )
+    # Replaced by news_crew.knowledge: articles are written to knowledge
+    # memory directly instead of through an LLM pass that re-echoes them
+    # @agent
+    # def knowledge_agent(self) -> Agent:
+    #     return Agent(
+    #         config=self.agents_config["knowledge_agent"],
+    #         verbose=True,
+    #         memory=True,  # ✅ Turn on memory
+    #     )
 
     # --- Tasks ---
     @task
@@ -189,29 +240,25 @@ class NewsCrew:
     def cleaner_agent_task(self) -> Task:
         return Task(
             config=self.tasks_config["cleaner_agent_task"],  # from tasks.yaml
-            output_file="clean_articles.json",
         )
 
     @task
     def summarizer_agent_task(self) -> Task:
         return Task(
             config=self.tasks_config["summarizer_agent_task"],  # from tasks.yaml
-            output_file="summarized_articles.json",  # JSON summaries
         )
 
     @task
     def sentiment_agent_task(self) -> Task:
         return Task(
             config=self.tasks_config["sentiment_agent_task"],
-            output_file="sentiment_articles.json",
         )
 
-    @task
-    def knowledge_agent_task(self) -> Task:
-        return Task(
-            config=self.tasks_config["knowledge_agent_task"],
-            output_file="knowledge_store.json",
-        )
+    # @task
+    # def knowledge_agent_task(self) -> Task:
+    #     return Task(
+    #         config=self.tasks_config["knowledge_agent_task"],
+    #     )
 
     # # --- Crew ---
     # @crew
@@ -233,11 +280,52 @@ class NewsCrew:
             process=Process.sequential,
             verbose=True,
             memory=True,  # ✅ Enable CrewAI’s memory system
-            embedder={
-                "provider": "ollama",  # Use local Ollama
-                "config": {
-                    "model": "mxbai-embed-large",  # You already pulled this
-                    "url": "http://localhost:11434/api/embeddings",
-                },
-            },
+            embedder=OLLAMA_EMBEDDER,
+            task_callback=progress.task_callback,  # per-run progress events
+            step_callback=progress.step_callback,
+        )
+
+
+@CrewBase
+class SummaryCrew:
+    """
+    Single-agent crew for the fast pipeline: only summarization uses the LLM.
+    Fetch, clean and sentiment run as plain Python in news_crew.stages and
+    pages are scraped concurrently by news_crew.scraper.
+    """
+
+    agents_config = "config/agents.yaml"
+    tasks_config = "config/fast_tasks.yaml"
+
+    agents: List[BaseAgent]
+    tasks: List[Task]
+
+    @agent
+    def summarizer_agent(self) -> Agent:
+        return Agent(
+            config=self.agents_config["summarizer_agent"],
+            tools=[],  # content is pre-fetched by news_crew.scraper
+            llm=agent_llm(),
+            verbose=True,
+            memory=True,
+        )
+
+    @task
+    def fast_summarizer_task(self) -> Task:
+        return Task(
+            config=self.tasks_config["fast_summarizer_task"],
+        )
+
+    @crew
+    def crew(self) -> Crew:
+        """Creates the summary-only crew"""
+        return Crew(
+            agents=self.agents,
+            tasks=self.tasks,
+            process=Process.sequential,
+            verbose=True,
+            memory=True,
+            embedder=OLLAMA_EMBEDDER,
+            task_callback=progress.task_callback,
+            step_callback=progress.step_callback,
         )
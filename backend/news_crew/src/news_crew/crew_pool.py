@@ -0,0 +1,181 @@
+"""
+Warm pools of pre-built crews.
+
+Building a crew re-reads agents.yaml/tasks.yaml, re-creates every agent and
+tool and re-initializes memory/embedder storage. A pool builds each crew once
+and hands it to one run at a time; CrewAI keeps the original task/agent
+templates, so kickoff() only has to bind the new ``{topic}``.
+
+A crew is never shared by two threads at once: ``acquire()`` checks one out
+exclusively and blocks when all ``size`` crews are busy, for at most
+``acquire_timeout`` seconds (NEWS_CREW_ACQUIRE_TIMEOUT). A crew that fails to
+build gives its slot back, so a later acquire() builds it again.
+
+Run ``python -m news_crew.crew_pool`` to compare per-request construction
+against pooled checkout.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+from news_crew.crew import NewsCrew, SummaryCrew
+
+
+class CrewPool:
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int,
+        name: str,
+        acquire_timeout: float = 600.0,
+    ):
+        self.factory = factory
+        self.size = size
+        self.name = name
+        self.acquire_timeout = acquire_timeout
+
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._build_ms: List[float] = []
+        self._acquire_ms: List[float] = []
+
+    def _build(self) -> Any:
+        # Caller reserved a slot; it is given back if the build fails
+        started = time.perf_counter()
+        try:
+            crew = self.factory()
+        except BaseException:
+            with self._lock:
+                self._created -= 1
+            raise
+        with self._lock:
+            self._build_ms.append((time.perf_counter() - started) * 1000)
+        return crew
+
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return True
+            return False
+
+    def warm(self) -> None:
+        """Build crews until the pool is full."""
+        while self._reserve_slot():
+            self._idle.put(self._build())
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """Check out a crew for one kickoff; it returns to the pool afterwards."""
+        started = time.perf_counter()
+        deadline = started + self.acquire_timeout
+        crew = None
+        while crew is None:
+            try:
+                crew = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve_slot():
+                    crew = self._build()
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No {self.name} crew free after {self.acquire_timeout:g}s"
+                    )
+                # Wake up now and then: a failed build elsewhere frees a slot
+                # without returning a crew
+                try:
+                    crew = self._idle.get(timeout=min(remaining, 1.0))
+                except queue.Empty:
+                    pass
+        with self._lock:
+            self._acquire_ms.append((time.perf_counter() - started) * 1000)
+            del self._acquire_ms[:-1000]
+
+        try:
+            yield crew
+        finally:
+            self._idle.put(crew)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            acquire_ms = list(self._acquire_ms)
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": self._idle.qsize(),
+                "build_ms_avg": _avg(self._build_ms),
+                "acquire_ms_avg": _avg(acquire_ms),
+                "acquires": len(acquire_ms),
+            }
+
+
+def _avg(values: List[float]) -> float:
+    return round(sum(values) / len(values), 3) if values else 0.0
+
+
+# One crew per job worker is enough: a worker runs one pipeline at a time
+_POOL_SIZE = int(os.getenv("NEWS_CREW_POOL_SIZE") or os.getenv("NEWS_WORKERS", "2"))
+
+# Longer than a pipeline run, which is what a waiting acquire() waits for
+_ACQUIRE_TIMEOUT = float(os.getenv("NEWS_CREW_ACQUIRE_TIMEOUT", "600"))
+
+news_crew_pool = CrewPool(
+    lambda: NewsCrew().crew(), _POOL_SIZE, "full", acquire_timeout=_ACQUIRE_TIMEOUT
+)
+summary_crew_pool = CrewPool(
+    lambda: SummaryCrew().crew(), _POOL_SIZE, "fast", acquire_timeout=_ACQUIRE_TIMEOUT
+)
+
+
+def warm_pools() -> Dict[str, float]:
+    """Pre-build every pool; returns wall time (ms) per pool."""
+    timings = {}
+    for pool in (news_crew_pool, summary_crew_pool):
+        started = time.perf_counter()
+        pool.warm()
+        timings[pool.name] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {pool.name: pool.stats() for pool in (news_crew_pool, summary_crew_pool)}
+
+
+def _measure(iterations: int = 10) -> Dict[str, Any]:
+    """Per-request crew construction vs. pooled checkout, in milliseconds."""
+    report: Dict[str, Any] = {}
+    for name, factory in (
+        ("full", lambda: NewsCrew().crew()),
+        ("fast", lambda: SummaryCrew().crew()),
+    ):
+        build = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            factory()
+            build.append((time.perf_counter() - started) * 1000)
+
+        pool = CrewPool(factory, 1, name)
+        started = time.perf_counter()
+        pool.warm()
+        warm_ms = (time.perf_counter() - started) * 1000
+        for _ in range(iterations):
+            with pool.acquire():
+                pass
+
+        report[name] = {
+            "construct_per_request_ms_avg": _avg(build),
+            "pool_startup_ms": round(warm_ms, 2),
+            "pooled_acquire_ms_avg": pool.stats()["acquire_ms_avg"],
+        }
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps(_measure(), indent=2))
@@ -0,0 +1,143 @@
+"""
+Near-duplicate article detection.
+
+Wire stories are syndicated across many outlets with near-identical
+headlines. Before anything is scraped or summarized, articles are grouped
+when their canonical URLs match or when the MinHash signatures of their
+headline + description indicate a high word-shingle Jaccard similarity.
+Candidate pairs come from LSH banding, so the cost grows roughly linearly
+with the number of articles instead of comparing every pair.
+
+Each group collapses into one representative (the first in input order)
+that lists the others under ``also_reported_by``.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from news_crew.urls import canonical_url
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard usually collide
+ROWS = NUM_PERM // BANDS
+JACCARD_THRESHOLD = 0.6
+
+# (a * h + b) mod p with 32-bit h and a, b < p = 2^31 - 1 fits in uint64
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(1729)  # fixed seed: stable signatures across runs
+_PERM_A = _rng.integers(1, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Outlets append their name to syndicated headlines ("... - Reuters")
+_SOURCE_SUFFIX_RE = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,40}$")
+
+
+def _shingles(article: Dict[str, Any]) -> Set[str]:
+    headline = _SOURCE_SUFFIX_RE.sub("", article.get("headline") or "")
+    text = f"{headline} {article.get('description') or ''}".lower()
+    words = _WORD_RE.findall(text)
+    if len(words) < 3:
+        return set(words)
+    # Unigrams keep short headlines comparable; bigrams add word order
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "big"
+    )
+
+
+def minhash(shingles: Set[str]) -> Tuple[int, ...]:
+    """MinHash signature of a shingle set (NUM_PERM values)."""
+    if not shingles:
+        return ()
+    hashes = np.fromiter(
+        (_token_hash(s) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    # One row per permutation, one column per shingle; min across shingles
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return tuple(permuted.min(axis=1).tolist())
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def find_duplicate_groups(
+    articles: Sequence[Dict[str, Any]], threshold: float = JACCARD_THRESHOLD
+) -> List[List[int]]:
+    """Indices of articles grouped by near-duplicate, each group in input order."""
+    parent = list(range(len(articles)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    # Same canonical URL: always the same article
+    by_url: Dict[str, int] = {}
+    for i, a in enumerate(articles):
+        key = canonical_url(a.get("url", ""))
+        if key in by_url:
+            union(by_url[key], i)
+        elif key:
+            by_url[key] = i
+
+    # Same LSH bucket in any band: candidate pair, confirmed on exact Jaccard
+    shingles = [_shingles(a) for a in articles]
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+    for i, sh in enumerate(shingles):
+        signature = minhash(sh)
+        if not signature:
+            continue
+        for band in range(BANDS):
+            buckets[(band, signature[band * ROWS : (band + 1) * ROWS])].append(i)
+
+    checked = set()
+    for members in buckets.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                pair = (members[x], members[y])
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if _jaccard(shingles[pair[0]], shingles[pair[1]]) >= threshold:
+                    union(*pair)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(len(articles)):
+        groups[find(i)].append(i)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+def collapse_duplicates(
+    articles: Sequence[Dict[str, Any]], threshold: float = JACCARD_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Keep one representative per near-duplicate group (the first in input
+    order) with the others listed in ``also_reported_by``.
+    """
+    collapsed = []
+    for group in find_duplicate_groups(articles, threshold):
+        representative = dict(articles[group[0]])
+        others = [articles[i] for i in group[1:]]
+        if others:
+            representative["also_reported_by"] = [
+                {"source": o.get("source", ""), "url": o.get("url", "")} for o in others
+            ]
+        collapsed.append(representative)
+    return collapsed
@@ -0,0 +1,332 @@
+"""
+Local article content extraction.
+
+Pages are downloaded over the scraper's pooled HTTP session and their main
+text is extracted with trafilatura in a process pool, so the CPU-bound
+parsing of many pages runs in parallel instead of serializing on the GIL.
+Raw HTML and extracted text are kept in a SQLite page cache keyed by
+canonical URL: a page is downloaded once, and re-extracted without a
+download if only the text is missing.
+
+Hyperbrowser (remote and metered) is only a fallback, for pages that
+cannot be downloaded or yield less than ``min_chars`` of text locally. It
+is only used when HYPERBROWSER_API_KEY is set (EXTRACT_FALLBACK=none turns
+it off); without it, or when it fails too, a short local text is kept.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Dict, Optional, Union
+
+from news_crew import metrics
+from news_crew.paths import local_store_path
+from news_crew.scraper import FetchFn, _get_session, hyperbrowser_fetch
+from news_crew.urls import canonical_url
+
+# Larger pages are not worth parsing locally
+MAX_HTML_BYTES = 5 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url_key TEXT PRIMARY KEY,
+    html BLOB,
+    text TEXT,
+    source TEXT,
+    fetched_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_last_used ON pages (last_used);
+"""
+
+EXTRACTIONS = metrics.Counter(
+    "news_extractions",
+    "Article content lookups by outcome (cache, local, fallback, local_short, failed).",
+    ["outcome"],
+)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+# ---------------- Extraction (process pool) ----------------
+def _load_trafilatura() -> None:
+    import trafilatura  # noqa: F401
+
+
+def extract_text(html: str, url: Optional[str] = None) -> str:
+    """Main article text of ``html`` without navigation, ads or comments."""
+    import trafilatura
+
+    return (
+        trafilatura.extract(
+            html,
+            url=url,
+            include_comments=False,
+            include_tables=False,
+            favor_precision=True,
+        )
+        or ""
+    )
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded server process is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=int(os.getenv("EXTRACT_WORKERS", "0")) or None,
+                mp_context=get_context("spawn"),
+                initializer=_load_trafilatura,
+            )
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+# ---------------- Page cache ----------------
+class PageCache:
+    """
+    Raw HTML (zlib-compressed) and extracted text per canonical URL, in a
+    local SQLite file. Entries expire after ``max_age`` seconds; past
+    ``max_entries`` the least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        max_age: float = 7 * 24 * 3600,
+        max_entries: int = 10000,
+    ):
+        self.path = str(path)
+        self.max_age = max_age
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        {html, text, source} of a live entry. html is only decompressed when
+        there is no text; either may be None.
+        """
+        url_key = canonical_url(url)
+        if not url_key:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT html, text, source FROM pages "
+                "WHERE url_key = ? AND fetched_at >= ?",
+                (url_key, now - self.max_age),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE pages SET last_used = ? WHERE url_key = ?", (now, url_key)
+            )
+            self._conn.commit()
+        html, text, source = row
+        return {
+            "html": (
+                zlib.decompress(html).decode("utf-8") if html and not text else None
+            ),
+            "text": text,
+            "source": source,
+        }
+
+    def put(
+        self,
+        url: str,
+        html: Optional[str] = None,
+        text: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> None:
+        """Store what is given; fields left as None keep their cached value."""
+        url_key = canonical_url(url)
+        if not url_key:
+            return
+        now = time.time()
+        blob = zlib.compress(html.encode("utf-8"), 6) if html is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO pages (url_key, html, text, source, fetched_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (url_key) DO UPDATE SET "
+                "html = COALESCE(excluded.html, html), "
+                "text = COALESCE(excluded.text, text), "
+                "source = COALESCE(excluded.source, source), "
+                "fetched_at = CASE WHEN excluded.html IS NOT NULL "
+                "THEN excluded.fetched_at ELSE fetched_at END, "
+                "last_used = excluded.last_used",
+                (url_key, blob, text, source, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        # Caller holds self._lock inside a transaction
+        self._conn.execute(
+            "DELETE FROM pages WHERE fetched_at < ?", (now - self.max_age,)
+        )
+        self._conn.execute(
+            "DELETE FROM pages WHERE url_key IN ("
+            "SELECT url_key FROM pages ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, with_text = self._conn.execute(
+                "SELECT COUNT(*), COUNT(text) FROM pages"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "with_text": with_text,
+            "max_entries": self.max_entries,
+            "max_age": self.max_age,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------- Extractor ----------------
+class ContentExtractor:
+    def __init__(
+        self,
+        cache: Optional[PageCache] = None,
+        fallback: Optional[FetchFn] = None,
+        min_chars: int = 200,
+    ):
+        self.cache = cache
+        # For pages that fail locally; None to give up on them
+        self.fallback = fallback
+        self.min_chars = min_chars
+
+    @classmethod
+    def from_env(cls) -> "ContentExtractor":
+        fallback = os.getenv("EXTRACT_FALLBACK", "hyperbrowser")
+        if fallback not in ("hyperbrowser", "none"):
+            raise ValueError(
+                f"Unknown EXTRACT_FALLBACK {fallback!r}; expected hyperbrowser or none"
+            )
+        cache = None
+        if os.getenv("NEWS_PAGE_CACHE", "1") == "1":
+            cache = PageCache(
+                os.getenv("NEWS_PAGE_CACHE_PATH")
+                or local_store_path("page_cache.sqlite3"),
+                max_age=float(os.getenv("NEWS_PAGE_CACHE_MAX_AGE", str(7 * 24 * 3600))),
+                max_entries=int(os.getenv("NEWS_PAGE_CACHE_MAX_ENTRIES", "10000")),
+            )
+        # Without a key every Hyperbrowser call would fail
+        use_hyperbrowser = fallback == "hyperbrowser" and bool(
+            os.getenv("HYPERBROWSER_API_KEY")
+        )
+        return cls(
+            cache=cache,
+            fallback=hyperbrowser_fetch if use_hyperbrowser else None,
+            min_chars=int(os.getenv("EXTRACT_MIN_CHARS", "200")),
+        )
+
+    def _download(self, url: str, timeout: float) -> str:
+        resp = _get_session().get(url, timeout=timeout)
+        resp.raise_for_status()
+        content_type = resp.headers.get("Content-Type", "text/html")
+        if "html" not in content_type:
+            raise ValueError(f"Not an HTML page ({content_type})")
+        if len(resp.content) > MAX_HTML_BYTES:
+            raise ValueError(f"Page too large ({len(resp.content)} bytes)")
+        return resp.text
+
+    def _extract(self, html: str, url: str, timeout: float) -> str:
+        try:
+            return _get_pool().submit(extract_text, html, url).result(timeout=timeout)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory): start a fresh pool next time
+            _reset_pool()
+            raise
+
+    def fetch(self, url: str, timeout: float) -> str:
+        """
+        Main text of the page at ``url``: from the page cache, else extracted
+        locally, else from the fallback. Raises when every source failed.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if cached and cached["text"]:
+            EXTRACTIONS.inc(outcome="cache")
+            return cached["text"]
+
+        text, error = "", None
+        try:
+            html = cached["html"] if cached and cached["html"] else None
+            if html is None:
+                html = self._download(url, timeout)
+                if self.cache:
+                    self.cache.put(url, html=html)
+            text = self._extract(html, url, timeout)
+        except Exception as e:
+            error = e
+
+        if len(text) >= self.min_chars:
+            if self.cache:
+                self.cache.put(url, text=text, source="local")
+            EXTRACTIONS.inc(outcome="local")
+            return text
+
+        if self.fallback is not None:
+            try:
+                fallback_text = self.fallback(url, timeout)
+            except Exception as e:
+                fallback_text, error = "", error or e
+            if fallback_text:
+                if self.cache:
+                    self.cache.put(url, text=fallback_text, source="fallback")
+                EXTRACTIONS.inc(outcome="fallback")
+                return fallback_text
+
+        if text:
+            # Too short to be an article, but all there is; the summarizer
+            # also has the headline. Cached, so the page is not extracted
+            # again on every request.
+            if self.cache:
+                self.cache.put(url, text=text, source="local_short")
+            EXTRACTIONS.inc(outcome="local_short")
+            return text
+        EXTRACTIONS.inc(outcome="failed")
+        if error is not None:
+            raise error
+        return text
+
+
+_extractor: Optional[ContentExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def content_extractor() -> ContentExtractor:
+    """The process-wide extractor, configured from the environment on first use."""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = ContentExtractor.from_env()
+        return _extractor
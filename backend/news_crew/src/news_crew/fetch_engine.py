@@ -0,0 +1,201 @@
+"""
+Parallel GNews fetch engine.
+
+Instead of an agent widening its search one tool call at a time (today, then
+past week, then past month, then related keywords), every query variant is
+issued at once over one pooled session. A process-wide token bucket keeps us
+inside the GNews quota, and results are merged and deduplicated by canonical
+URL, earlier (narrower) variants first.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from news_crew import metrics
+from news_crew.urls import canonical_url
+
+GNEWS_BASE_URL = os.getenv("GNEWS_BASE_URL", "https://gnews.io/api/v4")
+
+# (endpoint, params) for one GNews request
+QueryVariant = Tuple[str, Dict[str, Any]]
+
+
+class TokenBucket:
+    """Blocking token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class GNewsClient:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = GNEWS_BASE_URL,
+        rate_limiter: Optional[TokenBucket] = None,
+        timeout: float = 10,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get_articles(
+        self, endpoint: str, params: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """One GNews request; returns simplified article dicts."""
+        api_key = self.api_key or os.getenv("GNEWS_API_KEY")
+        if not api_key:
+            raise RuntimeError("GNEWS_API_KEY not set in environment variables.")
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with metrics.external_call("gnews"):
+            resp = self.session.get(
+                f"{self.base_url}/{endpoint}",
+                params={**params, "apikey": api_key},
+                timeout=self.timeout,
+            )
+            resp.raise_for_status()
+            articles = resp.json().get("articles", [])
+        return [_simplify(art) for art in articles]
+
+
+def _simplify(art: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "headline": art.get("title", "N/A"),
+        "source": (art.get("source") or {}).get("name", "Unknown Source"),
+        "url": art.get("url", "N/A"),
+        "publishedAt": art.get("publishedAt", "N/A"),
+        "description": art.get("description", ""),
+    }
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def query_variants(
+    topic: str,
+    related: Sequence[str] = (),
+    max_results: int = 20,
+    lang: str = "en",
+    country: str = "us",
+    now: Optional[datetime] = None,
+) -> List[QueryVariant]:
+    """The searches fetcher_agent_task widens through, in priority order."""
+    now = now or datetime.now(timezone.utc)
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    common = {"lang": lang, "country": country, "max": max_results}
+
+    variants: List[QueryVariant] = [
+        (
+            "top-headlines",
+            {**common, "q": topic, "category": "general", "from": _iso(today)},
+        ),
+        ("search", {**common, "q": topic, "from": _iso(now - timedelta(days=7))}),
+        ("search", {**common, "q": topic, "from": _iso(now - timedelta(days=30))}),
+    ]
+    for keyword in related:
+        variants.append(
+            (
+                "search",
+                {
+                    **common,
+                    "q": f"{topic} {keyword}",
+                    "from": _iso(now - timedelta(days=7)),
+                },
+            )
+        )
+    return variants
+
+
+def merge_articles(batches: Sequence[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Concatenate result lists in order, keeping the first article per canonical URL."""
+    merged: List[Dict[str, Any]] = []
+    seen = set()
+    for batch in batches:
+        for art in batch:
+            key = canonical_url(art.get("url", ""))
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            merged.append(art)
+    return merged
+
+
+def fetch_all(
+    topic: str,
+    related: Sequence[str] = (),
+    max_results: int = 20,
+    client: Optional["GNewsClient"] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Issue every query variant in parallel and return the merged, deduplicated
+    articles. Failing variants are skipped; if all of them fail the first
+    error is raised.
+    """
+    client = client or gnews_client
+    variants = query_variants(topic, related, max_results=max_results)
+
+    def _run(variant: QueryVariant):
+        try:
+            return client.get_articles(*variant), None
+        except Exception as e:
+            return [], e
+
+    with ThreadPoolExecutor(
+        max_workers=len(variants), thread_name_prefix="gnews"
+    ) as pool:
+        # Each variant carries the caller's context so its request is
+        # attributed to the caller's run (see news_crew.metrics)
+        futures = [
+            pool.submit(contextvars.copy_context().run, _run, variant)
+            for variant in variants
+        ]
+        outcomes = [future.result() for future in futures]
+
+    errors = [err for _, err in outcomes if err is not None]
+    if errors and len(errors) == len(outcomes):
+        raise errors[0]
+    return merge_articles([articles for articles, _ in outcomes])
+
+
+# Shared so the rate limit applies across all requests in this process
+gnews_client = GNewsClient(
+    rate_limiter=TokenBucket(
+        rate=float(os.getenv("GNEWS_RATE_PER_SEC", "1")),
+        capacity=float(os.getenv("GNEWS_BURST", "5")),
+    )
+)
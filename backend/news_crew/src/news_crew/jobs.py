@@ -0,0 +1,153 @@
+"""
+Bounded job queue for pipeline runs.
+
+A fixed number of worker threads run jobs in FIFO order. At most
+``max_queue`` jobs may wait; submitting beyond that raises QueueFullError so
+the API can answer 429 instead of piling up crew runs. Finished jobs are kept
+(up to ``keep_finished``) so clients can poll for results.
+"""
+
+import itertools
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity."""
+
+
+class Job:
+    def __init__(self, fn: Callable[..., Any], args: tuple, kwargs: dict, meta: dict):
+        self.id = uuid.uuid4().hex
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.meta = meta
+        self.status = "queued"  # queued -> running -> done | failed
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.future: Future = Future()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            **self.meta,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    def __init__(self, workers: int = 2, max_queue: int = 16, keep_finished: int = 256):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.keep_finished = keep_finished
+
+        self._cond = threading.Condition()
+        self._pending: Deque[Job] = deque()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._running = 0
+        self._threads = []
+        self._counter = itertools.count(1)
+
+    def _ensure_workers(self) -> None:
+        # Caller holds self._cond
+        while len(self._threads) < self.workers:
+            t = threading.Thread(
+                target=self._worker,
+                name=f"news-job-worker-{next(self._counter)}",
+                daemon=True,
+            )
+            t.start()
+            self._threads.append(t)
+
+    # ---------------- Public API ----------------
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        meta: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> Job:
+        job = Job(fn, args, kwargs, meta or {})
+        with self._cond:
+            if len(self._pending) >= self.max_queue:
+                raise QueueFullError(
+                    f"Job queue is full ({self.max_queue} waiting); try again later"
+                )
+            self._ensure_workers()
+            self._pending.append(job)
+            self._jobs[job.id] = job
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def queue_position(self, job: Job) -> Optional[int]:
+        """1-based position among waiting jobs; None once the job has started."""
+        with self._cond:
+            for position, pending in enumerate(self._pending, start=1):
+                if pending is job:
+                    return position
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queued": len(self._pending),
+                "max_queue": self.max_queue,
+            }
+
+    # ---------------- Worker loop ----------------
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                job = self._pending.popleft()
+                job.status = "running"
+                job.started_at = time.time()
+                self._running += 1
+
+            try:
+                result = job.fn(*job.args, **job.kwargs)
+            except BaseException as e:
+                job.finished_at = time.time()
+                job.status = "failed"
+                job.error = str(e)
+                job.future.set_exception(e)
+            else:
+                job.finished_at = time.time()
+                job.status = "done"
+                job.future.set_result(result)
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._forget_old_jobs()
+
+    def _forget_old_jobs(self) -> None:
+        # Caller holds self._cond; drop the oldest finished jobs past the limit
+        finished = [j for j in self._jobs.values() if j.finished_at is not None]
+        for job in finished[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job.id]
+
+
+# Shared by the API endpoints
+job_manager = JobManager(
+    workers=int(os.getenv("NEWS_WORKERS", "2")),
+    max_queue=int(os.getenv("NEWS_MAX_QUEUE", "16")),
+)
@@ -0,0 +1,210 @@
+"""
+Incremental, tolerant extraction of article objects from LLM output.
+
+Agents are asked for a JSON array of articles but the text they produce is
+only mostly JSON: it may be wrapped in ```json fences or a ReAct
+"Final Answer:" line, have trailing commas, or stop mid-object when the
+model runs out of tokens. ``ArticleStreamParser`` scans the text as it
+arrives, chunk by chunk, and hands back each article object as soon as its
+closing brace does, so articles can go downstream while the model is still
+generating. One bad article is skipped instead of failing the whole output,
+and ``finish()`` salvages what it can from a truncated tail.
+
+The articles are the objects directly inside the first array of objects in
+the text: a bare ``[{...}, ...]`` or the list in ``{"articles": [...]}``.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+_CLOSERS = {"{": "}", "[": "]"}
+# A comma right before a closing bracket, outside strings (see _drop_trailing_commas)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+
+
+def _drop_trailing_commas(text: str) -> str:
+    out = []
+    in_string = escape = False
+    start = 0
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+                out.append(text[start : i + 1])
+                start = i + 1
+        elif ch == '"':
+            out.append(_TRAILING_COMMA.sub(r"\1", text[start:i]))
+            start = i
+            in_string = True
+    tail = text[start:]
+    out.append(tail if in_string else _TRAILING_COMMA.sub(r"\1", tail))
+    return "".join(out)
+
+
+def loads_tolerant(text: str) -> Any:
+    """json.loads that also accepts raw newlines in strings and trailing commas."""
+    try:
+        return json.loads(text, strict=False)
+    except ValueError:
+        return json.loads(_drop_trailing_commas(text), strict=False)
+
+
+class ArticleStreamParser:
+    """
+    ``feed()`` text as it arrives and ``finish()`` at the end; both return
+    the articles they completed, and ``articles`` holds all of them.
+    ``on_article``, if given, is also called with each one as it completes.
+    """
+
+    def __init__(self, on_article: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.on_article = on_article
+        self.articles: List[Dict[str, Any]] = []
+        self.skipped = 0
+        self.truncated = False
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget any partial state, e.g. when a new LLM response starts."""
+        self._text = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        # Stack depth of the article objects, once the article array is found
+        self._article_depth: Optional[int] = None
+        self._article_start: Optional[int] = None
+        # Last comma between members of the article being read
+        self._member_end: Optional[int] = None
+
+    # ---------------- Input ----------------
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume more text; returns the articles completed by it."""
+        self._text += chunk
+        completed: List[Dict[str, Any]] = []
+        text = self._text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if not self._stack and ch not in "[{":
+                # Prose, fences or "Final Answer:" around the JSON
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                self._open(ch, i)
+            elif ch in "]}":
+                article = self._close(i)
+                if article is not None:
+                    completed.append(article)
+            elif ch == "," and len(self._stack) == self._article_depth:
+                self._member_end = i
+        self._pos = len(text)
+
+        if self._article_start is None and not self._stack:
+            # Nothing buffered is needed any more
+            self._text = ""
+            self._pos = 0
+        return completed
+
+    def _open(self, ch: str, i: int) -> None:
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(ch)
+        if ch != "{" or parent != "[":
+            return
+        if self._article_depth is None:
+            self._article_depth = len(self._stack)
+        if len(self._stack) == self._article_depth:
+            self._article_start = i
+            self._member_end = None
+
+    def _close(self, i: int) -> Optional[Dict[str, Any]]:
+        if not self._stack:
+            return None
+        depth = len(self._stack)
+        self._stack.pop()
+
+        if depth == self._article_depth and self._article_start is not None:
+            raw = self._text[self._article_start : i + 1]
+            self._article_start = None
+            return self._add(raw)
+        if self._article_depth is not None and depth < self._article_depth:
+            # The article array itself closed; a later array may start over
+            self._article_depth = None
+        return None
+
+    def _add(self, raw: str) -> Optional[Dict[str, Any]]:
+        try:
+            article = loads_tolerant(raw)
+        except ValueError:
+            self.skipped += 1
+            return None
+        if not isinstance(article, dict):
+            self.skipped += 1
+            return None
+        self._accept(article)
+        return article
+
+    def _accept(self, article: Dict[str, Any]) -> None:
+        self.articles.append(article)
+        if self.on_article is not None:
+            self.on_article(article)
+
+    # ---------------- End of input ----------------
+    def finish(self) -> List[Dict[str, Any]]:
+        """
+        Call once the output is complete. If it stopped inside an article,
+        that article is closed and returned when it can be parsed: first
+        as-is (keeping a cut-off summary), else without its unfinished member.
+        """
+        if self._article_start is None:
+            self.reset()
+            return []
+        self.truncated = True
+        raw = self._text[self._article_start :]
+        if self._in_string:
+            # Drop a dangling escape before closing the string
+            raw = (raw[:-1] if self._escape else raw) + '"'
+        inner = self._stack[self._article_depth - 1 :]
+        candidates = [
+            raw.rstrip().rstrip(",") + "".join(_CLOSERS[c] for c in reversed(inner))
+        ]
+        if self._member_end is not None:
+            candidates.append(self._text[self._article_start : self._member_end] + "}")
+        self.reset()
+
+        for candidate in candidates:
+            try:
+                article = loads_tolerant(candidate)
+            except ValueError:
+                continue
+            if isinstance(article, dict) and article:
+                self._accept(article)
+                return [article]
+        self.skipped += 1
+        return []
+
+
+def parse_articles(text: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Articles in a complete LLM output, or None when it holds no array of
+    objects at all (as opposed to one whose articles were all malformed).
+    """
+    parser = ArticleStreamParser()
+    parser.feed(text)
+    parser.finish()
+    if not parser.articles and not parser.skipped:
+        return None
+    return parser.articles
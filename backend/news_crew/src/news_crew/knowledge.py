@@ -0,0 +1,109 @@
+"""
+Direct ingestion of finished articles into CrewAI knowledge memory.
+
+This used to be knowledge_agent_task: a full extra LLM pass whose only job
+was to re-output the sentiment task's JSON so that CrewAI memory would store
+it. Now the sentiment task's articles are validated here and written with a
+single batched embed-and-upsert, and the pipeline returns them directly.
+
+Articles go to the "knowledge_news_articles" Chroma collection under
+CREWAI_STORAGE_DIR/knowledge (what inspectChromaDB.py lists), one document
+per article keyed by canonical URL, so a re-run updates an article instead
+of adding a copy. Documents are embedded with the crews' memory embedder.
+"""
+
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from news_crew.crew import OLLAMA_EMBEDDER
+from news_crew.urls import canonical_url
+from news_crew.vector_index import summary_text
+
+SENTIMENTS = ("positive", "neutral", "negative")
+
+
+def _confidence(value: Any) -> Optional[float]:
+    try:
+        return min(max(float(value), 0.0), 1.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def validate_articles(articles: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Keep the dicts that have a headline and a URL, with the fields
+    knowledge_agent_task used to return: headline, source, url,
+    publish_date, summary, sentiment (positive/neutral/negative) and
+    confidence (0-1 or None).
+    """
+    valid = []
+    for a in articles:
+        if not isinstance(a, dict) or not a.get("url") or not a.get("headline"):
+            continue
+        sentiment = str(a.get("sentiment") or "neutral").strip().lower()
+        valid.append(
+            {
+                "headline": str(a["headline"]),
+                "source": str(a.get("source") or ""),
+                "url": str(a["url"]),
+                "publish_date": str(a.get("publish_date") or ""),
+                "summary": str(a.get("summary") or ""),
+                "sentiment": sentiment if sentiment in SENTIMENTS else "neutral",
+                "confidence": _confidence(a.get("confidence")),
+            }
+        )
+    return valid
+
+
+class ArticleKnowledge:
+    def __init__(
+        self, embedder: Dict[str, Any], collection_name: str = "news_articles"
+    ):
+        self.embedder = embedder
+        self.collection_name = collection_name
+        self._lock = threading.Lock()
+        self._collection = None
+
+    def _get_collection(self):
+        # Opening Chroma is slow, and not needed until the first ingest
+        with self._lock:
+            if self._collection is None:
+                from crewai.knowledge.storage.knowledge_storage import (
+                    KnowledgeStorage,
+                )
+
+                storage = KnowledgeStorage(
+                    embedder=self.embedder, collection_name=self.collection_name
+                )
+                storage.initialize_knowledge_storage()
+                self._collection = storage.collection
+            return self._collection
+
+    def ingest(self, articles: List[Dict[str, Any]], topic: str) -> int:
+        """Upsert validated articles that have a summary; returns how many."""
+        by_key = {}
+        for a in articles:
+            key = canonical_url(a["url"])
+            if key and a["summary"]:
+                by_key[key] = a
+        if not by_key:
+            return 0
+
+        self._get_collection().upsert(
+            ids=[hashlib.sha256(key.encode("utf-8")).hexdigest() for key in by_key],
+            documents=[summary_text(a) for a in by_key.values()],
+            metadatas=[
+                # Chroma metadata values cannot be None
+                {
+                    **{k: v for k, v in a.items() if v is not None},
+                    "topic": topic,
+                }
+                for a in by_key.values()
+            ],
+        )
+        return len(by_key)
+
+
+# Shared by every full-crew run in this process
+article_knowledge = ArticleKnowledge(OLLAMA_EMBEDDER)
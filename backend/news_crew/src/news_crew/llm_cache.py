@@ -0,0 +1,299 @@
+"""
+Prompt-level cache for the agents' LLM calls.
+
+The same prompt reaches the model again and again: the fetcher and cleaner
+tasks of a topic whose GNews results have not changed, memory evaluation of
+an unchanged task, every development or benchmark rerun. Each response is
+kept in SQLite, keyed by a hash of the model, the sampling parameters (stop
+words, temperature, max tokens, seed, ...), the tool schemas and the full
+message list. Connection settings (API key, base URL, timeout) and streaming
+do not change the answer and are left out of the key.
+
+NEWS_LLM_CACHE selects the mode:
+
+- ``on`` (default): serve hits from the cache, call the model on a miss and
+  store its response;
+- ``record``: always call the model and store (overwrite) its response, to
+  refresh a recording;
+- ``replay``: only serve from the cache. A miss raises LLMCacheMiss instead
+  of calling the model, so a recorded run can be repeated offline and gives
+  the same output every time;
+- ``off``: no cache.
+
+Calls that pass ``available_functions`` run the functions the model picks,
+so they always go to the model. Past ``max_bytes`` of stored responses
+(NEWS_LLM_CACHE_MAX_BYTES) the least recently used are evicted.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from crewai import LLM
+from crewai.utilities.events import crewai_event_bus
+from crewai.utilities.events.llm_events import (
+    LLMCallCompletedEvent,
+    LLMCallStartedEvent,
+    LLMCallType,
+    LLMStreamChunkEvent,
+)
+
+from news_crew import metrics
+from news_crew.paths import local_store_path
+
+MODES = ("on", "record", "replay", "off")
+
+# Completion parameters that do not change the response
+_UNKEYED = ("api_key", "api_base", "base_url", "api_version", "timeout", "stream")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses (last_used);
+"""
+
+LLM_CACHE_CALLS = metrics.Counter(
+    "news_llm_cache",
+    "Agent LLM calls by prompt cache outcome (hit, miss, record).",
+    ["outcome"],
+)
+
+
+class LLMCacheMiss(LookupError):
+    """A replay-mode call whose prompt was never recorded."""
+
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._conn.execute(
+                "UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+        return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, model, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds self._lock inside a transaction. Keeps the most
+        # recently used responses that fit in max_bytes together.
+        self._evictions += self._conn.execute(
+            "DELETE FROM llm_responses WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(size) OVER "
+            "(ORDER BY last_used DESC, key ROWS UNBOUNDED PRECEDING) AS total "
+            "FROM llm_responses) WHERE total > ?)",
+            (self.max_bytes,),
+        ).rowcount
+
+    def checkpoint(self) -> None:
+        """Move the WAL into the database file, so the file alone can be copied."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_responses")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+            lookups = self._hits + self._misses
+            return {
+                "mode": cache_mode(),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedLLM(LLM):
+    """A CrewAI LLM whose ``call`` goes through an LLMResponseCache."""
+
+    cache: LLMResponseCache
+    cache_mode: str
+
+    @classmethod
+    def from_llm(cls, llm: LLM, cache: LLMResponseCache, mode: str) -> "CachedLLM":
+        # Same configuration as ``llm`` (what copy.copy does), rather than
+        # re-deriving it from the environment
+        cached = cls.__new__(cls)
+        cached.__dict__.update(llm.__dict__)
+        cached.cache = cache
+        cached.cache_mode = mode
+        return cached
+
+    def cache_key(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+    ) -> str:
+        params = self._prepare_completion_params(messages, tools)
+        for name in _UNKEYED:
+            params.pop(name, None)
+        # default=str: response_format may be a pydantic model class
+        payload = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        if available_functions:
+            return super().call(
+                messages, tools, callbacks, available_functions, from_task, from_agent
+            )
+
+        key = self.cache_key(messages, tools)
+        if self.cache_mode != "record":
+            response = self.cache.get(key)
+            if response is not None:
+                LLM_CACHE_CALLS.inc(outcome="hit")
+                self._emit_cached(messages, tools, response, from_task, from_agent)
+                return response
+            LLM_CACHE_CALLS.inc(outcome="miss")
+            if self.cache_mode == "replay":
+                raise LLMCacheMiss(
+                    f"No recorded {self.model} response for prompt {key[:12]} "
+                    "(NEWS_LLM_CACHE=replay); record it with NEWS_LLM_CACHE=record"
+                )
+        else:
+            LLM_CACHE_CALLS.inc(outcome="record")
+
+        response = super().call(messages, tools, callbacks, None, from_task, from_agent)
+        if isinstance(response, str) and response:
+            self.cache.put(key, self.model, response)
+            if self.cache_mode == "record":
+                # A recording is meant to be copied to where it is replayed
+                self.cache.checkpoint()
+        return response
+
+    def _emit_cached(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]],
+        response: str,
+        from_task: Optional[Any],
+        from_agent: Optional[Any],
+    ) -> None:
+        # The events a live call emits, so CrewAI's listeners and the
+        # streamed article parser (news_crew.progress) see the response too
+        with metrics.cached_llm_call():
+            crewai_event_bus.emit(
+                self,
+                event=LLMCallStartedEvent(
+                    messages=messages,
+                    tools=tools,
+                    from_task=from_task,
+                    from_agent=from_agent,
+                    model=self.model,
+                ),
+            )
+            if self.stream:
+                crewai_event_bus.emit(
+                    self,
+                    event=LLMStreamChunkEvent(
+                        chunk=response, from_task=from_task, from_agent=from_agent
+                    ),
+                )
+            crewai_event_bus.emit(
+                self,
+                event=LLMCallCompletedEvent(
+                    messages=messages,
+                    response=response,
+                    call_type=LLMCallType.LLM_CALL,
+                    from_task=from_task,
+                    from_agent=from_agent,
+                    model=self.model,
+                ),
+            )
+
+
+def cache_mode() -> str:
+    mode = os.getenv("NEWS_LLM_CACHE", "on")
+    if mode not in MODES:
+        raise ValueError(
+            f"Unknown NEWS_LLM_CACHE {mode!r}; expected one of {', '.join(MODES)}"
+        )
+    return mode
+
+
+def _configured_cache() -> Optional[LLMResponseCache]:
+    if cache_mode() == "off":
+        return None
+    return LLMResponseCache(
+        os.getenv("NEWS_LLM_CACHE_PATH") or local_store_path("llm_cache.sqlite3"),
+        max_bytes=int(os.getenv("NEWS_LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+    )
+
+
+# Shared by every agent in this process; None when disabled
+llm_response_cache = _configured_cache()
+
+
+def cached_llm(llm: LLM) -> LLM:
+    """``llm`` behind the prompt cache in the configured mode (as is when off)."""
+    if llm_response_cache is None or not isinstance(llm, LLM):
+        return llm
+    return CachedLLM.from_llm(llm, llm_response_cache, cache_mode())
@@ -1,20 +1,59 @@
 #!/usr/bin/env python
+import os
 import sys
+import threading
 import warnings
 import asyncio, json
-from datetime import datetime
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import List, Literal, Optional
 
-from fastapi import FastAPI
+from crewai.utilities.llm_utils import create_llm
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+import requests
+from pydantic import BaseModel, Field
 
+from news_crew import maintenance, metrics
+from news_crew.article_cache import article_cache
+from news_crew.article_store import FEED_FIELDS, article_store
 from news_crew.crew import NewsCrew
-from news_crew.pipeline import run_news_pipeline  # ✅ clean import, no circular
+from news_crew.crew_pool import pool_stats, warm_pools
+from news_crew.jobs import Job, QueueFullError, job_manager
+from news_crew.llm_cache import cached_llm, llm_response_cache
+from news_crew.pipeline import (  # ✅ clean import, no circular
+    run_news_batch,
+    run_news_pipeline,
+)
+from news_crew.responses import json_response, make_etag, not_modified
+from news_crew.result_cache import normalize_topic
+from news_crew.scheduler import scheduler
+from news_crew.vector_index import article_vectors
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+
 # ---------------- FastAPI setup ----------------
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv("NEWS_WARM_CREWS", "1") == "1":
+        # Build the crew pools in the background; early requests build their own
+        threading.Thread(target=warm_pools, name="warm-crews", daemon=True).start()
+    # Retention and compaction of CrewAI memory (see news_crew.maintenance)
+    stop_maintenance = None
+    if maintenance.INTERVAL > 0:
+        stop_maintenance = maintenance.start_background(maintenance.INTERVAL)
+    # Pre-computes tracked and trending topics (see news_crew.scheduler)
+    if os.getenv("NEWS_SCHEDULER", "1") == "1":
+        scheduler.start()
+    yield
+    scheduler.stop()
+    if stop_maintenance is not None:
+        stop_maintenance.set()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS for frontend requests
 app.add_middleware(
@@ -29,45 +68,414 @@ app.add_middleware(
 # ---------------- Endpoints ----------------
 @app.get("/api/health")
 async def health_check():
-    return {"status": "ok", "message": "Backend is running with FastAPI + CrewAI"}
+    return {
+        "status": "ok",
+        "message": "Backend is running with FastAPI + CrewAI",
+        "crew_pools": pool_stats(),
+        "article_store": article_store.stats(),
+        "vector_index": article_vectors.index.stats(),
+        "article_cache": article_cache.stats() if article_cache else None,
+        "llm_cache": llm_response_cache.stats() if llm_response_cache else None,
+        "memory_maintenance": maintenance.last_report(),
+    }
+
+
+# ---------------- Metrics ----------------
+def _job_counts():
+    stats = job_manager.stats()
+    return {(state,): stats[state] for state in ("running", "queued")}
+
+
+metrics.Gauge("news_jobs", "Pipeline jobs by state.", _job_counts, ["state"])
+metrics.Gauge(
+    "news_crew_pool_idle",
+    "Pre-built crews waiting for a run, by pool.",
+    lambda: {(name,): stats["idle"] for name, stats in pool_stats().items()},
+    ["pool"],
+)
+
+
+@app.get("/api/metrics")
+def prometheus_metrics():
+    """
+    Prometheus metrics: pipeline, stage and crew task durations, LLM calls,
+    tokens and cost, tool calls, GNews/scraper/Ollama requests, retries,
+    errors and job queue depth.
+    """
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/api/scheduler")
+async def scheduler_status():
+    """Tracked and trending topics, runs in progress and the token budget."""
+    return scheduler.stats()
+
+
+PipelineMode = Literal["full", "fast"]
+
+
+def _submit_pipeline(topic: str, mode: str, **kwargs) -> Job:
+    """Queue a pipeline run on the bounded worker pool (429 when full)."""
+    scheduler.record_request(topic, mode)
+    try:
+        return job_manager.submit(
+            run_news_pipeline,
+            topic,
+            mode,
+            meta={"topic": topic, "mode": mode},
+            **kwargs,
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
 
 
 @app.get("/api/news")
-async def get_news(topic: str):
-    """Run CrewAI pipeline with a user-provided topic (blocking)."""
-    result = run_news_pipeline(topic)
-    return result
+async def get_news(
+    request: Request, topic: str, mode: PipelineMode = "full", timings: bool = False
+):
+    """
+    Run CrewAI pipeline with a user-provided topic (waits for the result).
+    timings=true adds per-stage timings, token counts and tool/service calls.
+    Compressed when the client accepts it, with an ETag (304 if unchanged).
+    """
+    job = _submit_pipeline(topic, mode, include_timings=timings)
+    # Await on the worker pool without blocking the event loop
+    return json_response(request, await asyncio.wrap_future(job.future))
+
+
+@app.get("/api/news/feed")
+def news_feed(
+    request: Request,
+    topic: str,
+    since: int = Query(0, ge=0),
+    cursor: Optional[int] = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = None,
+):
+    """
+    A topic's stored articles as a versioned feed, without a crew run.
+
+    Articles come newest version first, each with its "version"; an article
+    gets a new version when it is added to the topic or its content changes.
+    since=<version> returns only what changed after that version, cursor=
+    <next_cursor> the next page, fields=headline,url only those fields.
+    The response carries the topic's current "version" to poll with next,
+    and an ETag (304 while nothing changed); it is compressed when the
+    client accepts gzip or brotli.
+    """
+    projection = list(FEED_FIELDS)
+    if fields:
+        projection = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = sorted(set(projection) - set(FEED_FIELDS))
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown fields {unknown}; choose from {list(FEED_FIELDS)}",
+            )
+
+    version = article_store.feed_version(topic)
+    etag = make_etag(
+        normalize_topic(topic), version, since, cursor, limit, ",".join(projection)
+    )
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    articles, next_cursor = article_store.feed(
+        topic, since=since, cursor=cursor, limit=limit
+    )
+    keep = {*projection, "version"}
+    return json_response(
+        request,
+        {
+            "topic": topic,
+            "version": version,
+            "since": since,
+            "articles": [{k: v for k, v in a.items() if k in keep} for a in articles],
+            "next_cursor": next_cursor,
+        },
+        etag=etag,
+    )
+
+
+# ---------------- Article store ----------------
+@app.get("/api/articles/search")
+def search_articles(
+    q: Optional[str] = None,
+    topic: Optional[str] = None,
+    source: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    """Articles seen by earlier runs (full-text ``q`` plus filters), no crew run."""
+    articles = article_store.search(
+        query=q,
+        topic=topic,
+        source=source,
+        sentiment=sentiment,
+        since=since,
+        until=until,
+        limit=limit,
+        offset=offset,
+    )
+    return {"articles": articles, "count": len(articles), "offset": offset}
+
+
+@app.get("/api/articles/similar")
+def similar_articles(q: str, k: int = Query(10, ge=1, le=100)):
+    """Stored articles whose summaries are semantically closest to ``q``."""
+    try:
+        matches = article_vectors.similar(q, k=k)
+    except requests.RequestException as e:
+        raise HTTPException(status_code=503, detail=f"Embedding service error: {e}")
+    found = article_store.by_ids(item_id for item_id, _ in matches)
+    articles = [
+        {**found[item_id], "score": round(score, 4)}
+        for item_id, score in matches
+        if item_id in found
+    ]
+    return {"articles": articles, "count": len(articles)}
+
+
+# ---------------- Sentiment trends ----------------
+@app.get("/api/sentiment/timeseries")
+def sentiment_timeseries(
+    request: Request,
+    topic: Optional[str] = None,
+    source: Optional[str] = None,
+    granularity: Literal["hour", "day"] = "day",
+    days: int = Query(90, ge=1, le=366),
+    until: Optional[datetime] = None,
+):
+    """
+    Sentiment over the ``days`` up to ``until`` (default now) for a topic or a
+    source, from rollups kept up to date as articles are stored: per hourly
+    or daily bucket, the count per sentiment and the mean VADER compound and
+    confidence. Buckets without articles are left out.
+    """
+    if (topic is None) == (source is None):
+        raise HTTPException(
+            status_code=422, detail="Give exactly one of topic or source"
+        )
+    until = until or datetime.now(timezone.utc)
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+    since = until - timedelta(days=days)
+    dimension, key = ("topic", topic) if topic is not None else ("source", source)
+    buckets = article_store.sentiment_timeseries(
+        dimension, key, granularity=granularity, since=since, until=until
+    )
+    return json_response(
+        request,
+        {
+            dimension: key,
+            "granularity": granularity,
+            "since": since.isoformat(),
+            "until": until.isoformat(),
+            "buckets": buckets,
+        },
+    )
+
+
+# ---------------- Jobs ----------------
+class JobRequest(BaseModel):
+    topic: str
+    mode: PipelineMode = "full"
+    timings: bool = False
+
+
+def _job_status(job: Job) -> dict:
+    return {**job.to_dict(), "queue_position": job_manager.queue_position(job)}
+
+
+def _get_job_or_404(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job
+
+
+@app.post("/api/jobs", status_code=202)
+async def create_job(request: JobRequest):
+    """Queue a pipeline run and return its job ID immediately."""
+    job = _submit_pipeline(request.topic, request.mode, include_timings=request.timings)
+    return _job_status(job)
+
+
+@app.get("/api/jobs")
+async def jobs_overview():
+    return job_manager.stats()
+
+
+@app.get("/api/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Status, timestamps and queue position of a job."""
+    return _job_status(_get_job_or_404(job_id))
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    """The pipeline result once the job is done; 202 with status until then."""
+    job = _get_job_or_404(job_id)
+    if job.status in ("queued", "running"):
+        return JSONResponse(status_code=202, content=_job_status(job))
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    return job.future.result()
+
+
+def _sse(data: str, event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {data}\n\n"
+
+
+# Progress event type -> SSE event name (the final result stays an unnamed message)
+_SSE_EVENT_NAMES = {
+    "stage_started": "stage",
+    "stage_completed": "stage",
+    "step": "step",
+    "article": "article",
+    "topic": "topic",
+}
+
+
+def _event_queue():
+    """An asyncio queue plus a callback that feeds it from worker threads."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def on_event(event):
+        # Called from the worker thread
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    return queue, on_event
+
+
+async def _job_events(job: Job, queue: asyncio.Queue):
+    """
+    SSE for a job's events until it finishes, with "queue" (queue position)
+    while it waits for a worker and keep-alives while it runs.
+    """
+    work_task = asyncio.wrap_future(job.future)
+    position = job_manager.queue_position(job)
+    if position:
+        yield _sse(json.dumps({"type": "queued", "position": position}), "queue")
+
+    next_event = asyncio.ensure_future(queue.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                {next_event, work_task},
+                timeout=15,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if next_event in done:
+                event = next_event.result()
+                yield _sse(json.dumps(event), _SSE_EVENT_NAMES.get(event["type"]))
+                next_event = asyncio.ensure_future(queue.get())
+            elif work_task in done:
+                break
+            else:
+                position = job_manager.queue_position(job)
+                if position:
+                    yield _sse(
+                        json.dumps({"type": "queued", "position": position}),
+                        "queue",
+                    )
+                else:
+                    # SSE comment: keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+    finally:
+        next_event.cancel()
+
+    # Events queued before the run finished are delivered before the result
+    while not queue.empty():
+        event = queue.get_nowait()
+        yield _sse(json.dumps(event), _SSE_EVENT_NAMES.get(event["type"]))
 
 
 @app.get("/api/news-stream")
-async def news_stream(topic: str):
-    """Stream CrewAI pipeline progress + final JSON result."""
+async def news_stream(
+    topic: str,
+    mode: PipelineMode = "full",
+    timings: bool = False,
+    final_articles: bool = True,
+):
+    """
+    Stream CrewAI pipeline progress + final JSON result.
+
+    Named SSE events are sent as the pipeline runs: "stage" (task/stage
+    started or completed, with duration_ms), "step" (agent steps) and
+    "article" (each article once it is summarized and scored), plus "queue"
+    with the queue position while the run waits for a worker. The final
+    result is sent as an unnamed message (with a "timings" block when
+    timings=true), followed by "end". final_articles=false leaves the
+    articles, already sent as "article" events, out of the final result.
+    """
+    queue, on_event = _event_queue()
+
+    # Run heavy work on the bounded worker pool (429 before streaming if full)
+    job = _submit_pipeline(topic, mode, on_event=on_event, include_timings=timings)
 
     async def event_generator():
-        yield f"data: Starting pipeline for {topic}\n\n"
-
-        # (Optional) fake phases before running
-        yield "data: Running Fetcher Agent...\n\n"
-        await asyncio.sleep(0.1)
-        yield "data: Running Cleaner Agent...\n\n"
-        await asyncio.sleep(0.1)
-        yield "data: Running Summarizer Agent...\n\n"
-        await asyncio.sleep(0.1)
-        yield "data: Running Sentiment Agent...\n\n"
-        await asyncio.sleep(0.1)
-
-        # Run heavy work in a background thread
-        loop = asyncio.get_running_loop()
-        work_task = loop.run_in_executor(None, run_news_pipeline, topic)
-
-        # Keep-alive until done
-        while not work_task.done():
-            yield "data: ⏳ working...\n\n"
-            await asyncio.sleep(2)
-
-        result = await work_task
-        yield f"data: {json.dumps(result)}\n\n"
-        yield "event: end\ndata: done\n\n"
+        yield _sse(f"Starting pipeline for {topic}")
+        async for message in _job_events(job, queue):
+            yield message
+
+        result = await asyncio.wrap_future(job.future)
+        if not final_articles:
+            result = {k: v for k, v in result.items() if k != "articles"}
+        yield _sse(json.dumps(result))
+        yield _sse("done", "end")
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+# ---------------- Batches ----------------
+class BatchRequest(BaseModel):
+    topics: List[str] = Field(..., min_length=1, max_length=50)
+    timings: bool = False
+
+
+@app.post("/api/news/batch")
+async def news_batch(request: BatchRequest):
+    """
+    Fast-mode results for several topics in one run: an article that turns
+    up under several topics is scraped, summarized and scored once.
+
+    Streams SSE: a "topic" event ({"type", "topic", "result"}) as soon as
+    each topic's result is ready, in the order they finish, and "queue"
+    while the batch waits for a worker. Then the batch stats (with a
+    "timings" block when timings=true) as an unnamed message, and "end".
+    """
+    queue, on_event = _event_queue()
+    for topic in request.topics:
+        scheduler.record_request(topic, "fast")
+
+    def on_result(topic, result):
+        on_event({"type": "topic", "topic": topic, "result": result})
+
+    try:
+        job = job_manager.submit(
+            run_news_batch,
+            request.topics,
+            meta={"topics": request.topics, "mode": "batch"},
+            on_result=on_result,
+            include_timings=request.timings,
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    async def event_generator():
+        async for message in _job_events(job, queue):
+            yield message
+
+        batch = await asyncio.wrap_future(job.future)
+        yield _sse(json.dumps(batch["stats"]))
+        yield _sse("done", "end")
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -94,7 +502,10 @@ def train():
 
 
 def replay():
-    """Replay crew execution from a specific task."""
+    """
+    Replay crew execution from a specific task. With NEWS_LLM_CACHE=replay the
+    LLM answers come from a recorded run, offline.
+    """
     try:
         NewsCrew().crew().replay(task_id=sys.argv[1])
     except Exception as e:
@@ -102,11 +513,17 @@ def replay():
 
 
 def test():
-    """Test the crew execution and return results."""
+    """
+    Test the crew execution and return results. With NEWS_LLM_CACHE=replay
+    the agents and the evaluator answer from a recorded run, offline and
+    deterministically.
+    """
     inputs = {"topic": "AI LLMs", "current_year": str(datetime.now().year)}
     try:
         NewsCrew().crew().test(
-            n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs
+            n_iterations=int(sys.argv[1]),
+            eval_llm=cached_llm(create_llm(sys.argv[2])),
+            inputs=inputs,
         )
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
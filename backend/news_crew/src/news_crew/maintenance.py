@@ -0,0 +1,516 @@
+"""
+Retention, compaction and stats for CrewAI's memory stores.
+
+CrewAI only ever adds to the memory under crewai_storage/ (see crew.py): the
+Chroma collections for short-term and entity memory, the long-term memory
+table and the kickoff task outputs. Every memory=True crew searches them on
+each task, so retrieval gets slower as they grow. This module
+
+- reports, per store: size on disk, item count, oldest and newest item and
+  the latency of the lookup the crews run against it;
+- evicts items older than a TTL, and the oldest items beyond a per-store
+  count;
+- compacts: VACUUM for every SQLite file (Chroma's chroma.sqlite3 included)
+  and, with ``rebuild_index``, rewrites each Chroma collection so its HNSW
+  index drops the vectors that were deleted from it.
+
+Knowledge memory (news_crew.knowledge) is reported but never evicted: it
+holds one document per article URL, not per run.
+
+The API runs prune + compact every NEWS_MAINTENANCE_INTERVAL seconds, without
+the index rebuild: running crews keep their collections open, so rebuild
+only while the API is stopped. By hand:
+
+    python -m news_crew.maintenance stats
+    python -m news_crew.maintenance prune --ttl-days 7 --max-items 1000
+    python -m news_crew.maintenance compact --rebuild-index
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import uuid
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from chromadb.config import Settings
+from crewai.utilities.chromadb import create_persistent_client
+from crewai.utilities.paths import db_storage_path
+
+import news_crew.crew  # noqa: F401  (sets CREWAI_STORAGE_DIR)
+from news_crew import metrics
+
+TTL_DAYS = float(os.getenv("NEWS_MEMORY_TTL_DAYS", "30"))
+MAX_ITEMS = int(os.getenv("NEWS_MEMORY_MAX_ITEMS", "2000"))
+INTERVAL = float(os.getenv("NEWS_MAINTENANCE_INTERVAL", "21600"))
+
+# Chroma memories written by memory=True crews, one directory per crew
+_CHROMA_MEMORIES = ("short_term", "entities")
+
+# SQLite memory files: table, its timestamp as unix seconds, and the lookup
+# CrewAI runs against it ("?" is bound to the newest row's ``probe_param``)
+_SQLITE_STORES = {
+    "long_term_memory_storage.db": {
+        "table": "long_term_memories",
+        "timestamp": "CAST(datetime AS REAL)",
+        "probe": "SELECT metadata, datetime, score FROM long_term_memories "
+        "WHERE task_description = ? ORDER BY datetime DESC, score ASC LIMIT 3",
+        "probe_param": "task_description",
+    },
+    "latest_kickoff_task_outputs.db": {
+        "table": "latest_kickoff_task_outputs",
+        "timestamp": "CAST(strftime('%s', timestamp) AS REAL)",
+        "probe": "SELECT * FROM latest_kickoff_task_outputs ORDER BY task_index",
+        "probe_param": None,
+    },
+}
+
+# Chroma keeps created_at per item, as UTC text
+_CHROMA_ITEMS = """
+SELECT e.embedding_id, e.created_at FROM embeddings e
+JOIN segments s ON s.id = e.segment_id
+JOIN collections c ON c.id = s.collection
+WHERE c.name = ? AND s.scope = 'METADATA'
+ORDER BY e.created_at DESC, e.id DESC
+"""
+_CHROMA_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Queries timed per store for the latency figure
+_PROBES = 5
+_BATCH = 500
+
+
+# ---------------- Stores ----------------
+def memory_stores() -> List[Dict[str, Any]]:
+    """The memory stores that exist under CREWAI_STORAGE_DIR."""
+    root = Path(db_storage_path())
+    stores = []
+    for memory in _CHROMA_MEMORIES:
+        for path in sorted((root / memory).glob("*/chroma.sqlite3")):
+            stores.append(
+                {
+                    "name": f"{memory}/{path.parent.name}",
+                    "kind": "chroma",
+                    "path": path.parent,
+                    "evict": True,
+                }
+            )
+    if (root / "knowledge" / "chroma.sqlite3").exists():
+        stores.append(
+            {
+                "name": "knowledge",
+                "kind": "chroma",
+                "path": root / "knowledge",
+                "evict": False,
+            }
+        )
+    for file_name in _SQLITE_STORES:
+        if (root / file_name).exists():
+            stores.append(
+                {
+                    "name": file_name,
+                    "kind": "sqlite",
+                    "path": root / file_name,
+                    "evict": True,
+                }
+            )
+    return stores
+
+
+def _size(path: Path) -> int:
+    if path.is_file():
+        # The WAL and journal belong to the database
+        return sum(
+            p.stat().st_size
+            for p in (path, Path(f"{path}-wal"), Path(f"{path}-journal"))
+            if p.exists()
+        )
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def _chroma_client(path: Path):
+    # Same settings as CrewAI's storages, so this process shares their client
+    return create_persistent_client(str(path), settings=Settings(allow_reset=True))
+
+
+def _collection_names(client) -> List[str]:
+    # Chroma < 0.6 lists collections, later versions list names
+    return [getattr(c, "name", c) for c in client.list_collections()]
+
+
+def _read_only(path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def _chroma_items(path: Path, collection: str) -> List[tuple]:
+    """(id, created_at) for every item in a collection, newest first."""
+    conn = _read_only(path / "chroma.sqlite3")
+    try:
+        return conn.execute(_CHROMA_ITEMS, (collection,)).fetchall()
+    finally:
+        conn.close()
+
+
+def _seconds(started: float, runs: int) -> float:
+    return round((time.perf_counter() - started) / runs, 6)
+
+
+# ---------------- Stats ----------------
+def _chroma_stats(store: Dict[str, Any]) -> Dict[str, Any]:
+    client = _chroma_client(store["path"])
+    items = 0
+    oldest = newest = query_seconds = None
+    for name in _collection_names(client):
+        collection = client.get_collection(name, embedding_function=None)
+        rows = _chroma_items(store["path"], name)
+        items += len(rows)
+        if rows:
+            newest = max(newest or rows[0][1], rows[0][1])
+            oldest = min(oldest or rows[-1][1], rows[-1][1])
+
+        # Nearest-neighbour search with a stored vector, as memory recall does
+        sample = collection.peek(1).get("embeddings")
+        if sample is None or len(sample) == 0:
+            continue
+        vector = [float(x) for x in sample[0]]
+        started = time.perf_counter()
+        for _ in range(_PROBES):
+            collection.query(query_embeddings=[vector], n_results=min(5, len(rows)))
+        query_seconds = max(query_seconds or 0.0, _seconds(started, _PROBES))
+    return {
+        "items": items,
+        "oldest": oldest,
+        "newest": newest,
+        "query_seconds": query_seconds,
+    }
+
+
+def _sqlite_stats(store: Dict[str, Any]) -> Dict[str, Any]:
+    spec = _SQLITE_STORES[store["path"].name]
+    table, timestamp = spec["table"], spec["timestamp"]
+    conn = _read_only(store["path"])
+    try:
+        items, oldest, newest = conn.execute(
+            f"SELECT COUNT(*), MIN({timestamp}), MAX({timestamp}) FROM {table}"
+        ).fetchone()
+        params: tuple = ()
+        if spec["probe_param"]:
+            row = conn.execute(
+                f"SELECT {spec['probe_param']} FROM {table} "
+                "ORDER BY rowid DESC LIMIT 1"
+            ).fetchone()
+            params = (row[0] if row else "",)
+        started = time.perf_counter()
+        for _ in range(_PROBES):
+            conn.execute(spec["probe"], params).fetchall()
+        query_seconds = _seconds(started, _PROBES)
+    finally:
+        conn.close()
+
+    def _utc(ts: Optional[float]) -> Optional[str]:
+        return time.strftime(_CHROMA_TIME_FORMAT, time.gmtime(ts)) if ts else None
+
+    return {
+        "items": items,
+        "oldest": _utc(oldest),
+        "newest": _utc(newest),
+        "query_seconds": query_seconds,
+    }
+
+
+def stats() -> Dict[str, Any]:
+    """
+    Per store: kind, bytes on disk, items, oldest/newest item (UTC) and the
+    mean latency of its memory lookup in seconds.
+    """
+    report = []
+    for store in memory_stores():
+        entry = {"name": store["name"], "kind": store["kind"]}
+        try:
+            if store["kind"] == "chroma":
+                entry.update(_chroma_stats(store))
+            else:
+                entry.update(_sqlite_stats(store))
+        except Exception as e:
+            entry["error"] = str(e)
+        entry["bytes"] = _size(store["path"])
+        report.append(entry)
+    return {
+        "storage_dir": db_storage_path(),
+        "stores": report,
+        "total_bytes": sum(entry["bytes"] for entry in report),
+    }
+
+
+# ---------------- Retention ----------------
+def _prune_chroma(store: Dict[str, Any], cutoff: float, max_items: int) -> int:
+    client = _chroma_client(store["path"])
+    cutoff_text = time.strftime(_CHROMA_TIME_FORMAT, time.gmtime(cutoff))
+    evicted = 0
+    for name in _collection_names(client):
+        rows = _chroma_items(store["path"], name)
+        expired = [
+            item_id
+            for i, (item_id, created_at) in enumerate(rows)
+            if created_at < cutoff_text or (max_items and i >= max_items)
+        ]
+        if not expired:
+            continue
+        collection = client.get_collection(name, embedding_function=None)
+        for i in range(0, len(expired), _BATCH):
+            collection.delete(ids=expired[i : i + _BATCH])
+        evicted += len(expired)
+    return evicted
+
+
+def _prune_sqlite(store: Dict[str, Any], cutoff: float, max_items: int) -> int:
+    spec = _SQLITE_STORES[store["path"].name]
+    table, timestamp = spec["table"], spec["timestamp"]
+    with sqlite3.connect(store["path"], timeout=30) as conn:
+        evicted = conn.execute(
+            f"DELETE FROM {table} WHERE {timestamp} < ?", (cutoff,)
+        ).rowcount
+        if max_items:
+            evicted += conn.execute(
+                f"DELETE FROM {table} WHERE rowid NOT IN (SELECT rowid FROM "
+                f"{table} ORDER BY {timestamp} DESC, rowid DESC LIMIT ?)",
+                (max_items,),
+            ).rowcount
+    return evicted
+
+
+def prune(ttl_days: float = TTL_DAYS, max_items: int = MAX_ITEMS) -> Dict[str, Any]:
+    """
+    Evict memory older than ``ttl_days`` and, per store, all but the newest
+    ``max_items`` items. 0 turns either limit off.
+    """
+    cutoff = time.time() - ttl_days * 86400 if ttl_days > 0 else 0.0
+    report = []
+    for store in memory_stores():
+        if not store["evict"]:
+            continue
+        entry: Dict[str, Any] = {"name": store["name"]}
+        try:
+            prune_store = _prune_chroma if store["kind"] == "chroma" else _prune_sqlite
+            entry["evicted"] = prune_store(store, cutoff, max_items)
+        except Exception as e:
+            entry["error"] = str(e)
+        report.append(entry)
+    return {
+        "ttl_days": ttl_days,
+        "max_items": max_items,
+        "stores": report,
+        "evicted": sum(entry.get("evicted", 0) for entry in report),
+    }
+
+
+# ---------------- Compaction ----------------
+def _vacuum(path: Path) -> None:
+    # Waits for writers instead of failing; VACUUM needs the database to itself
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    try:
+        if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+def _rebuild_collection(client, name: str) -> int:
+    """Copy a collection into a fresh one (and HNSW index), then swap names."""
+    old = client.get_collection(name, embedding_function=None)
+    data = old.get(include=["embeddings", "documents", "metadatas"])
+    fresh = client.create_collection(
+        f"{name}-rebuild", metadata=old.metadata, embedding_function=None
+    )
+    ids = data["ids"]
+    for i in range(0, len(ids), _BATCH):
+        batch = range(i, min(i + _BATCH, len(ids)))
+        # Chroma rejects empty metadata, so items without any go in separately
+        for with_metadata in (True, False):
+            picked = [j for j in batch if bool(data["metadatas"][j]) == with_metadata]
+            if not picked:
+                continue
+            fresh.add(
+                ids=[ids[j] for j in picked],
+                embeddings=[[float(x) for x in data["embeddings"][j]] for j in picked],
+                documents=[data["documents"][j] for j in picked],
+                metadatas=(
+                    [data["metadatas"][j] for j in picked] if with_metadata else None
+                ),
+            )
+    client.delete_collection(name)
+    fresh.modify(name=name)
+    return len(ids)
+
+
+def _remove_orphan_segments(path: Path) -> None:
+    # Chroma leaves the index directory of a deleted collection behind
+    # unless this process had loaded it
+    conn = _read_only(path / "chroma.sqlite3")
+    try:
+        live = {row[0] for row in conn.execute("SELECT id FROM segments")}
+    finally:
+        conn.close()
+    for child in path.iterdir():
+        if not child.is_dir() or child.name in live:
+            continue
+        try:
+            uuid.UUID(child.name)
+        except ValueError:
+            continue
+        shutil.rmtree(child)
+
+
+def compact(rebuild_index: bool = False) -> Dict[str, Any]:
+    """
+    VACUUM every store's SQLite file. ``rebuild_index`` also rebuilds each
+    Chroma collection's HNSW index; only do that while no crew is running.
+    """
+    report = []
+    for store in memory_stores():
+        entry: Dict[str, Any] = {
+            "name": store["name"],
+            "bytes_before": _size(store["path"]),
+        }
+        try:
+            if store["kind"] == "chroma":
+                if rebuild_index:
+                    client = _chroma_client(store["path"])
+                    entry["rebuilt"] = {
+                        name: _rebuild_collection(client, name)
+                        for name in _collection_names(client)
+                    }
+                    _remove_orphan_segments(store["path"])
+                _vacuum(store["path"] / "chroma.sqlite3")
+            else:
+                _vacuum(store["path"])
+        except Exception as e:
+            entry["error"] = str(e)
+        entry["bytes_after"] = _size(store["path"])
+        report.append(entry)
+    return {
+        "stores": report,
+        "reclaimed_bytes": sum(e["bytes_before"] - e["bytes_after"] for e in report),
+    }
+
+
+# ---------------- Scheduled runs ----------------
+_last_report: Optional[Dict[str, Any]] = None
+_lock = threading.Lock()
+
+
+def run_maintenance(
+    ttl_days: float = TTL_DAYS, max_items: int = MAX_ITEMS, rebuild_index: bool = False
+) -> Dict[str, Any]:
+    """prune(), then compact(), then stats(); the report also feeds /api/metrics."""
+    global _last_report
+    started = time.time()
+    report = {
+        "prune": prune(ttl_days, max_items),
+        "compact": compact(rebuild_index=rebuild_index),
+        "stats": stats(),
+    }
+    report["finished_at"] = time.strftime(_CHROMA_TIME_FORMAT, time.gmtime())
+    report["duration_s"] = round(time.time() - started, 3)
+    with _lock:
+        _last_report = report
+    return report
+
+
+def last_report() -> Optional[Dict[str, Any]]:
+    with _lock:
+        return _last_report
+
+
+def start_background(interval: float = INTERVAL) -> threading.Event:
+    """
+    Run run_maintenance() every ``interval`` seconds on a daemon thread, the
+    first run one interval from now. Set the returned event to stop.
+    """
+    stop = threading.Event()
+
+    def _loop() -> None:
+        while not stop.wait(interval):
+            try:
+                run_maintenance()
+            except Exception as e:
+                print(f"⚠️ Memory maintenance failed: {e}")
+
+    threading.Thread(target=_loop, name="memory-maintenance", daemon=True).start()
+    return stop
+
+
+def _last_stats(field: str) -> Dict[tuple, float]:
+    report = last_report()
+    if report is None:
+        return {}
+    return {
+        (entry["name"],): entry[field]
+        for entry in report["stats"]["stores"]
+        if entry.get(field) is not None
+    }
+
+
+metrics.Gauge(
+    "news_memory_items",
+    "Items per CrewAI memory store at the last maintenance run.",
+    lambda: _last_stats("items"),
+    ["store"],
+)
+metrics.Gauge(
+    "news_memory_bytes",
+    "Bytes on disk per CrewAI memory store at the last maintenance run.",
+    lambda: _last_stats("bytes"),
+    ["store"],
+)
+metrics.Gauge(
+    "news_memory_query_seconds",
+    "Mean memory lookup latency per store at the last maintenance run.",
+    lambda: _last_stats("query_seconds"),
+    ["store"],
+)
+
+
+# ---------------- CLI ----------------
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(
+        prog="python -m news_crew.maintenance",
+        description="Stats, retention and compaction for CrewAI memory stores.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="size, items and lookup latency per store")
+    prune_parser = commands.add_parser("prune", help="evict old memory")
+    compact_parser = commands.add_parser("compact", help="VACUUM (and rebuild)")
+    run_parser = commands.add_parser("run", help="prune, compact, then stats")
+    for sub in (prune_parser, run_parser):
+        sub.add_argument("--ttl-days", type=float, default=TTL_DAYS)
+        sub.add_argument("--max-items", type=int, default=MAX_ITEMS)
+    for sub in (compact_parser, run_parser):
+        sub.add_argument(
+            "--rebuild-index",
+            action="store_true",
+            help="rebuild Chroma HNSW indexes (stop the API first)",
+        )
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        report = stats()
+    elif args.command == "prune":
+        report = prune(args.ttl_days, args.max_items)
+    elif args.command == "compact":
+        report = compact(rebuild_index=args.rebuild_index)
+    else:
+        report = run_maintenance(
+            args.ttl_days, args.max_items, rebuild_index=args.rebuild_index
+        )
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
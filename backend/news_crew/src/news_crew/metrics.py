@@ -0,0 +1,537 @@
+"""
+Pipeline instrumentation, exported in the Prometheus text format.
+
+Everything a run does is timed and counted in process-wide metrics:
+
+- pipeline runs, by mode and outcome (ok, error, cached)
+- every stage: the plain-Python stages and each crew task, with errors
+- LLM calls, tokens and estimated cost per stage (crew tasks); calls
+  answered by the prompt cache (news_crew.llm_cache) count as outcome=cached
+- every agent tool call, by tool and outcome
+- calls to GNews, the scraper backends and Ollama, by service and outcome
+- retries, by component
+
+``render()`` produces the /api/metrics payload. While a run is wrapped in
+``collect_run()`` the same numbers are also gathered for that run only and
+can be returned with the response as a ``timings`` block. The per-run
+collector lives in a context variable, so worker pools that submit with
+``contextvars.copy_context().run`` (GNews variants, page scraping) report
+into the run that started them.
+
+LLM cost is estimated from token counts with NEWS_LLM_PROMPT_COST_PER_1K and
+NEWS_LLM_COMPLETION_COST_PER_1K (USD per 1,000 tokens, default 0 for local
+models).
+"""
+
+import bisect
+import contextvars
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; wide enough for a 5 ms cache lookup and a multi-minute crew run
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+
+PROMPT_COST_PER_1K = float(os.getenv("NEWS_LLM_PROMPT_COST_PER_1K", "0"))
+COMPLETION_COST_PER_1K = float(os.getenv("NEWS_LLM_COMPLETION_COST_PER_1K", "0"))
+
+LabelValues = Tuple[str, ...]
+
+
+# ---------------- Metric types ----------------
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name + "_total", dict(zip(self.labelnames, key)), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def samples(self):
+        with self._lock:
+            series = {k: (list(c), s[0]) for k, (c, s) in self._series.items()}
+        for key, (counts, total) in sorted(series.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else repr(bound)
+                yield self.name + "_bucket", {**labels, "le": le}, cumulative
+            yield self.name + "_sum", labels, total
+            yield self.name + "_count", labels, cumulative
+
+
+class Gauge(_Metric):
+    """A gauge read at scrape time: ``read()`` returns {label values: value}."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = (),
+    ):
+        super().__init__(name, help, labelnames)
+        self.read = read
+
+    def samples(self):
+        try:
+            values = self.read()
+        except Exception:
+            # A broken stats source must not take /api/metrics down with it
+            return
+        for key, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+_REGISTRY: List[_Metric] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in _REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            if labels:
+                rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                name = f"{name}{{{rendered}}}"
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ---------------- Pipeline metrics ----------------
+PIPELINE_SECONDS = Histogram(
+    "news_pipeline_duration_seconds",
+    "Wall time of run_news_pipeline calls.",
+    ["mode", "outcome"],
+)
+STAGE_SECONDS = Histogram(
+    "news_stage_duration_seconds",
+    "Wall time of pipeline stages and crew tasks.",
+    ["stage"],
+)
+STAGE_ERRORS = Counter(
+    "news_stage_errors",
+    "Stages and crew tasks that raised.",
+    ["stage"],
+)
+LLM_CALL_SECONDS = Histogram(
+    "news_llm_call_duration_seconds",
+    "Wall time of individual LLM calls made by agents.",
+    ["stage"],
+)
+LLM_CALLS = Counter(
+    "news_llm_calls",
+    "LLM calls (memory and evaluation calls outside a task: stage=\"other\").",
+    ["stage", "outcome"],
+)
+LLM_TOKENS = Counter(
+    "news_llm_tokens",
+    "LLM tokens used by crew tasks.",
+    ["stage", "kind"],
+)
+LLM_COST = Counter(
+    "news_llm_cost_usd",
+    "Estimated LLM cost of crew tasks in USD.",
+    ["stage"],
+)
+TOOL_SECONDS = Histogram(
+    "news_tool_duration_seconds",
+    "Wall time of agent tool calls.",
+    ["tool"],
+)
+TOOL_CALLS = Counter(
+    "news_tool_calls",
+    "Agent tool calls.",
+    ["tool", "outcome"],
+)
+EXTERNAL_SECONDS = Histogram(
+    "news_external_request_duration_seconds",
+    "Wall time of requests to GNews, article pages and Ollama.",
+    ["service", "outcome"],
+)
+RETRIES = Counter(
+    "news_retries",
+    "Retried requests.",
+    ["component"],
+)
+
+
+# ---------------- Per-run collection ----------------
+_run: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "news_run_timings", default=None
+)
+# Tool, service and stage entries of one run may be updated from pool threads
+_run_lock = threading.Lock()
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def _new_run() -> Dict[str, Any]:
+    return {
+        "total_ms": 0.0,
+        "stages": [],
+        "llm": {
+            "calls": 0,
+            "errors": 0,
+            "cached": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cost_usd": 0.0,
+        },
+        "tools": {},
+        "services": {},
+        "retries": 0,
+    }
+
+
+@contextmanager
+def collect_run() -> Iterator[Dict[str, Any]]:
+    """
+    Also gather this run's numbers into the yielded dict:
+
+        {"total_ms", "stages": [{stage, duration_ms, ...}],
+         "llm": {calls, errors, cached, prompt_tokens, completion_tokens,
+                 cost_usd},
+         "tools": {name: {calls, errors, total_ms}},
+         "services": {name: {calls, errors, total_ms}}, "retries"}
+
+    Tool and service ``total_ms`` add up concurrent calls, so they can exceed
+    the wall time of the stage that made them.
+    """
+    timings = _new_run()
+    token = _run.set(timings)
+    started = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings["total_ms"] = _ms(time.perf_counter() - started)
+        _run.reset(token)
+
+
+def _count_into(section: str, name: str, seconds: float, error: bool) -> None:
+    timings = _run.get()
+    if timings is None:
+        return
+    with _run_lock:
+        entry = timings[section].setdefault(
+            name, {"calls": 0, "errors": 0, "total_ms": 0.0}
+        )
+        entry["calls"] += 1
+        entry["errors"] += int(error)
+        entry["total_ms"] = round(entry["total_ms"] + seconds * 1000, 1)
+
+
+def observe_stage(name: str, seconds: float, error: bool = False, **info: Any) -> None:
+    """Record one stage or crew task; ``info`` goes into the run's stage entry."""
+    STAGE_SECONDS.observe(seconds, stage=name)
+    if error:
+        STAGE_ERRORS.inc(stage=name)
+    timings = _run.get()
+    if timings is not None:
+        entry = {"stage": name, "duration_ms": _ms(seconds), **info}
+        if error:
+            entry["error"] = True
+        with _run_lock:
+            timings["stages"].append(entry)
+
+
+def observe_tool(name: str, seconds: float, error: bool = False) -> None:
+    TOOL_SECONDS.observe(seconds, tool=name)
+    TOOL_CALLS.inc(tool=name, outcome="error" if error else "ok")
+    _count_into("tools", name, seconds, error)
+
+
+def observe_retry(component: str) -> None:
+    RETRIES.inc(component=component)
+    timings = _run.get()
+    if timings is not None:
+        with _run_lock:
+            timings["retries"] += 1
+
+
+@contextmanager
+def external_call(service: str) -> Iterator[None]:
+    """Time one request to an external service ("gnews", "scraper", "ollama")."""
+    started = time.perf_counter()
+    error = True
+    try:
+        yield
+        error = False
+    finally:
+        seconds = time.perf_counter() - started
+        EXTERNAL_SECONDS.observe(
+            seconds, service=service, outcome="error" if error else "ok"
+        )
+        _count_into("services", service, seconds, error)
+
+
+def observe_llm_call(stage: str, seconds: float, error: bool = False) -> None:
+    if getattr(_cached_llm, "active", False):
+        # Served by the prompt cache: no model call to time
+        LLM_CALLS.inc(stage=stage, outcome="cached")
+        timings = _run.get()
+        if timings is not None:
+            with _run_lock:
+                timings["llm"]["cached"] += 1
+        return
+    LLM_CALL_SECONDS.observe(seconds, stage=stage)
+    LLM_CALLS.inc(stage=stage, outcome="error" if error else "ok")
+    timings = _run.get()
+    if timings is not None and error:
+        with _run_lock:
+            timings["llm"]["errors"] += 1
+
+
+def observe_tokens(
+    stage: str, prompt_tokens: int, completion_tokens: int, requests: int
+) -> Dict[str, Any]:
+    """Record one crew task's LLM usage; returns it for the stage entry."""
+    cost = (
+        prompt_tokens * PROMPT_COST_PER_1K + completion_tokens * COMPLETION_COST_PER_1K
+    ) / 1000
+    LLM_TOKENS.inc(prompt_tokens, stage=stage, kind="prompt")
+    LLM_TOKENS.inc(completion_tokens, stage=stage, kind="completion")
+    LLM_COST.inc(cost, stage=stage)
+    timings = _run.get()
+    if timings is not None:
+        with _run_lock:
+            llm = timings["llm"]
+            llm["calls"] += requests
+            llm["prompt_tokens"] += prompt_tokens
+            llm["completion_tokens"] += completion_tokens
+            llm["cost_usd"] = round(llm["cost_usd"] + cost, 6)
+    return {
+        "llm_calls": requests,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost_usd": round(cost, 6),
+    }
+
+
+# ---------------- Crew token accounting ----------------
+_crew_agents: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "news_crew_agents", default=None
+)
+
+
+def _usage(agent: Any) -> Tuple[int, int, int]:
+    process = getattr(agent, "_token_process", None)
+    if process is None:
+        return 0, 0, 0
+    summary = process.get_summary()
+    return (
+        summary.prompt_tokens,
+        summary.completion_tokens,
+        summary.successful_requests,
+    )
+
+
+@contextmanager
+def track_crew(crew: Any) -> Iterator[None]:
+    """
+    Attribute LLM usage to crew tasks during one kickoff. Pooled agents keep
+    counting across runs, so usage is taken as the difference per task.
+    """
+    agents = {
+        getattr(agent, "role", ""): [agent, _usage(agent)]
+        for agent in getattr(crew, "agents", [])
+    }
+    token = _crew_agents.set(agents)
+    try:
+        yield
+    finally:
+        _crew_agents.reset(token)
+
+
+def task_usage(stage: str, agent_role: Optional[str]) -> Dict[str, Any]:
+    """LLM usage of the task that just finished (empty outside track_crew)."""
+    agents = _crew_agents.get()
+    if not agents or agent_role not in agents:
+        return {}
+    agent, before = agents[agent_role]
+    after = _usage(agent)
+    agents[agent_role][1] = after
+    return observe_tokens(
+        stage,
+        prompt_tokens=after[0] - before[0],
+        completion_tokens=after[1] - before[1],
+        requests=after[2] - before[2],
+    )
+
+
+# ---------------- CrewAI event bus ----------------
+_listeners_installed = False
+_started = threading.local()
+_cached_llm = threading.local()
+
+
+@contextmanager
+def cached_llm_call() -> Iterator[None]:
+    """LLM call events emitted on this thread inside are for a cached response."""
+    _cached_llm.active = True
+    try:
+        yield
+    finally:
+        _cached_llm.active = False
+
+
+def _start(kind: str, name: str) -> None:
+    starts = getattr(_started, kind, None)
+    if starts is None:
+        starts = {}
+        setattr(_started, kind, starts)
+    starts.setdefault(name, []).append(time.perf_counter())
+
+
+def _elapsed(kind: str, name: str) -> float:
+    starts = getattr(_started, kind, None) or {}
+    stack = starts.get(name)
+    return time.perf_counter() - stack.pop() if stack else 0.0
+
+
+def install_crewai_listeners() -> None:
+    """
+    Time agent tool calls and LLM calls through CrewAI's event bus. Both run
+    on the agent's thread, so start and end are paired per thread. LLM calls
+    outside a task (memory, evaluation) are labelled stage="other".
+    """
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    _listeners_installed = True
+
+    from crewai.utilities.events import crewai_event_bus
+    from crewai.utilities.events.llm_events import (
+        LLMCallCompletedEvent,
+        LLMCallFailedEvent,
+        LLMCallStartedEvent,
+    )
+    from crewai.utilities.events.tool_usage_events import (
+        ToolUsageErrorEvent,
+        ToolUsageFinishedEvent,
+        ToolUsageStartedEvent,
+    )
+
+    @crewai_event_bus.on(ToolUsageStartedEvent)
+    def _tool_started(source, event):
+        _start("tools", event.tool_name)
+
+    @crewai_event_bus.on(ToolUsageFinishedEvent)
+    def _tool_finished(source, event):
+        observe_tool(event.tool_name, _elapsed("tools", event.tool_name))
+
+    @crewai_event_bus.on(ToolUsageErrorEvent)
+    def _tool_failed(source, event):
+        observe_tool(event.tool_name, _elapsed("tools", event.tool_name), error=True)
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def _llm_started(source, event):
+        _start("llm", "call")
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def _llm_completed(source, event):
+        observe_llm_call(event.task_name or "other", _elapsed("llm", "call"))
+
+    @crewai_event_bus.on(LLMCallFailedEvent)
+    def _llm_failed(source, event):
+        observe_llm_call(
+            event.task_name or "other", _elapsed("llm", "call"), error=True
+        )
@@ -0,0 +1,14 @@
+import os
+from pathlib import Path
+
+# Local on-disk state owned by news_crew (caches, indexes, stores).
+# CrewAI's own memory lives next to it in crewai_storage/ (see crew.py).
+LOCAL_STORE_DIR = Path(
+    os.getenv("NEWS_STORE_DIR", Path(__file__).parent / "local_store")
+)
+
+
+def local_store_path(name: str) -> Path:
+    """Path of a file inside LOCAL_STORE_DIR, creating the directory if needed."""
+    LOCAL_STORE_DIR.mkdir(parents=True, exist_ok=True)
+    return LOCAL_STORE_DIR / name
@@ -60,35 +60,33 @@
 #             "sentiment_distribution": {"Positive": 0, "Neutral": 0, "Negative": 0},
 #             "error": str(e),
 #         }
+import contextvars
 import json
-import re
-from typing import Any, List, Dict, Optional
-from news_crew.crew import NewsCrew
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, List, Dict, Optional, Set, Tuple
+from news_crew import metrics, progress
+from news_crew.article_cache import article_cache
+from news_crew.article_store import article_store
+from news_crew.crew_pool import news_crew_pool, summary_crew_pool
+from news_crew.json_stream import ArticleStreamParser, parse_articles
+from news_crew.knowledge import article_knowledge, validate_articles
+from news_crew.result_cache import normalize_topic, result_cache
+from news_crew.pretrim import estimate_tokens, trim_articles
+from news_crew.scraper import scrape_articles
+from news_crew.stages import (
+    MAX_ARTICLES,
+    clean_articles,
+    dedup_articles,
+    fetch_articles,
+    score_sentiment,
+)
+from news_crew.urls import canonical_url
+from news_crew.vector_index import article_vectors
 
-
-def _strip_code_fences(s: str) -> str:
-    # Remove ```json ... ``` or ``` ... ``` fences
-    s = s.strip()
-    s = re.sub(r"^\s*```[a-zA-Z]*\s*\n", "", s, flags=re.IGNORECASE)
-    s = re.sub(r"\n?\s*```$", "", s)
-    return s.strip()
-
-
-def _try_parse_jsonish(text: str) -> Optional[List[Dict[str, Any]]]:
-    text = _strip_code_fences(text)
-    try:
-        data = json.loads(text)
-        if isinstance(data, list):
-            return data
-        if (
-            isinstance(data, dict)
-            and "articles" in data
-            and isinstance(data["articles"], list)
-        ):
-            return data["articles"]
-    except Exception:
-        pass
-    return None
+# "full": the four-agent crew; "fast": only the summarizer uses the LLM
+PIPELINE_MODES = ("full", "fast")
 
 
 def _from_output_object(output: Any, crew_obj: Any = None) -> List[Dict[str, Any]]:
@@ -98,6 +96,8 @@ def _from_output_object(output: Any, crew_obj: Any = None) -> List[Dict[str, Any
     2) CrewOutput.json_dict / .raw / .pydantic
     3) crew.output.{json_dict, raw, pydantic}
     4) str(output)
+    Text is parsed with news_crew.json_stream, which tolerates fences,
+    trailing commas and a truncated tail.
     """
     # Direct types first
     if isinstance(output, list):
@@ -121,7 +121,7 @@ def _from_output_object(output: Any, crew_obj: Any = None) -> List[Dict[str, Any
         # Raw text
         raw = getattr(obj, "raw", None)
         if isinstance(raw, str):
-            parsed = _try_parse_jsonish(raw)
+            parsed = parse_articles(raw)
             if parsed is not None:
                 return parsed
         # Pydantic model
@@ -139,7 +139,7 @@ def _from_output_object(output: Any, crew_obj: Any = None) -> List[Dict[str, Any
     # Fallback: string representation
     try:
         as_text = str(output)
-        parsed = _try_parse_jsonish(as_text)
+        parsed = parse_articles(as_text)
         if parsed is not None:
             return parsed
     except Exception:
@@ -148,47 +148,555 @@ def _from_output_object(output: Any, crew_obj: Any = None) -> List[Dict[str, Any
     return []
 
 
-def run_news_pipeline(topic: str):
-    """Run NewsCrew and return clean JSON for the frontend."""
-    try:
-        crew = NewsCrew().crew()
-        result = crew.kickoff(inputs={"topic": topic})
+def _run_full_crew(topic: str) -> List[Dict[str, Any]]:
+    """
+    The agent crew, sequentially (the original pipeline). The sentiment
+    task's articles are then validated and written to knowledge memory
+    without another LLM pass (see news_crew.knowledge).
+    """
+    streamed = False
+    sent: Set[str] = set()
+
+    def _on_task_output(name: str, output: Any) -> None:
+        # Stream articles as soon as a task has produced scored articles
+        nonlocal streamed
+        if streamed:
+            return
+        articles = _from_output_object(output)
+        if articles and all("sentiment" in a for a in articles):
+            streamed = True
+            _emit_articles(articles, sent)
+
+    def _on_streamed_article(article: Dict[str, Any]) -> None:
+        # With a streaming LLM, scored articles go out while the model writes
+        if not streamed and "sentiment" in article:
+            _emit_articles([article], sent)
+
+    with news_crew_pool.acquire() as crew:
+        with metrics.track_crew(crew), progress.crew_stages(
+            [t.name for t in crew.tasks]
+        ), progress.on_task_output(_on_task_output), progress.on_llm_stream(
+            ArticleStreamParser(on_article=_on_streamed_article)
+        ):
+            result = crew.kickoff(inputs={"topic": topic})
 
         # Robustly extract the list of article dicts
-        articles_raw = _from_output_object(result, crew_obj=crew)
-
-        # Build sentiment distribution + normalize fields
-        sentiment_counts = {"Positive": 0, "Neutral": 0, "Negative": 0}
-        cleaned_articles: List[Dict[str, Any]] = []
-        for a in articles_raw:
-            sentiment = str(a.get("sentiment", "Neutral")).capitalize()
-            if sentiment not in sentiment_counts:
-                sentiment = "Neutral"
-            sentiment_counts[sentiment] += 1
-
-            cleaned_articles.append(
+        articles = _from_output_object(result, crew_obj=crew)
+
+    with progress.stage("knowledge") as info:
+        articles = validate_articles(articles)
+        info["count"] = _ingest_knowledge(topic, articles)
+
+    if article_cache:
+        # Lets later fast-mode runs skip these articles
+        article_cache.put_many(articles)
+    return articles
+
+
+def _ingest_knowledge(topic: str, articles: List[Dict[str, Any]]) -> int:
+    # Knowledge memory serves later runs: an embedding or storage problem
+    # must not fail this one
+    try:
+        return article_knowledge.ingest(articles, topic)
+    except Exception as e:
+        print(f"⚠️ Could not store articles in knowledge memory for {topic!r}: {e}")
+        return 0
+
+
+def _summarize(
+    topic: str,
+    articles: List[Dict[str, Any]],
+    on_article: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run the summary-only crew and merge summaries back onto the inputs by URL.
+    With a streaming LLM, ``on_article`` receives each summarized input
+    article as soon as the model has written its summary.
+    """
+    if not articles:
+        return []
+    by_url = {a["url"]: a for a in articles}
+
+    def _on_streamed(item: Dict[str, Any]) -> None:
+        source = by_url.get(item.get("url"))
+        if on_article is not None and source is not None and item.get("summary"):
+            on_article({**source, "summary": item["summary"]})
+
+    with progress.stage("trim") as info:
+        # Only the prompt gets the trimmed text: the trim depends on the
+        # headline, and the article cache hashes the page as scraped
+        info["tokens_in"] = sum(estimate_tokens(a.get("content", "")) for a in articles)
+        trimmed = trim_articles(articles)
+        info["tokens_out"] = sum(estimate_tokens(a.get("content", "")) for a in trimmed)
+    # The duplicate list only matters to the client, not to the summarizer
+    prompt_articles = [
+        {k: v for k, v in a.items() if k != "also_reported_by"} for a in trimmed
+    ]
+    with summary_crew_pool.acquire() as crew:
+        with metrics.track_crew(crew), progress.crew_stages(
+            [t.name for t in crew.tasks]
+        ), progress.on_llm_stream(ArticleStreamParser(on_article=_on_streamed)):
+            result = crew.kickoff(
+                inputs={"topic": topic, "articles": json.dumps(prompt_articles)}
+            )
+        summarized = _from_output_object(result, crew_obj=crew)
+
+    # Trust our own metadata over whatever the LLM echoed back
+    summaries = {a.get("url"): a.get("summary", "") for a in summarized}
+    return [
+        {**a, "summary": summaries.get(a["url"]) or a["headline"]} for a in articles
+    ]
+
+
+def _collect_articles(topic: str) -> List[Dict[str, Any]]:
+    """Fetch, clean and dedup a topic's articles: the fast pipeline's input."""
+    with progress.stage("fetch") as info:
+        articles = fetch_articles(topic)
+        info["count"] = len(articles)
+    with progress.stage("clean") as info:
+        articles = clean_articles(articles, max_articles=None)
+        info["count"] = len(articles)
+    with progress.stage("dedup") as info:
+        articles = dedup_articles(articles)
+        info["count"] = len(articles)
+    return articles
+
+
+def _reuse_or_scrape(
+    articles: List[Dict[str, Any]],
+    on_reused: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Cached results by URL for the articles processed before, and the rest,
+    scraped and ready to summarize. ``on_reused`` receives the reused
+    articles, merged with their cached results, as soon as they are known.
+    """
+    with progress.stage("cache") as info:
+        cached = article_cache.get_many(articles) if article_cache else {}
+        info["hits"] = len(cached)
+    if on_reused is not None:
+        on_reused([{**a, **cached[a["url"]]} for a in articles if a["url"] in cached])
+
+    # Only articles we have not processed before are scraped and summarized
+    pending = [a for a in articles if a["url"] not in cached]
+    with progress.stage("scrape") as info:
+        pending = scrape_articles(pending) if pending else []
+        info["count"] = sum(1 for a in pending if a.get("content"))
+    if article_cache and pending:
+        # Same page under a new headline/date: reuse its summary too
+        same_content = article_cache.get_many_by_content(pending)
+        cached.update(same_content)
+        # Re-key under the new fingerprint so the next run skips the scrape
+        article_cache.put_many(
+            {**a, **same_content[a["url"]]} for a in pending if a["url"] in same_content
+        )
+        pending = [a for a in pending if a["url"] not in same_content]
+        if on_reused is not None:
+            on_reused(
+                [
+                    {**a, **same_content[a["url"]]}
+                    for a in articles
+                    if a["url"] in same_content
+                ]
+            )
+    return cached, pending
+
+
+def _run_fast_stages(topic: str) -> List[Dict[str, Any]]:
+    """Fetch, clean, scrape and sentiment as plain Python; the LLM only summarizes."""
+    articles = _collect_articles(topic)
+
+    # Articles are sent to the client as soon as each one is ready
+    sent: Set[str] = set()
+    cached, pending = _reuse_or_scrape(
+        articles, on_reused=lambda ready: _emit_articles(ready, sent)
+    )
+
+    def _on_summary(article: Dict[str, Any]) -> None:
+        _emit_articles(score_sentiment([article]), sent)
+
+    pending = _summarize(topic, pending, on_article=_on_summary)
+    with progress.stage("sentiment") as info:
+        pending = score_sentiment(pending) if pending else []
+        info["count"] = len(pending)
+    if article_cache:
+        article_cache.put_many(pending)
+
+    fresh = {a["url"]: a for a in pending}
+    articles = [
+        {**a, **cached[a["url"]]} if a["url"] in cached else fresh[a["url"]]
+        for a in articles
+    ]
+    _emit_articles(articles, sent)
+    return articles
+
+
+def _normalize_article(a: Dict[str, Any]) -> Dict[str, Any]:
+    sentiment = str(a.get("sentiment", "Neutral")).capitalize()
+    if sentiment not in ("Positive", "Neutral", "Negative"):
+        sentiment = "Neutral"
+
+    article = {
+        "headline": a.get("headline", ""),
+        "summary": a.get("summary", ""),
+        "sentiment": sentiment,
+        "source": a.get("source", ""),
+        "url": a.get("url", ""),
+        "publish_date": a.get("publish_date", ""),
+        # keep confidence if you want to use it later:
+        # "confidence": a.get("confidence")
+    }
+    if a.get("also_reported_by"):
+        article["also_reported_by"] = a["also_reported_by"]
+    return article
+
+
+def _emit_articles(
+    articles: List[Dict[str, Any]], sent: Optional[Set[str]] = None
+) -> None:
+    """Emit article events, skipping (and recording) URLs already in ``sent``."""
+    for a in articles:
+        if sent is not None:
+            key = a.get("url") or a.get("headline", "")
+            if key in sent:
+                continue
+            sent.add(key)
+        progress.emit({"type": "article", "article": _normalize_article(a)})
+
+
+def _build_response(topic: str, articles_raw: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Build sentiment distribution + normalize fields
+    sentiment_counts = {"Positive": 0, "Neutral": 0, "Negative": 0}
+    cleaned_articles: List[Dict[str, Any]] = []
+    for a in articles_raw:
+        article = _normalize_article(a)
+        sentiment_counts[article["sentiment"]] += 1
+        cleaned_articles.append(article)
+
+    return {
+        "topic": topic,
+        "articles": cleaned_articles,
+        "sentiment_distribution": sentiment_counts,
+    }
+
+
+# Embedding summaries for the vector index happens off the request path
+_indexer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector-index")
+
+
+def _store_articles(topic: str, articles_raw: List[Dict[str, Any]]) -> None:
+    # The article store is a record of what we have seen, not part of the
+    # response: a storage problem must not fail the run
+    try:
+        article_store.upsert_many(
+            (
                 {
-                    "headline": a.get("headline", ""),
-                    "summary": a.get("summary", ""),
-                    "sentiment": sentiment,
-                    "source": a.get("source", ""),
-                    "url": a.get("url", ""),
-                    "publish_date": a.get("publish_date", ""),
-                    # keep confidence if you want to use it later:
-                    # "confidence": a.get("confidence")
+                    **_normalize_article(a),
+                    "confidence": a.get("confidence"),
+                    "compound": a.get("compound"),
                 }
-            )
+                for a in articles_raw
+            ),
+            topic=topic,
+        )
+    except Exception as e:
+        print(f"⚠️ Could not store articles for {topic!r}: {e}")
+        return
+    _indexer.submit(_index_articles, [a.get("url", "") for a in articles_raw])
 
-        return {
-            "topic": topic,
-            "articles": cleaned_articles,
-            "sentiment_distribution": sentiment_counts,
-        }
 
+def _index_articles(urls: List[str]) -> None:
+    try:
+        article_vectors.add(
+            [a for a in article_store.get_many(urls) if a.get("summary")]
+        )
     except Exception as e:
-        return {
-            "topic": topic,
-            "articles": [],
-            "sentiment_distribution": {"Positive": 0, "Neutral": 0, "Negative": 0},
-            "error": str(e),
-        }
+        print(f"⚠️ Could not index article summaries: {e}")
+
+
+def _run_pipeline(topic: str, mode: str) -> Dict[str, Any]:
+    # The run's timings travel with the result; run_news_pipeline decides
+    # whether the caller gets them
+    with metrics.collect_run() as timings:
+        try:
+            if mode == "fast":
+                articles_raw = _run_fast_stages(topic)
+            else:
+                articles_raw = _run_full_crew(topic)
+
+            _store_articles(topic, articles_raw)
+            result = _build_response(topic, articles_raw)
+
+        except Exception as e:
+            result = _failed_result(topic, e)
+    result["timings"] = timings
+    return result
+
+
+def _failed_result(topic: str, error: Any) -> Dict[str, Any]:
+    return {
+        "topic": topic,
+        "articles": [],
+        "sentiment_distribution": {"Positive": 0, "Neutral": 0, "Negative": 0},
+        "error": str(error),
+    }
+
+
+def _is_cacheable(result: Dict[str, Any]) -> bool:
+    # Never pin a failed run in the cache
+    return "error" not in result
+
+
+def _finish(
+    result: Dict[str, Any],
+    mode: str,
+    started: float,
+    ran_here: bool,
+    include_timings: bool,
+) -> Dict[str, Any]:
+    """Record the call in the metrics and attach or drop the timings block."""
+    elapsed = time.perf_counter() - started
+    timings = result.pop("timings", None)
+    if not ran_here:
+        # Stored timings belong to whichever run computed the result
+        timings = {"cached": True, "total_ms": round(elapsed * 1000, 1)}
+
+    if "error" in result:
+        outcome = "error"
+    else:
+        outcome = "ok" if ran_here else "cached"
+    metrics.PIPELINE_SECONDS.observe(elapsed, mode=mode, outcome=outcome)
+
+    if include_timings and timings is not None:
+        result["timings"] = timings
+    return result
+
+
+def run_news_pipeline(
+    topic: str,
+    mode: str = "full",
+    use_cache: bool = True,
+    on_event: Optional[progress.EventCallback] = None,
+    include_timings: bool = False,
+    refresh: bool = False,
+):
+    """
+    Run NewsCrew and return clean JSON for the frontend.
+
+    mode="full" runs the agent crew; mode="fast" runs fetch, clean and
+    sentiment as plain Python and only uses the LLM to summarize. Both
+    return the same shape.
+
+    Results are cached per (normalized topic, mode) and concurrent calls for
+    the same key share one run; see news_crew.result_cache. use_cache=False
+    bypasses the cache entirely; refresh=True recomputes even a fresh result
+    and publishes the new one to the cache (see news_crew.scheduler).
+
+    on_event, if given, receives progress events (see news_crew.progress) as
+    stages run and as articles are scored. Callers served from the cache or
+    from another caller's in-flight run only receive the article events.
+
+    include_timings=True adds a "timings" block: wall time per stage and crew
+    task, LLM calls, tokens and cost, tool and external service calls and
+    retries (see news_crew.metrics.collect_run). Callers that did not run
+    the pipeline themselves get {"cached": true, "total_ms": ...}.
+    """
+    if mode not in PIPELINE_MODES:
+        raise ValueError(
+            f"Unknown pipeline mode {mode!r}; expected one of {PIPELINE_MODES}"
+        )
+
+    started = time.perf_counter()
+    if not use_cache:
+        with progress.progress_sink(on_event):
+            result = _run_pipeline(topic, mode)
+        return _finish(result, mode, started, True, include_timings)
+
+    caller = threading.get_ident()
+    ran_here = False
+
+    def _compute() -> Dict[str, Any]:
+        nonlocal ran_here
+        # Background stale-while-revalidate refreshes run on another thread
+        if threading.get_ident() != caller:
+            return _run_pipeline(topic, mode)
+        ran_here = True
+        with progress.progress_sink(on_event):
+            return _run_pipeline(topic, mode)
+
+    key = (normalize_topic(topic), mode)
+    lookup = result_cache.refresh if refresh else result_cache.get_or_compute
+    result = lookup(key, _compute, should_cache=_is_cacheable)
+    # The cached result may come from another caller's spelling of the topic
+    result["topic"] = topic
+
+    if on_event is not None and not ran_here:
+        for article in result["articles"]:
+            on_event({"type": "article", "article": article})
+    return _finish(result, mode, started, ran_here, include_timings)
+
+
+# ---------------- Batches of topics ----------------
+# Articles per summary-crew kickoff in a batch: the size of one topic's run
+BATCH_CHUNK_SIZE = MAX_ARTICLES
+BATCH_FETCH_WORKERS = 8
+
+
+def _summarize_shared(
+    topics: List[str], articles: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Summarize and score one chunk of a batch's shared articles."""
+    articles = _summarize(", ".join(topics), articles)
+    with progress.stage("sentiment") as info:
+        articles = score_sentiment(articles)
+        info["count"] = len(articles)
+    if article_cache:
+        article_cache.put_many(articles)
+    return articles
+
+
+def run_news_batch(
+    topics: List[str],
+    on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    include_timings: bool = False,
+) -> Dict[str, Any]:
+    """
+    Fast-mode results for several topics, sharing the work between them.
+
+    All topics are fetched in parallel. Each unique article across them (by
+    canonical URL) is then looked up in the article cache, scraped,
+    summarized and scored once, however many topics it turns up in.
+    Summaries are written in chunks of BATCH_CHUNK_SIZE articles, the first
+    topic's first, so topics finish one by one instead of all at the end.
+
+    on_result(topic, result), if given, receives each topic's result (the
+    shape run_news_pipeline returns) as soon as all of its articles are
+    ready. Results also go to the result cache, so a fast-mode
+    run_news_pipeline for the same topic is served from there.
+
+    Returns {"results": {topic: result}, "stats": {...}} where stats counts
+    topics, articles, unique articles, cache reuse and summary-crew calls,
+    plus the "timings" block when include_timings=True.
+    """
+    # One run per topic, keeping the first spelling of each
+    unique_topics: Dict[str, str] = {}
+    for topic in topics:
+        if topic.strip():
+            unique_topics.setdefault(normalize_topic(topic), topic)
+    topics = list(unique_topics.values())
+
+    started = time.perf_counter()
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def _finish_topic(topic: str, result: Dict[str, Any]) -> None:
+        results[topic] = result
+        if _is_cacheable(result):
+            result_cache.put((normalize_topic(topic), "fast"), result)
+        if on_result is not None:
+            on_result(topic, result)
+
+    with metrics.collect_run() as timings:
+        # Fetches are I/O bound and rate limited in fetch_engine, not here
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(len(topics), BATCH_FETCH_WORKERS)),
+            thread_name_prefix="batch-fetch",
+        ) as pool:
+            fetches = {
+                topic: pool.submit(
+                    contextvars.copy_context().run, _collect_articles, topic
+                )
+                for topic in topics
+            }
+
+        per_topic: Dict[str, List[Dict[str, Any]]] = {}
+        shared: Dict[str, Dict[str, Any]] = {}
+        topics_of: Dict[str, List[str]] = {}
+        for topic in topics:
+            try:
+                per_topic[topic] = fetches[topic].result()
+            except Exception as e:
+                _finish_topic(topic, _failed_result(topic, e))
+                continue
+            for a in per_topic[topic]:
+                key = canonical_url(a["url"])
+                shared.setdefault(key, a)
+                topics_of.setdefault(key, []).append(topic)
+
+        cached, pending = _reuse_or_scrape(list(shared.values()))
+        # Summary, sentiment, confidence and compound per canonical URL
+        done = {canonical_url(url): result for url, result in cached.items()}
+        failed: Dict[str, str] = {}
+        waiting = list(per_topic)
+
+        def _finish_ready_topics() -> None:
+            for topic in list(waiting):
+                keys = [canonical_url(a["url"]) for a in per_topic[topic]]
+                errors = [failed[key] for key in keys if key in failed]
+                if errors:
+                    waiting.remove(topic)
+                    _finish_topic(topic, _failed_result(topic, errors[0]))
+                elif all(key in done for key in keys):
+                    waiting.remove(topic)
+                    # Each topic keeps its own metadata, e.g. also_reported_by
+                    articles = [
+                        {**a, **done[key]} for a, key in zip(per_topic[topic], keys)
+                    ]
+                    _store_articles(topic, articles)
+                    _finish_topic(topic, _build_response(topic, articles))
+
+        _finish_ready_topics()
+
+        chunks = [
+            pending[i : i + BATCH_CHUNK_SIZE]
+            for i in range(0, len(pending), BATCH_CHUNK_SIZE)
+        ]
+        if chunks:
+            with ThreadPoolExecutor(
+                max_workers=summary_crew_pool.size, thread_name_prefix="batch-summary"
+            ) as pool:
+                futures = {}
+                for chunk in chunks:
+                    # The prompt names the topics the chunk's articles came from
+                    chunk_topics = dict.fromkeys(
+                        t for a in chunk for t in topics_of[canonical_url(a["url"])]
+                    )
+                    future = pool.submit(
+                        contextvars.copy_context().run,
+                        _summarize_shared,
+                        list(chunk_topics),
+                        chunk,
+                    )
+                    futures[future] = chunk
+                for future in as_completed(futures):
+                    try:
+                        for a in future.result():
+                            done[canonical_url(a["url"])] = {
+                                "summary": a.get("summary"),
+                                "sentiment": a.get("sentiment"),
+                                "confidence": a.get("confidence"),
+                                "compound": a.get("compound"),
+                            }
+                    except Exception as e:
+                        for a in futures[future]:
+                            failed[canonical_url(a["url"])] = str(e)
+                    _finish_ready_topics()
+
+    elapsed = time.perf_counter() - started
+    errors = sum(1 for result in results.values() if "error" in result)
+    metrics.PIPELINE_SECONDS.observe(
+        elapsed, mode="batch", outcome="error" if errors else "ok"
+    )
+
+    stats: Dict[str, Any] = {
+        "topics": len(topics),
+        "errors": errors,
+        "articles": sum(len(articles) for articles in per_topic.values()),
+        "unique_articles": len(shared),
+        "reused": len(cached),
+        "summarized": len(pending),
+        "summary_calls": len(chunks),
+        "total_ms": round(elapsed * 1000, 1),
+    }
+    if include_timings:
+        stats["timings"] = timings
+    return {"results": results, "stats": stats}
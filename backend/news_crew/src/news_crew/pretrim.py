@@ -0,0 +1,182 @@
+"""
+Extractive pre-trimming of article content before summarization.
+
+A scraped page is usually far longer than a 2-3 line summary needs, and
+whatever boilerplate survived extraction (share prompts, newsletter
+sign-ups, related-story lists) costs prompt tokens as well. Each article's
+content is split into sentences, the sentences are scored, and only the
+best ones that fit a per-article token budget (NEWS_CONTENT_TOKENS, default
+400; 0 turns trimming off) are kept, in their original order.
+
+A sentence's score adds up:
+
+- centrality: its mean TF-IDF cosine similarity to the other sentences, so
+  sentences about what the page is mostly about rank high and one-off
+  boilerplate ranks low;
+- headline overlap: its TF-IDF cosine similarity to the headline;
+- position: news puts the essentials first, so early sentences get a bonus.
+
+Sentences that appear more than once on the page (menus, repeated prompts)
+and fragments of fewer than MIN_WORDS words are dropped. CPU only, no model.
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+TOKEN_BUDGET = int(os.getenv("NEWS_CONTENT_TOKENS", "400"))
+MIN_WORDS = 5
+
+CENTRALITY_WEIGHT = 0.5
+HEADLINE_WEIGHT = 2.0
+POSITION_WEIGHT = 0.5
+
+# Sentence ends: .!? (plus closing quotes/brackets) before whitespace and an
+# upper-case letter, digit or opening quote; paragraph breaks always split
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"'”’)\]]*\s+(?=[\"“‘'(\[]?[A-Z0-9])")
+_PARAGRAPH = re.compile(r"\n\s*")
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+_STOPWORDS = frozenset("""
+    a about after again against all also an and any are as at be because been
+    before being between both but by can could did do does doing down during
+    each few for from further had has have having he her here hers him his how
+    i if in into is it its itself just me more most my no nor not now of off on
+    once only or other our ours out over own said same says she should so some
+    such than that the their theirs them then there these they this those
+    through to too under until up very was we were what when where which while
+    who whom why will with would you your
+    """.split())
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token for English)."""
+    return (len(text) + 3) // 4
+
+
+def split_sentences(text: str) -> List[str]:
+    sentences = []
+    for paragraph in _PARAGRAPH.split(text.strip()):
+        for sentence in _SENTENCE_END.split(paragraph):
+            sentence = " ".join(sentence.split())
+            if sentence:
+                sentences.append(sentence)
+    return sentences
+
+
+def _terms(text: str) -> List[str]:
+    return [
+        w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS and len(w) > 1
+    ]
+
+
+def _tfidf(docs: Sequence[List[str]], query: List[str]):
+    """L2-normalized TF-IDF rows for ``docs`` and for ``query`` (same IDF)."""
+    vocab: Dict[str, int] = {}
+    for terms in docs:
+        for t in terms:
+            vocab.setdefault(t, len(vocab))
+    counts = np.zeros((len(docs), len(vocab)))
+    for i, terms in enumerate(docs):
+        for t in terms:
+            counts[i, vocab[t]] += 1
+    q = np.zeros(len(vocab))
+    for t in query:
+        if t in vocab:
+            q[vocab[t]] += 1
+
+    df = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(docs)) / (1 + df)) + 1
+    # Sublinear TF: a term repeated in one sentence should not dominate it
+    matrix = np.where(counts > 0, 1 + np.log(np.maximum(counts, 1)), 0) * idf
+    q = np.where(q > 0, 1 + np.log(np.maximum(q, 1)), 0) * idf
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix / np.where(norms > 0, norms, 1)
+    q_norm = np.linalg.norm(q)
+    return matrix, q / q_norm if q_norm > 0 else q
+
+
+def _normalized(values: np.ndarray) -> np.ndarray:
+    top = values.max() if len(values) else 0.0
+    return values / top if top > 0 else values
+
+
+def score_sentences(sentences: Sequence[str], headline: str = "") -> List[float]:
+    """Centrality + headline overlap + position score per sentence."""
+    if not sentences:
+        return []
+    terms = [_terms(s) for s in sentences]
+    matrix, query = _tfidf(terms, _terms(headline))
+    n = len(sentences)
+    similarity = matrix @ matrix.T
+    centrality = (similarity.sum(axis=1) - np.diag(similarity)) / max(n - 1, 1)
+    headline_overlap = matrix @ query
+    position = 1.0 / (1.0 + np.arange(n) / 3.0)
+    scores = (
+        CENTRALITY_WEIGHT * _normalized(centrality)
+        + HEADLINE_WEIGHT * _normalized(headline_overlap)
+        + POSITION_WEIGHT * position
+    )
+    return scores.tolist()
+
+
+def _cut(text: str, max_tokens: int) -> str:
+    # One sentence over the whole budget: keep its first words
+    limit = max_tokens * 4
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0]
+
+
+def trim_text(text: str, headline: str = "", max_tokens: int = TOKEN_BUDGET) -> str:
+    """
+    The highest scoring sentences of ``text`` that fit in ``max_tokens``, in
+    their original order. Text already within the budget is returned as is.
+    """
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text
+    sentences = split_sentences(text)
+    seen: Dict[str, int] = {}
+    for s in sentences:
+        key = s.lower()
+        seen[key] = seen.get(key, 0) + 1
+    candidates = [
+        s for s in sentences if seen[s.lower()] == 1 and len(s.split()) >= MIN_WORDS
+    ]
+    if not candidates:
+        return _cut(" ".join(sentences), max_tokens)
+
+    scores = score_sentences(candidates, headline)
+    ranked = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+    chosen, used = [], 0
+    for i in ranked:
+        # +1 for the joining space
+        cost = estimate_tokens(candidates[i]) + 1
+        if used + cost <= max_tokens:
+            chosen.append(i)
+            used += cost
+    if not chosen:
+        return _cut(candidates[ranked[0]], max_tokens)
+    return " ".join(candidates[i] for i in sorted(chosen))
+
+
+def trim_articles(
+    articles: List[Dict[str, Any]], max_tokens: int = TOKEN_BUDGET
+) -> List[Dict[str, Any]]:
+    """Copies of the articles with their "content" trimmed to ``max_tokens``."""
+    return [
+        (
+            {
+                **a,
+                "content": trim_text(
+                    a["content"], a.get("headline") or "", max_tokens=max_tokens
+                ),
+            }
+            if a.get("content")
+            else a
+        )
+        for a in articles
+    ]
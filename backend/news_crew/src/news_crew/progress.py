@@ -0,0 +1,202 @@
+"""
+Structured progress events for a pipeline run.
+
+A run installs a sink with ``progress_sink(on_event)``; everything executed
+on that thread (plain-Python stages and crew task/step callbacks) reports
+through ``emit``. Crews are built with the module-level ``task_callback`` and
+``step_callback`` so the same crew object can serve many runs. Every stage
+and crew task is also recorded in news_crew.metrics.
+
+Event shapes (all carry "type"):
+    {"type": "stage_started", "stage": str}
+    {"type": "stage_completed", "stage": str, "duration_ms": float, ...}
+        (crew tasks add llm_calls, prompt_tokens, completion_tokens, cost_usd)
+    {"type": "step", "stage": str, "tool": str | None}
+    {"type": "article", "article": {...}}
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from news_crew import metrics
+
+EventCallback = Callable[[Dict[str, Any]], None]
+
+_local = threading.local()
+
+
+@contextmanager
+def progress_sink(on_event: Optional[EventCallback]) -> Iterator[None]:
+    """Route events emitted on this thread to ``on_event`` for the duration."""
+    previous = getattr(_local, "sink", None)
+    _local.sink = on_event
+    try:
+        yield
+    finally:
+        _local.sink = previous
+
+
+def emit(event: Dict[str, Any]) -> None:
+    sink = getattr(_local, "sink", None)
+    if sink is None:
+        return
+    try:
+        sink(event)
+    except Exception:
+        # A broken listener (e.g. a disconnected client) must not fail the run
+        pass
+
+
+@contextmanager
+def stage(name: str, **info: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Emit stage_started/stage_completed around a block. Extra keys put in the
+    yielded dict (e.g. ``count``) are attached to the completion event.
+    """
+    emit({"type": "stage_started", "stage": name, **info})
+    started = time.perf_counter()
+    extra: Dict[str, Any] = {}
+    _local.stage_name = name
+    failed = True
+    try:
+        yield extra
+        failed = False
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe_stage(name, elapsed, error=failed, **extra)
+        emit(
+            {
+                "type": "stage_completed",
+                "stage": name,
+                "duration_ms": round(elapsed * 1000, 1),
+                **extra,
+            }
+        )
+
+
+# ---------------- Crew callbacks ----------------
+@contextmanager
+def crew_stages(task_names: List[str]) -> Iterator[None]:
+    """
+    Track a sequential crew run. CrewAI only reports task completion, so the
+    next task is considered started when the previous one completes.
+    """
+    _local.crew_tasks = list(task_names)
+    _local.crew_task_started = time.perf_counter()
+    if task_names:
+        _local.stage_name = task_names[0]
+        emit({"type": "stage_started", "stage": task_names[0]})
+    try:
+        yield
+    except BaseException:
+        # The task that was running when the crew raised
+        name = getattr(_local, "stage_name", None)
+        if name in _local.crew_tasks:
+            metrics.observe_stage(
+                name, time.perf_counter() - _local.crew_task_started, error=True
+            )
+        raise
+    finally:
+        _local.crew_tasks = None
+
+
+def task_callback(output: Any) -> None:
+    """Crew task_callback: emits completion of one task and start of the next."""
+    tasks = getattr(_local, "crew_tasks", None) or []
+    name = getattr(output, "name", None) or getattr(_local, "stage_name", "task")
+    agent = getattr(output, "agent", None)
+    now = time.perf_counter()
+    started = getattr(_local, "crew_task_started", now)
+    usage = metrics.task_usage(name, agent)
+    metrics.observe_stage(name, now - started, **usage)
+    emit(
+        {
+            "type": "stage_completed",
+            "stage": name,
+            "agent": agent,
+            "duration_ms": round((now - started) * 1000, 1),
+            **usage,
+        }
+    )
+
+    listener = getattr(_local, "task_output_listener", None)
+    if listener is not None:
+        listener(name, output)
+
+    if name in tasks and tasks.index(name) + 1 < len(tasks):
+        next_name = tasks[tasks.index(name) + 1]
+        _local.stage_name = next_name
+        _local.crew_task_started = now
+        emit({"type": "stage_started", "stage": next_name})
+
+
+def step_callback(step: Any) -> None:
+    """Crew step_callback: one event per agent thought/tool step."""
+    emit(
+        {
+            "type": "step",
+            "stage": getattr(_local, "stage_name", None),
+            "tool": getattr(step, "tool", None),
+        }
+    )
+
+
+# ---------------- Streamed LLM output ----------------
+@contextmanager
+def on_llm_stream(parser: Any) -> Iterator[None]:
+    """
+    Feed the LLM output streamed on this thread to ``parser`` (an
+    ArticleStreamParser), resetting it whenever a new LLM call starts. Only
+    agents with a streaming LLM produce chunks; see news_crew.crew.agent_llm.
+    """
+    previous = getattr(_local, "llm_stream", None)
+    _local.llm_stream = parser
+    try:
+        yield
+    finally:
+        _local.llm_stream = previous
+
+
+def _llm_call_started(source: Any, event: Any) -> None:
+    parser = getattr(_local, "llm_stream", None)
+    if parser is not None:
+        parser.reset()
+
+
+def _llm_stream_chunk(source: Any, event: Any) -> None:
+    parser = getattr(_local, "llm_stream", None)
+    if parser is not None:
+        parser.feed(event.chunk)
+
+
+_listeners_installed = False
+
+
+def install_crewai_listeners() -> None:
+    """Route CrewAI's streamed LLM chunks to on_llm_stream parsers (once)."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    _listeners_installed = True
+
+    from crewai.utilities.events import crewai_event_bus
+    from crewai.utilities.events.llm_events import (
+        LLMCallStartedEvent,
+        LLMStreamChunkEvent,
+    )
+
+    crewai_event_bus.register_handler(LLMCallStartedEvent, _llm_call_started)
+    crewai_event_bus.register_handler(LLMStreamChunkEvent, _llm_stream_chunk)
+
+
+@contextmanager
+def on_task_output(listener: Callable[[str, Any], None]) -> Iterator[None]:
+    """Also hand each finished task's (name, TaskOutput) to ``listener``."""
+    previous = getattr(_local, "task_output_listener", None)
+    _local.task_output_listener = listener
+    try:
+        yield
+    finally:
+        _local.task_output_listener = previous
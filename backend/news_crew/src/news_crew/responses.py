@@ -0,0 +1,111 @@
+"""
+JSON responses for clients that poll: ETag revalidation and compression.
+
+A client that sends back the ETag it got (If-None-Match) receives an empty
+304 while nothing changed. Bodies of at least MIN_COMPRESS_BYTES are sent
+brotli-compressed when the client accepts "br" and the brotli package is
+installed, otherwise gzip-compressed when it accepts "gzip".
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+MIN_COMPRESS_BYTES = 1024
+JSON_MEDIA_TYPE = "application/json"
+
+
+def make_etag(*parts: Any) -> str:
+    """A weak ETag over ``parts`` (weak: gzip/brotli/identity bodies share it)."""
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8"))
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _accepted_encodings(request: Request) -> Dict[str, float]:
+    accepted = {}
+    for item in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    return accepted
+
+
+def _compress(request: Request, body: bytes):
+    """(body, content encoding or None) for what the client accepts."""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    accepted = _accepted_encodings(request)
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return brotli.compress(body, quality=5), "br"
+    if accepted.get("gzip", 0) > 0:
+        return gzip.compress(body, compresslevel=6), "gzip"
+    return body, None
+
+
+def _cache_headers(etag: str) -> Dict[str, str]:
+    # Cacheable, but always revalidated
+    return {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """The 304 for ``etag`` if the client already has it, else None."""
+    if _matches(request, etag):
+        return Response(status_code=304, headers=_cache_headers(etag))
+    return None
+
+
+def json_response(
+    request: Request,
+    payload: Any,
+    etag: Optional[str] = None,
+    status_code: int = 200,
+) -> Response:
+    """
+    Compact JSON, compressed as negotiated, with an ETag (over the body
+    unless given) and a 304 when the client already has it.
+    """
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+    etag = etag or make_etag(hashlib.sha256(body).hexdigest())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    headers = _cache_headers(etag)
+    body, encoding = _compress(request, body)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type=JSON_MEDIA_TYPE,
+        headers=headers,
+    )
@@ -0,0 +1,210 @@
+"""
+In-process cache of pipeline results, keyed by normalized topic + config.
+
+- Fresh entries (younger than ``ttl``) are returned directly.
+- Stale entries (up to ``ttl + stale_ttl``) are returned immediately while a
+  single background refresh recomputes them (stale-while-revalidate). At
+  most ``max_refreshes`` refreshes run at once; past that a stale hit starts
+  none and a later one tries again.
+- Concurrent misses for the same key wait on one in-flight computation
+  instead of each starting their own crew run (single-flight).
+- At most ``max_entries`` results are kept; the least recently used go first.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def normalize_topic(topic: str) -> str:
+    """Case-fold and collapse whitespace so "AI  News" and "ai news" share a key."""
+    return " ".join(topic.split()).casefold()
+
+
+class TopicResultCache:
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        stale_ttl: float = 600.0,
+        max_entries: int = 128,
+        max_refreshes: int = 1,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_refreshes = max_refreshes
+
+        self._lock = threading.Lock()
+        # key -> (stored_at, value), oldest use first
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes_dropped": 0,
+        }
+        # Refreshes are whole pipeline runs outside the job pool: bounded, and
+        # dropped rather than queued when every slot is busy
+        self._refresh_slots = threading.BoundedSemaphore(max(max_refreshes, 0))
+        self._refresh_pool = ThreadPoolExecutor(
+            max_workers=max(max_refreshes, 1), thread_name_prefix="cache-refresh"
+        )
+
+    # ---------------- Public API ----------------
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Return a cached value for ``key`` or compute it (once) with ``compute``."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry[0]
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return copy.deepcopy(entry[1])
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._stats["stale_hits"] += 1
+                    if key not in self._inflight:
+                        self._start_background_refresh(key, compute, should_cache)
+                    return copy.deepcopy(entry[1])
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                self._stats["misses"] += 1
+                future = self._inflight[key] = Future()
+                leader = True
+
+        if leader:
+            self._compute_into(key, future, compute, should_cache)
+        return copy.deepcopy(future.result())
+
+    def refresh(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Recompute ``key`` now (joining an in-flight run if there is one)."""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if leader:
+            self._compute_into(key, future, compute, should_cache)
+        return copy.deepcopy(future.result())
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value computed elsewhere (e.g. by a batch run) as fresh."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._store(key, copy.deepcopy(value))
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key`` regardless of age, without side effects."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return copy.deepcopy(entry[1]) if entry is not None else None
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """Seconds since the value for ``key`` was stored; None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return time.monotonic() - entry[0] if entry is not None else None
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or everything when ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "inflight": len(self._inflight),
+            }
+
+    # ---------------- Internals ----------------
+    def _compute_into(
+        self,
+        key: Hashable,
+        future: Future,
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool],
+    ) -> None:
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            if self.ttl > 0 and should_cache(value):
+                self._store(key, value)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        # Caller holds self._lock
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _start_background_refresh(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool],
+    ) -> None:
+        # Caller holds self._lock
+        if not self._refresh_slots.acquire(blocking=False):
+            self._stats["refreshes_dropped"] += 1
+            return
+        future: Future = Future()
+        self._inflight[key] = future
+        self._refresh_pool.submit(self._refresh, key, future, compute, should_cache)
+
+    def _refresh(
+        self,
+        key: Hashable,
+        future: Future,
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool],
+    ) -> None:
+        try:
+            self._compute_into(key, future, compute, should_cache)
+        finally:
+            self._refresh_slots.release()
+
+
+# Shared by every run_news_pipeline call in this process
+result_cache = TopicResultCache(
+    ttl=float(os.getenv("NEWS_CACHE_TTL", "300")),
+    stale_ttl=float(os.getenv("NEWS_CACHE_STALE_TTL", "600")),
+    max_entries=int(os.getenv("NEWS_CACHE_MAX_ENTRIES", "128")),
+    max_refreshes=int(os.getenv("NEWS_CACHE_REFRESH_WORKERS", "1")),
+)
@@ -0,0 +1,330 @@
+"""
+Background refresh of popular topics, so their requests are cache hits.
+
+Topics come from two places:
+
+- tracked: NEWS_SCHEDULE, e.g. "AI=15m, climate change=1h:fast, markets=@hourly"
+  (``topic=interval[:mode]``; intervals are <n>s/m/h/d, @hourly or @daily;
+  mode defaults to NEWS_SCHEDULE_MODE, "full");
+- trending: the topics most requested through the API in the last
+  NEWS_TRENDING_WINDOW seconds (at least NEWS_TRENDING_MIN_REQUESTS
+  requests, top NEWS_TRENDING_TOP). Each is refreshed once its cached result
+  is NEWS_TRENDING_REFRESH_AT of the cache TTL old, so it never goes stale
+  while people keep asking for it.
+
+Runs go through run_news_pipeline(refresh=True), which recomputes the result
+and publishes it to the result cache that serves /api/news. At most
+NEWS_SCHEDULER_CONCURRENCY run at once, none start while user jobs are
+waiting for a worker, and none start once scheduled runs have used
+NEWS_SCHEDULER_TOKEN_BUDGET LLM tokens in the last hour.
+
+To spread refreshes out, tracked topics start at random points over their
+first interval (at most five minutes in), and every next run is due after
+its interval ±NEWS_SCHEDULER_JITTER.
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from news_crew import metrics
+from news_crew.jobs import job_manager
+from news_crew.pipeline import PIPELINE_MODES, run_news_pipeline
+from news_crew.result_cache import normalize_topic, result_cache
+
+Key = Tuple[str, str]
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_ALIASES = {"@hourly": 3600.0, "@daily": 86400.0}
+_INTERVAL = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhd])$")
+
+# Tracked topics' first runs are spread over this much time at most
+_STARTUP_SPREAD = 300.0
+_TOKEN_WINDOW = 3600.0
+
+SCHEDULED_RUNS = metrics.Counter(
+    "news_scheduled_runs",
+    "Background topic refreshes by source and outcome.",
+    ["source", "outcome"],
+)
+
+
+def parse_interval(text: str) -> float:
+    """Seconds in "90s", "15m", "1h", "1d", "@hourly" or "@daily"."""
+    text = text.strip().lower()
+    if text in _ALIASES:
+        return _ALIASES[text]
+    match = _INTERVAL.match(text)
+    if not match or float(match.group(1)) <= 0:
+        raise ValueError(f"Bad schedule interval {text!r}")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+def parse_schedule(text: str, default_mode: str = "full") -> List[Dict[str, Any]]:
+    """Entries of a NEWS_SCHEDULE string: [{topic, interval, mode}]."""
+    entries = []
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        topic, sep, spec = item.rpartition("=")
+        if not sep or not topic.strip():
+            raise ValueError(f"Bad schedule entry {item!r}; expected topic=interval")
+        interval, _, mode = spec.partition(":")
+        mode = mode.strip() or default_mode
+        if mode not in PIPELINE_MODES:
+            raise ValueError(f"Bad schedule mode {mode!r} in {item!r}")
+        entries.append(
+            {
+                "topic": topic.strip(),
+                "interval": parse_interval(interval),
+                "mode": mode,
+            }
+        )
+    return entries
+
+
+class TopicScheduler:
+    def __init__(
+        self,
+        schedule: List[Dict[str, Any]],
+        concurrency: int = 1,
+        token_budget: int = 200_000,
+        jitter: float = 0.1,
+        tick: float = 5.0,
+        trending_window: float = 3600.0,
+        trending_min_requests: int = 3,
+        trending_top: int = 10,
+        trending_refresh_at: float = 0.8,
+    ):
+        self.schedule = schedule
+        self.concurrency = concurrency
+        self.token_budget = token_budget
+        self.jitter = jitter
+        self.tick = tick
+        self.trending_window = trending_window
+        self.trending_min_requests = trending_min_requests
+        self.trending_top = trending_top
+        self.trending_refresh_at = trending_refresh_at
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Recent API requests: (monotonic time, key), oldest first
+        self._requests: Deque[Tuple[float, Key]] = deque(maxlen=10_000)
+        self._spelling: Dict[Key, str] = {}
+        # Scheduled runs' LLM tokens: (monotonic time, tokens)
+        self._tokens: Deque[Tuple[float, int]] = deque()
+        self._running: Set[Key] = set()
+        self._next_due: Dict[Key, float] = {}
+        # Per trending topic: fraction of the TTL at which it is refreshed
+        self._refresh_at: Dict[Key, float] = {}
+        self._stats = {"runs": 0, "errors": 0, "over_budget": 0, "deferred": 0}
+
+    # ---------------- Demand ----------------
+    def record_request(self, topic: str, mode: str) -> None:
+        """Count a user request for trending detection (not scheduled runs)."""
+        key = (normalize_topic(topic), mode)
+        now = time.monotonic()
+        with self._lock:
+            self._requests.append((now, key))
+            self._spelling[key] = topic
+
+    def trending(self) -> List[Tuple[Key, int]]:
+        """Most requested keys in the window, with their request counts."""
+        cutoff = time.monotonic() - self.trending_window
+        with self._lock:
+            while self._requests and self._requests[0][0] < cutoff:
+                self._requests.popleft()
+            counts = Counter(key for _, key in self._requests)
+        return [
+            (key, count)
+            for key, count in counts.most_common(self.trending_top)
+            if count >= self.trending_min_requests
+        ]
+
+    # ---------------- Budget ----------------
+    def _tokens_spent(self, now: float) -> int:
+        with self._lock:
+            while self._tokens and self._tokens[0][0] < now - _TOKEN_WINDOW:
+                self._tokens.popleft()
+            return sum(tokens for _, tokens in self._tokens)
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    # ---------------- Scheduling ----------------
+    def _due(self, now: float) -> List[Tuple[Key, str, str]]:
+        """(key, topic, source) of the runs due now, tracked topics first."""
+        due = []
+        tracked = set()
+        for entry in self.schedule:
+            key = (normalize_topic(entry["topic"]), entry["mode"])
+            tracked.add(key)
+            with self._lock:
+                next_due = self._next_due.setdefault(
+                    key,
+                    now + random.uniform(0, min(entry["interval"], _STARTUP_SPREAD)),
+                )
+            if next_due <= now:
+                due.append((key, entry["topic"], "tracked"))
+
+        if result_cache.ttl > 0:
+            for key, _ in self.trending():
+                if key in tracked:
+                    continue
+                with self._lock:
+                    refresh_at = self._refresh_at.setdefault(
+                        key, self._jittered(self.trending_refresh_at)
+                    )
+                    not_before = self._next_due.get(key, 0.0)
+                    topic = self._spelling.get(key, key[0])
+                age = result_cache.age(key)
+                if not_before > now:
+                    continue
+                if age is None or age >= result_cache.ttl * refresh_at:
+                    due.append((key, topic, "trending"))
+
+        with self._lock:
+            return [item for item in due if item[0] not in self._running]
+
+    def _start_due_runs(self) -> None:
+        now = time.monotonic()
+        for key, topic, source in self._due(now):
+            if not self._slots.acquire(blocking=False):
+                return
+            # User requests come first: wait until none are queued
+            if job_manager.stats()["queued"] > 0:
+                self._slots.release()
+                with self._lock:
+                    self._stats["deferred"] += 1
+                return
+            if self.token_budget and self._tokens_spent(now) >= self.token_budget:
+                self._slots.release()
+                with self._lock:
+                    self._stats["over_budget"] += 1
+                return
+            with self._lock:
+                self._running.add(key)
+            threading.Thread(
+                target=self._run,
+                args=(key, topic, source),
+                name=f"scheduled-{key[0]}",
+                daemon=True,
+            ).start()
+
+    def _interval(self, key: Key) -> float:
+        for entry in self.schedule:
+            if (normalize_topic(entry["topic"]), entry["mode"]) == key:
+                return entry["interval"]
+        return result_cache.ttl
+
+    def _run(self, key: Key, topic: str, source: str) -> None:
+        outcome = "error"
+        tokens = 0
+        try:
+            result = run_news_pipeline(
+                topic, key[1], refresh=True, include_timings=True
+            )
+            llm = result.get("timings", {}).get("llm", {})
+            tokens = llm.get("prompt_tokens", 0) + llm.get("completion_tokens", 0)
+            if "error" not in result:
+                outcome = "ok"
+        except Exception as e:
+            print(f"⚠️ Scheduled refresh of {topic!r} failed: {e}")
+        finally:
+            now = time.monotonic()
+            SCHEDULED_RUNS.inc(source=source, outcome=outcome)
+            with self._lock:
+                self._tokens.append((now, tokens))
+                self._running.discard(key)
+                if source == "tracked":
+                    self._next_due[key] = now + self._jittered(self._interval(key))
+                elif outcome == "error":
+                    # Nothing was cached, so age cannot pace the retries
+                    self._next_due[key] = now + self._jittered(
+                        max(result_cache.ttl, self.tick)
+                    )
+                else:
+                    self._next_due.pop(key, None)
+                # A new refresh point for the next cycle
+                self._refresh_at.pop(key, None)
+                self._stats["runs"] += 1
+                if outcome == "error":
+                    self._stats["errors"] += 1
+            self._slots.release()
+
+    # ---------------- Lifecycle ----------------
+    def _loop(self) -> None:
+        while not self._stop.wait(self.tick):
+            try:
+                self._start_due_runs()
+            except Exception as e:
+                print(f"⚠️ Scheduler tick failed: {e}")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="topic-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop starting runs; runs in progress finish on their own."""
+        self._stop.set()
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        trending = self.trending()
+        tokens = self._tokens_spent(now)
+        with self._lock:
+            due_in = {
+                f"{topic}:{mode}": round(max(0.0, due - now), 1)
+                for (topic, mode), due in self._next_due.items()
+            }
+            return {
+                **self._stats,
+                "tracked": [
+                    {
+                        **entry,
+                        "due_in_s": due_in.get(
+                            f"{normalize_topic(entry['topic'])}:{entry['mode']}"
+                        ),
+                    }
+                    for entry in self.schedule
+                ],
+                "trending": [
+                    {
+                        "topic": self._spelling.get(key, key[0]),
+                        "mode": key[1],
+                        "requests": count,
+                    }
+                    for key, count in trending
+                ],
+                "running": [f"{topic}:{mode}" for topic, mode in sorted(self._running)],
+                "tokens_last_hour": tokens,
+                "token_budget": self.token_budget,
+            }
+
+
+# Shared by the API: it records requests and runs the refreshes
+scheduler = TopicScheduler(
+    parse_schedule(
+        os.getenv("NEWS_SCHEDULE", ""), os.getenv("NEWS_SCHEDULE_MODE", "full")
+    ),
+    concurrency=int(os.getenv("NEWS_SCHEDULER_CONCURRENCY", "1")),
+    token_budget=int(os.getenv("NEWS_SCHEDULER_TOKEN_BUDGET", "200000")),
+    jitter=float(os.getenv("NEWS_SCHEDULER_JITTER", "0.1")),
+    trending_window=float(os.getenv("NEWS_TRENDING_WINDOW", "3600")),
+    trending_min_requests=int(os.getenv("NEWS_TRENDING_MIN_REQUESTS", "3")),
+    trending_top=int(os.getenv("NEWS_TRENDING_TOP", "10")),
+    trending_refresh_at=float(os.getenv("NEWS_TRENDING_REFRESH_AT", "0.8")),
+)
@@ -0,0 +1,220 @@
+"""
+Concurrent article scraping stage for the fast pipeline.
+
+Every URL from the cleaned article list is fetched at once on a thread pool,
+with a global concurrency cap, a per-domain cap, per-request timeouts and
+retries, so the summarizer receives pre-fetched content instead of scraping
+each URL itself one after another. Both caps are process-wide: pipeline
+runs, batches and the agents' content tool all share default_scraper(). By
+default pages are extracted locally (news_crew.extractor), with Hyperbrowser
+only as the fallback.
+"""
+
+import contextvars
+import html
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from news_crew import metrics
+
+# fetch(url, timeout) -> page text
+FetchFn = Callable[[str, float], str]
+
+# Bounds memory and trimming work per page; prompts are bounded by
+# news_crew.pretrim
+MAX_CONTENT_CHARS = 50000
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_hyperbrowser = None
+_hyperbrowser_lock = threading.Lock()
+_scraper: Optional["ConcurrentScraper"] = None
+_scraper_lock = threading.Lock()
+
+
+# ---------------- Fetch backends ----------------
+def hyperbrowser_fetch(url: str, timeout: float) -> str:
+    """
+    Scrape through Hyperbrowser (remote, needs HYPERBROWSER_API_KEY). The SDK
+    call ignores ``timeout``.
+    """
+    global _hyperbrowser
+    with _hyperbrowser_lock:
+        if _hyperbrowser is None:
+            from crewai_tools import HyperbrowserLoadTool
+
+            api_key = os.getenv("HYPERBROWSER_API_KEY")
+            if not api_key:
+                raise RuntimeError(
+                    "HYPERBROWSER_API_KEY not set in environment variables."
+                )
+            _hyperbrowser = HyperbrowserLoadTool(api_key=api_key)
+    return _hyperbrowser._run(url=url, operation="scrape", params={}) or ""
+
+
+def local_fetch(url: str, timeout: float) -> str:
+    """Pooled download + trafilatura extraction, cached, Hyperbrowser fallback."""
+    from news_crew.extractor import content_extractor
+
+    return content_extractor().fetch(url, timeout)
+
+
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers["User-Agent"] = "Mozilla/5.0 (compatible; news-crew/0.1)"
+        return _session
+
+
+def _html_to_text(raw: str) -> str:
+    raw = re.sub(r"(?is)<(script|style|noscript)[^>]*>.*?</\1>", " ", raw)
+    text = re.sub(r"(?s)<[^>]+>", " ", raw)
+    return re.sub(r"\s+", " ", html.unescape(text)).strip()
+
+
+def http_fetch(url: str, timeout: float) -> str:
+    """Plain HTTP GET over a pooled session, with tags stripped."""
+    resp = _get_session().get(url, timeout=timeout)
+    resp.raise_for_status()
+    return _html_to_text(resp.text)
+
+
+FETCH_BACKENDS: Dict[str, FetchFn] = {
+    "local": local_fetch,
+    "hyperbrowser": hyperbrowser_fetch,
+    "http": http_fetch,
+}
+
+
+# ---------------- Scraper ----------------
+class ConcurrentScraper:
+    def __init__(
+        self,
+        fetch: Optional[FetchFn] = None,
+        max_workers: int = 8,
+        per_domain: int = 2,
+        timeout: float = 20.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        deadline: Optional[float] = 90.0,
+    ):
+        self.fetch = fetch or local_fetch
+        self.max_workers = max_workers
+        self.per_domain = per_domain
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        # Wall-clock budget for a whole scrape() call; stragglers count as failed
+        self.deadline = deadline
+
+        # Held per fetch, across every scrape() call on this scraper
+        self._fetch_slots = threading.BoundedSemaphore(max_workers)
+        self._domain_lock = threading.Lock()
+        self._domain_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    @classmethod
+    def from_env(cls) -> "ConcurrentScraper":
+        backend = os.getenv("SCRAPER_BACKEND", "local")
+        if backend not in FETCH_BACKENDS:
+            raise ValueError(
+                f"Unknown SCRAPER_BACKEND {backend!r}; expected one of {list(FETCH_BACKENDS)}"
+            )
+        return cls(
+            fetch=FETCH_BACKENDS[backend],
+            max_workers=int(os.getenv("SCRAPER_MAX_WORKERS", "8")),
+            per_domain=int(os.getenv("SCRAPER_PER_DOMAIN", "2")),
+            timeout=float(os.getenv("SCRAPER_TIMEOUT", "20")),
+            retries=int(os.getenv("SCRAPER_RETRIES", "2")),
+        )
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        domain = urlsplit(url).netloc.lower()
+        with self._domain_lock:
+            slot = self._domain_slots.get(domain)
+            if slot is None:
+                slot = self._domain_slots[domain] = threading.BoundedSemaphore(
+                    self.per_domain
+                )
+            return slot
+
+    def _fetch_one(self, url: str) -> Dict[str, Any]:
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                metrics.observe_retry("scraper")
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                # Domain first, so waiting on a busy domain holds no global slot
+                domain_slot = self._slot(url)
+                with domain_slot, self._fetch_slots, metrics.external_call("scraper"):
+                    content = self.fetch(url, self.timeout)
+                return {"url": url, "content": content or "", "error": None}
+            except Exception as e:
+                last_error = f"{type(e).__name__}: {e}"
+        return {"url": url, "content": "", "error": last_error}
+
+    def scrape(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch all URLs concurrently; returns {url: {url, content, error}}."""
+        unique_urls = [u for u in dict.fromkeys(urls) if u and u != "N/A"]
+        if not unique_urls:
+            return {}
+
+        pool = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(unique_urls)),
+            thread_name_prefix="scraper",
+        )
+        try:
+            futures = {
+                pool.submit(contextvars.copy_context().run, self._fetch_one, u): u
+                for u in unique_urls
+            }
+            done, _ = wait(futures, timeout=self.deadline)
+            results = {}
+            for future, url in futures.items():
+                if future in done:
+                    results[url] = future.result()
+                else:
+                    results[url] = {"url": url, "content": "", "error": "timeout"}
+            return results
+        finally:
+            # Don't block on stragglers past the deadline
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def default_scraper() -> ConcurrentScraper:
+    """The process-wide scraper, configured from the environment on first use."""
+    global _scraper
+    with _scraper_lock:
+        if _scraper is None:
+            _scraper = ConcurrentScraper.from_env()
+        return _scraper
+
+
+def scrape_articles(
+    articles: List[Dict[str, Any]], scraper: Optional[ConcurrentScraper] = None
+) -> List[Dict[str, Any]]:
+    """Return copies of the articles with a "content" field (empty if scraping failed)."""
+    scraper = scraper or default_scraper()
+    pages = scraper.scrape([a.get("url", "") for a in articles])
+    return [
+        {
+            **a,
+            "content": pages.get(a.get("url", ""), {}).get("content", "")[
+                :MAX_CONTENT_CHARS
+            ],
+        }
+        for a in articles
+    ]
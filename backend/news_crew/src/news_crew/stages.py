@@ -0,0 +1,79 @@
+"""
+Deterministic pipeline stages used by the fast pipeline.
+
+These mirror what fetcher_agent, cleaner_agent and sentiment_agent do in the
+full crew, but as plain Python: none of them needs an LLM.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from news_crew.dedup import collapse_duplicates
+from news_crew.fetch_engine import fetch_all
+from news_crew.urls import canonical_url
+from news_crew.tools.vader_scoring import score_articles
+
+# fetcher_agent collects 5-10 articles per topic
+MAX_ARTICLES = 10
+
+
+def fetch_articles(
+    topic: str, related: Sequence[str] = (), max_results: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Fetch raw headlines for a topic (fetcher_agent without the LLM): every
+    search variant runs in parallel, see news_crew.fetch_engine.
+    """
+    return fetch_all(topic, related, max_results=max_results)
+
+
+def clean_articles(
+    articles: List[Dict[str, Any]], max_articles: Optional[int] = MAX_ARTICLES
+) -> List[Dict[str, Any]]:
+    """
+    Normalize fetched articles to {headline, source, url, publish_date} and sort
+    them newest first (cleaner_agent without the LLM). Articles whose URLs are
+    the same once canonicalized are dropped, keeping the first occurrence.
+    The GNews description is kept when present for near-duplicate detection.
+    """
+    cleaned: List[Dict[str, Any]] = []
+    seen_urls = set()
+    for a in articles:
+        url = a.get("url", "")
+        key = canonical_url(url)
+        if key in seen_urls:
+            continue
+        seen_urls.add(key)
+        article = {
+            "headline": a.get("headline", ""),
+            "source": a.get("source", ""),
+            "url": url,
+            "publish_date": a.get("publish_date") or a.get("publishedAt", ""),
+        }
+        if a.get("description"):
+            article["description"] = a["description"]
+        cleaned.append(article)
+
+    # ISO-8601 timestamps sort correctly as strings; missing dates go last
+    cleaned.sort(key=_publish_sort_key, reverse=True)
+    return cleaned[:max_articles]
+
+
+def dedup_articles(
+    articles: List[Dict[str, Any]], max_articles: Optional[int] = MAX_ARTICLES
+) -> List[Dict[str, Any]]:
+    """
+    Collapse syndicated copies of the same story into one article carrying
+    ``also_reported_by`` (see news_crew.dedup), then keep ``max_articles``.
+    Expects cleaned articles, newest first, so the newest copy is kept.
+    """
+    return collapse_duplicates(articles)[:max_articles]
+
+
+def _publish_sort_key(article: Dict[str, Any]) -> str:
+    date = article.get("publish_date") or ""
+    return "" if date == "N/A" else date
+
+
+def score_sentiment(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attach sentiment + confidence from VADER (sentiment_agent without the LLM)."""
+    return score_articles(articles)
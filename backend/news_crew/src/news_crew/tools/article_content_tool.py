@@ -0,0 +1,28 @@
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+from typing import Type
+
+from news_crew.pretrim import trim_text
+from news_crew.scraper import MAX_CONTENT_CHARS, default_scraper
+
+
+class ArticleContentInput(BaseModel):
+    url: str = Field(..., description="URL of the news article to read")
+    headline: str = Field(
+        "", description="The article's headline, to keep the most relevant text"
+    )
+
+
+class ArticleContentTool(BaseTool):
+    name: str = "Article Content Tool"
+    description: str = (
+        "Fetch the main text of a news article by URL (navigation, ads and comments "
+        "removed), cut down to its most relevant sentences. Returns an empty string "
+        "when the page cannot be read."
+    )
+    args_schema: Type[BaseModel] = ArticleContentInput
+
+    def _run(self, url: str, headline: str = "") -> str:
+        # The fast pipeline's scraper: same backend, timeouts, retries and caps
+        page = default_scraper().scrape([url]).get(url, {})
+        return trim_text(page.get("content", "")[:MAX_CONTENT_CHARS], headline)
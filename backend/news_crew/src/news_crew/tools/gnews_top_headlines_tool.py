@@ -1,9 +1,11 @@
 import os
 import requests
-from typing import Type
+from typing import Any, Dict, List, Optional, Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
+from news_crew.fetch_engine import GNewsClient, fetch_all, gnews_client
+
 
 class GNewsTopHeadlinesInput(BaseModel):
     query: str = Field(
@@ -42,35 +44,18 @@ class GNewsTopHeadlinesTool(BaseTool):
         if not api_key:
             return "Error: GNEWS_API_KEY not set in environment variables."
 
-        url = (
-            f"https://gnews.io/api/v4/top-headlines?"
-            f"q={query}&category={category}&lang={lang}&country={country}&max={max_results}&apikey={api_key}"
-        )
-
         try:
-            resp = requests.get(url, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-            articles = data.get("articles", [])
+            results = fetch_top_headlines(
+                query,
+                category=category,
+                lang=lang,
+                country=country,
+                max_results=max_results,
+            )
 
-            if not articles:
+            if not results:
                 return f"No top headlines found for topic '{query}'."
 
-            results = []
-            for art in articles:
-                headline = art.get("title", "N/A")
-                source = art.get("source", {}).get("name", "Unknown Source")
-                link = art.get("url", "N/A")
-                published = art.get("publishedAt", "N/A")
-                results.append(
-                    {
-                        "headline": headline,
-                        "source": source,
-                        "url": link,
-                        "publishedAt": published,
-                    }
-                )
-
             # Return JSON so agents can easily parse
             return {"topic": query, "articles": results}
 
@@ -78,3 +63,71 @@ class GNewsTopHeadlinesTool(BaseTool):
             return {"error": f"Error calling GNews API: {e}"}
         except Exception as e:
             return {"error": f"Unexpected error: {e}"}
+
+
+def fetch_top_headlines(
+    query: str,
+    category: str = "general",
+    lang: str = "en",
+    country: str = "us",
+    max_results: int = 20,
+    api_key: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Call GNews top-headlines and return simplified article dicts.
+
+    Raises requests exceptions on transport/HTTP errors so callers that are not
+    agents (e.g. the fast pipeline) can decide how to surface them.
+    """
+    if api_key:
+        client = GNewsClient(api_key=api_key, rate_limiter=gnews_client.rate_limiter)
+    else:
+        client = gnews_client
+    return client.get_articles(
+        "top-headlines",
+        {
+            "q": query,
+            "category": category,
+            "lang": lang,
+            "country": country,
+            "max": max_results,
+        },
+    )
+
+
+class GNewsMultiQueryInput(BaseModel):
+    query: str = Field(
+        ..., description="The topic or keyword to search news articles for"
+    )
+    related_keywords: List[str] = Field(
+        default_factory=list,
+        description="Optional related keywords/entities; each is searched together with the topic",
+    )
+    max_results: int = Field(20, description="Number of results per search (1–100)")
+
+
+class GNewsMultiQueryTool(BaseTool):
+    name: str = "GNews Multi Query Tool"
+    description: str = (
+        "Fetch news for a topic from GNews in ONE call: today's top headlines, past week, "
+        "past month and topic+keyword searches all run in parallel, merged and deduplicated. "
+        "Returns articles with Headline, Source, URL, Publish Date and description."
+    )
+    args_schema: Type[BaseModel] = GNewsMultiQueryInput
+
+    def _run(
+        self,
+        query: str,
+        related_keywords: Optional[List[str]] = None,
+        max_results: int = 20,
+    ):
+        if not os.getenv("GNEWS_API_KEY"):
+            return "Error: GNEWS_API_KEY not set in environment variables."
+        try:
+            results = fetch_all(query, related_keywords or [], max_results=max_results)
+            if not results:
+                return f"No articles found for topic '{query}'."
+            return {"topic": query, "articles": results}
+        except requests.exceptions.RequestException as e:
+            return {"error": f"Error calling GNews API: {e}"}
+        except Exception as e:
+            return {"error": f"Unexpected error: {e}"}
@@ -1,15 +1,11 @@
 import json
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field, PrivateAttr
-from typing import Type
-import nltk
+from typing import Any, Dict, List, Type, Union
 from nltk.sentiment import SentimentIntensityAnalyzer
 
-# Ensure VADER lexicon is available
-try:
-    nltk.data.find("sentiment/vader_lexicon.zip")
-except LookupError:
-    nltk.download("vader_lexicon")
+# Importing vader_scoring also ensures the VADER lexicon is available
+from news_crew.tools.vader_scoring import classify_compound, score_batch
 
 
 class VaderInput(BaseModel):
@@ -32,16 +28,23 @@ class VaderSentimentTool(BaseTool):
 
     def _run(self, summary: str) -> dict:
         scores = self._analyzer.polarity_scores(summary)
-        compound = scores["compound"]
-
-        if compound >= 0.05:
-            sentiment = "positive"
-        elif compound <= -0.05:
-            sentiment = "negative"
-        else:
-            sentiment = "neutral"
-
-        return {
-            "sentiment": sentiment,
-            "confidence": round(abs(compound), 2),
-        }
+        return classify_compound(scores["compound"])
+
+
+class VaderBatchInput(BaseModel):
+    summaries: List[Union[str, Dict[str, Any]]] = Field(
+        ...,
+        description='All summaries to classify, in article order: plain strings or article objects with a "summary" field',
+    )
+
+
+class VaderBatchSentimentTool(BaseTool):
+    name: str = "VADER Batch Sentiment Tool"
+    description: str = (
+        "Classify sentiment (positive, neutral, negative) of many summaries in one call "
+        "using NLTK VADER. Returns one {sentiment, confidence} per summary, in order."
+    )
+    args_schema: Type[BaseModel] = VaderBatchInput
+
+    def _run(self, summaries: List[Union[str, Dict[str, Any]]]) -> list:
+        return score_batch(summaries)
@@ -1,24 +1,167 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence, Union
+
 import requests
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from requests.adapters import HTTPAdapter
+
+from news_crew import metrics
+from news_crew.paths import local_store_path
+
+
+class EmbeddingCache:
+    """Content-hash keyed embedding cache in a local SQLite file."""
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        keys = list(keys)
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(k, array("f", v).tobytes()) for k, v in items.items()],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _unit_length(vector: List[float]) -> List[float]:
+    norm = math.sqrt(math.fsum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
 
 
 class OllamaEmbeddings:
-    def __init__(self, model="mxbai-embed-large", base_url="http://localhost:11434"):
+    """
+    Embeddings from a local Ollama server.
+
+    - One pooled HTTP session per instance.
+    - Texts are sent in batches of ``batch_size`` to the multi-input
+      ``/api/embed`` endpoint (falling back to one-by-one ``/api/embeddings``
+      on servers that predate it). ``/api/embed`` returns unit-length
+      vectors and ``/api/embeddings`` does not, so the latter are normalized
+      to match: both end up in the same cache and Chroma collections.
+    - Results are cached on disk by sha256(model, text); pass
+      ``cache_path=None`` to disable the cache.
+    """
+
+    def __init__(
+        self,
+        model="mxbai-embed-large",
+        base_url="http://localhost:11434",
+        batch_size: int = 32,
+        cache_path: Optional[Union[str, os.PathLike]] = "default",
+        timeout: float = 60,
+    ):
         self.model = model
-        self.base_url = base_url
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+        if cache_path == "default":
+            cache_path = os.getenv("OLLAMA_EMBED_CACHE") or local_store_path(
+                "embeddings.sqlite3"
+            )
+        self.cache = EmbeddingCache(cache_path) if cache_path else None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._batch_endpoint = True
 
     def embed(self, texts):
         """Return list of embeddings for a string or list of strings"""
         if isinstance(texts, str):
             texts = [texts]
 
+        keys = [EmbeddingCache.key(self.model, text) for text in texts]
+        known = self.cache.get_many(set(keys)) if self.cache else {}
+
+        # Embed each distinct missing text once
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in known and key not in missing:
+                missing[key] = text
+
+        if missing:
+            missing_keys = list(missing)
+            fresh: Dict[str, List[float]] = {}
+            for i in range(0, len(missing_keys), self.batch_size):
+                batch_keys = missing_keys[i : i + self.batch_size]
+                vectors = self._embed_batch([missing[k] for k in batch_keys])
+                fresh.update(zip(batch_keys, vectors))
+            if self.cache:
+                self.cache.put_many(fresh)
+            known.update(fresh)
+
+        return [known[key] for key in keys]
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        if self._batch_endpoint:
+            with metrics.external_call("ollama"):
+                resp = self.session.post(
+                    f"{self.base_url}/api/embed",
+                    json={"model": self.model, "input": texts},
+                    timeout=self.timeout,
+                )
+                if resp.status_code != 404:
+                    resp.raise_for_status()
+                    return resp.json()["embeddings"]
+            # Older Ollama: only the single-prompt endpoint exists
+            self._batch_endpoint = False
+
         embeddings = []
         for text in texts:
-            resp = requests.post(
-                f"{self.base_url}/api/embeddings",
-                json={"model": self.model, "prompt": text},
-                timeout=60,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            embeddings.append(data["embedding"])
+            with metrics.external_call("ollama"):
+                resp = self.session.post(
+                    f"{self.base_url}/api/embeddings",
+                    json={"model": self.model, "prompt": text},
+                    timeout=self.timeout,
+                )
+                resp.raise_for_status()
+                embeddings.append(_unit_length(resp.json()["embedding"]))
         return embeddings
+
+
+class CachedOllamaEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Chroma embedding function backed by OllamaEmbeddings (pooled, batched, cached)."""
+
+    def __init__(self, embeddings: Optional[OllamaEmbeddings] = None):
+        self.embeddings = embeddings or OllamaEmbeddings()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return self.embeddings.embed(list(input))
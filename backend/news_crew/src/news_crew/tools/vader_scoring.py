@@ -0,0 +1,115 @@
+"""
+Batch VADER scoring shared by the sentiment tools and the fast pipeline.
+
+Kept free of crewai imports so process-pool workers start quickly: each
+worker only loads NLTK and builds its SentimentIntensityAnalyzer once.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import nltk
+from nltk.sentiment import SentimentIntensityAnalyzer
+
+# Ensure VADER lexicon is available
+try:
+    nltk.data.find("sentiment/vader_lexicon.zip")
+except LookupError:
+    nltk.download("vader_lexicon")
+
+# Below this many texts a pool costs more than it saves
+PARALLEL_THRESHOLD = int(os.getenv("VADER_PARALLEL_THRESHOLD", "2000"))
+CHUNK_SIZE = 500
+
+_analyzer: Optional[SentimentIntensityAnalyzer] = None
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = Lock()
+
+
+def classify_compound(compound: float) -> Dict[str, Any]:
+    """
+    Map a VADER compound score to the sentiment/confidence the agents use,
+    keeping the compound score itself for the sentiment rollups.
+    """
+    if compound >= 0.05:
+        sentiment = "positive"
+    elif compound <= -0.05:
+        sentiment = "negative"
+    else:
+        sentiment = "neutral"
+
+    return {
+        "sentiment": sentiment,
+        "confidence": round(abs(compound), 2),
+        "compound": round(compound, 4),
+    }
+
+
+def _get_analyzer() -> SentimentIntensityAnalyzer:
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def _score_chunk(texts: Sequence[str]) -> List[Dict[str, Any]]:
+    analyzer = _get_analyzer()
+    return [
+        classify_compound(analyzer.polarity_scores(text)["compound"]) for text in texts
+    ]
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded server process is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=int(os.getenv("VADER_WORKERS", "0")) or None,
+                mp_context=get_context("spawn"),
+                initializer=_get_analyzer,
+            )
+        return _pool
+
+
+def score_texts(
+    texts: Sequence[str], parallel: Optional[bool] = None
+) -> List[Dict[str, Any]]:
+    """
+    Score many texts at once; results are in input order.
+
+    Large batches (>= PARALLEL_THRESHOLD, or parallel=True) are split into
+    chunks and spread across a shared process pool.
+    """
+    texts = [text or "" for text in texts]
+    if parallel is None:
+        parallel = len(texts) >= PARALLEL_THRESHOLD
+    if not parallel or len(texts) <= CHUNK_SIZE:
+        return _score_chunk(texts)
+
+    chunks = [texts[i : i + CHUNK_SIZE] for i in range(0, len(texts), CHUNK_SIZE)]
+    results: List[Dict[str, Any]] = []
+    for chunk_result in _get_pool().map(_score_chunk, chunks):
+        results.extend(chunk_result)
+    return results
+
+
+def score_batch(
+    items: Sequence[Union[str, Dict[str, Any]]], parallel: Optional[bool] = None
+) -> List[Dict[str, Any]]:
+    """Score summaries given either as plain strings or as article dicts."""
+    return score_texts(
+        [item.get("summary", "") if isinstance(item, dict) else item for item in items],
+        parallel=parallel,
+    )
+
+
+def score_articles(
+    articles: Sequence[Dict[str, Any]], parallel: Optional[bool] = None
+) -> List[Dict[str, Any]]:
+    """Return copies of the articles with sentiment + confidence from their "summary"."""
+    scores = score_texts([a.get("summary", "") for a in articles], parallel=parallel)
+    return [{**a, **score} for a, score in zip(articles, scores)]
@@ -0,0 +1,31 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ocid", "cmpid", "smid"}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Canonical form of an article URL, used as its identity across feeds:
+    lower-cased scheme/host without "www.", no fragment, no tracking
+    parameters (utm_* etc.), sorted query, no trailing slash.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+        )
+    )
+    path = parts.path.rstrip("/") or "/"
+    scheme = parts.scheme.lower() or "https"
+    if scheme == "http":
+        # Publishers serve the same article on both
+        scheme = "https"
+    return urlunsplit((scheme, host, path, query, ""))
@@ -0,0 +1,372 @@
+"""
+Vector index over stored article summaries.
+
+Embeddings (OllamaEmbeddings) are L2-normalized on append and written to a
+flat float32 file, one row per article, with the matching article-store ids
+in an int64 sidecar. Both files are memory-mapped for search, so opening a
+large index costs nothing and the OS page cache does the rest. Appends only
+extend the files; a row is never rewritten.
+
+Search is a chunked matrix product of the normalized queries against the
+matrix (cosine similarity) followed by an argpartition top-k per chunk.
+Several queries are answered in one pass over the matrix.
+
+Brute force over float32 is memory-bandwidth bound (a million 1024-d rows is
+4 GB per pass). Once the index outgrows EXACT_SEARCH_MAX_ROWS, a 64-d PCA
+projection is fitted on a sample of the rows and every row is projected into
+a third memory-mapped file, the "sketch". Searches then scan the sketch and
+re-score only the best candidates exactly against their float32 rows.
+Text embeddings keep most of their variance in a few directions, so the
+candidates almost always contain the exact top-k.
+
+Run ``python -m news_crew.vector_index [rows] [dim]`` for a latency and
+recall benchmark on synthetic embeddings.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from news_crew.paths import local_store_path
+from news_crew.tools.ollama_embeddings import OllamaEmbeddings
+
+# Rows scored per matrix product; bounds the temporary score matrix
+SEARCH_CHUNK_ROWS = 131072
+# Past this many rows, search the sketch first and re-score candidates exactly
+EXACT_SEARCH_MAX_ROWS = int(os.getenv("NEWS_VECTOR_EXACT_MAX_ROWS", "100000"))
+SKETCH_DIM = 64
+SKETCH_SAMPLE_ROWS = 50000
+# Candidates re-scored per query: max(k * SKETCH_CANDIDATES_PER_K, SKETCH_MIN_CANDIDATES)
+SKETCH_CANDIDATES_PER_K = 32
+SKETCH_MIN_CANDIDATES = 512
+
+
+class VectorIndex:
+    def __init__(self, directory: Union[str, os.PathLike], name: str = "summaries"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / f"{name}.f32"
+        self._ids_path = self.directory / f"{name}.ids"
+        self._sketch_path = self.directory / f"{name}.sketch.f32"
+        self._projection_path = self.directory / f"{name}.projection.npy"
+        self._meta_path = self.directory / f"{name}.json"
+
+        self._lock = threading.Lock()
+        self.dim: Optional[int] = None
+        self.model: Optional[str] = None
+        if self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text())
+            self.dim, self.model = meta["dim"], meta.get("model")
+        self._projection: Optional[np.ndarray] = None
+        if self._projection_path.exists():
+            self._projection = np.load(self._projection_path)
+
+        # (vectors, ids, sketch or None) memmaps, swapped as one tuple so a
+        # search never sees files of different lengths
+        self._mapped: Optional[Tuple[np.ndarray, np.ndarray, Any]] = None
+        self._map()
+        self._known = set() if self._mapped is None else set(self._mapped[1].tolist())
+
+    def _count(self) -> int:
+        # An interrupted append may leave one file longer; trust the shorter
+        return min(
+            path.stat().st_size // row_bytes if path.exists() else 0
+            for path, row_bytes in (
+                (self._vectors_path, self.dim * 4),
+                (self._ids_path, 8),
+            )
+        )
+
+    def _map(self) -> None:
+        # Caller holds self._lock (or is __init__)
+        count = 0 if self.dim is None else self._count()
+        if count == 0:
+            self._mapped = None
+            return
+        vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim)
+        )
+        ids = np.memmap(self._ids_path, dtype=np.int64, mode="r", shape=(count,))
+        sketch = None
+        if self._projection is not None:
+            self._extend_sketch(vectors)
+            sketch = np.memmap(
+                self._sketch_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(count, self._projection.shape[1]),
+            )
+        self._mapped = (vectors, ids, sketch)
+
+    def _extend_sketch(self, vectors: np.ndarray) -> None:
+        # Project rows the sketch does not cover yet (all of them right after
+        # fitting, the new tail after an append)
+        row_bytes = self._projection.shape[1] * 4
+        done = (
+            self._sketch_path.stat().st_size // row_bytes
+            if self._sketch_path.exists()
+            else 0
+        )
+        with open(self._sketch_path, "ab") as f:
+            f.truncate(min(done, len(vectors)) * row_bytes)
+            for start in range(done, len(vectors), SEARCH_CHUNK_ROWS):
+                chunk = vectors[start : start + SEARCH_CHUNK_ROWS]
+                f.write((chunk @ self._projection).astype(np.float32).tobytes())
+
+    def _fit_projection(self) -> None:
+        # Top principal directions (uncentered: we rank by dot product) of a
+        # sample of the rows
+        vectors = self._mapped[0]
+        rng = np.random.default_rng(0)
+        sample_size = min(SKETCH_SAMPLE_ROWS, len(vectors))
+        sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        _, eigenvectors = np.linalg.eigh(sample.T @ sample)
+        self._projection = np.ascontiguousarray(
+            eigenvectors[:, ::-1][:, :SKETCH_DIM], dtype=np.float32
+        )
+        np.save(self._projection_path, self._projection)
+        self._sketch_path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        mapped = self._mapped
+        return 0 if mapped is None else mapped[1].shape[0]
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._known
+
+    # ---------------- Writes ----------------
+    def append(
+        self,
+        ids: Sequence[int],
+        vectors: Union[np.ndarray, Sequence[Sequence[float]]],
+        model: Optional[str] = None,
+    ) -> int:
+        """
+        Append vectors for ids not already indexed. Returns how many were added.
+        """
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+            raise ValueError("vectors must be a (len(ids), dim) matrix")
+
+        with self._lock:
+            if self.dim is None:
+                self.dim, self.model = int(matrix.shape[1]), model
+                self._write_meta()
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(
+                    f"Vector dimension {matrix.shape[1]} does not match index ({self.dim})"
+                )
+
+            keep, new_ids = [], []
+            for row, item_id in enumerate(ids):
+                if item_id not in self._known:
+                    self._known.add(item_id)
+                    keep.append(row)
+                    new_ids.append(item_id)
+            if not keep:
+                return 0
+
+            # A crash mid-append leaves an orphan tail that _count() ignores
+            # and the next append truncates away
+            count = self._count()
+            for path, row_bytes, data in (
+                (self._vectors_path, self.dim * 4, _normalize(matrix[keep])),
+                (self._ids_path, 8, np.asarray(new_ids, dtype=np.int64)),
+            ):
+                with open(path, "ab") as f:
+                    f.truncate(count * row_bytes)
+                    f.write(data.tobytes())
+            self._map()
+
+            if self._projection is None and len(self) > EXACT_SEARCH_MAX_ROWS:
+                self._fit_projection()
+                self._map()
+            return len(keep)
+
+    def _write_meta(self) -> None:
+        self._meta_path.write_text(json.dumps({"dim": self.dim, "model": self.model}))
+
+    # ---------------- Reads ----------------
+    def search(
+        self, queries: Union[np.ndarray, Sequence[Sequence[float]]], k: int = 10
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Top-``k`` (id, cosine similarity) per query, best first. Accepts a
+        single vector or a (n_queries, dim) matrix.
+        """
+        q = np.asarray(queries, dtype=np.float32)
+        if q.ndim == 1:
+            q = q[None, :]
+        mapped = self._mapped
+        if mapped is None or k <= 0:
+            return [[] for _ in range(q.shape[0])]
+        vectors, ids, sketch = mapped
+        if q.shape[1] != self.dim:
+            raise ValueError(
+                f"Query dimension {q.shape[1]} does not match index ({self.dim})"
+            )
+        q = _normalize(q)
+        k = min(k, len(vectors))
+
+        if sketch is None:
+            best_scores, best_rows = _top_k(vectors, q, k)
+        else:
+            candidates = max(k * SKETCH_CANDIDATES_PER_K, SKETCH_MIN_CANDIDATES)
+            _, candidate_rows = _top_k(sketch, q @ self._projection, candidates)
+            best_scores = np.empty((q.shape[0], k), dtype=np.float32)
+            best_rows = np.empty((q.shape[0], k), dtype=np.int64)
+            for i, rows in enumerate(candidate_rows):
+                rows = np.sort(rows)  # ascending offsets read the memmap in order
+                scores, top = _top_k(vectors[rows], q[i : i + 1], k)
+                best_scores[i], best_rows[i] = scores[0], rows[top[0]]
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        return [
+            [(int(ids[r]), float(s)) for r, s in zip(rows, scores)]
+            for rows, scores in zip(best_rows, best_scores)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        mapped = self._mapped
+        return {
+            "vectors": len(self),
+            "dim": self.dim,
+            "model": self.model,
+            "sketch": mapped is not None and mapped[2] is not None,
+        }
+
+
+def _top_k(
+    matrix: np.ndarray, queries: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (scores, row indices) of the ``k`` highest dot products per query, in no
+    particular order, scanning ``matrix`` in SEARCH_CHUNK_ROWS chunks.
+    """
+    q = queries.T  # (dim, n_queries)
+    k = min(k, matrix.shape[0])
+    best_scores = np.empty((q.shape[1], 0), dtype=np.float32)
+    best_rows = np.empty((q.shape[1], 0), dtype=np.int64)
+    for start in range(0, matrix.shape[0], SEARCH_CHUNK_ROWS):
+        scores = (matrix[start : start + SEARCH_CHUNK_ROWS] @ q).T
+        kk = min(k, scores.shape[1])
+        top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+        best_scores = np.concatenate(
+            [best_scores, np.take_along_axis(scores, top, axis=1)], axis=1
+        )
+        best_rows = np.concatenate([best_rows, top + start], axis=1)
+        if best_scores.shape[1] > k:
+            keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(best_scores, keep, axis=1)
+            best_rows = np.take_along_axis(best_rows, keep, axis=1)
+    return best_scores, best_rows
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def summary_text(article: Dict[str, Any]) -> str:
+    """The text embedded for an article: headline plus summary."""
+    return f"{article.get('headline', '')}\n{article.get('summary', '')}".strip()
+
+
+class ArticleVectors:
+    """The summary index plus the embedder that feeds it."""
+
+    def __init__(self, index: VectorIndex, embeddings: OllamaEmbeddings):
+        self.index = index
+        self.embeddings = embeddings
+
+    def add(self, articles: Sequence[Dict[str, Any]]) -> int:
+        """Embed and append stored articles (dicts with "id") not yet indexed."""
+        pending = [
+            a for a in articles if a.get("id") is not None and a["id"] not in self.index
+        ]
+        if not pending:
+            return 0
+        vectors = self.embeddings.embed([summary_text(a) for a in pending])
+        return self.index.append(
+            [a["id"] for a in pending], vectors, model=self.embeddings.model
+        )
+
+    def similar(self, text: str, k: int = 10) -> List[Tuple[int, float]]:
+        if len(self.index) == 0:
+            return []
+        return self.index.search(self.embeddings.embed(text), k=k)[0]
+
+
+article_vectors = ArticleVectors(
+    VectorIndex(os.getenv("NEWS_VECTOR_DIR") or local_store_path("vectors")),
+    OllamaEmbeddings(
+        model=os.getenv("NEWS_EMBED_MODEL", "mxbai-embed-large"),
+        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+    ),
+)
+
+
+def _benchmark(rows: int = 1_000_000, dim: int = 1024, queries: int = 20) -> dict:
+    """
+    Search latency (ms) and recall@10 against exact search. The synthetic
+    vectors have a power-law spectrum like real text embeddings; uniformly
+    random vectors would make every neighbour equally far away.
+    """
+    rng = np.random.default_rng(0)
+    scale = np.arange(1, dim + 1, dtype=np.float32) ** -0.6
+    rotation = np.linalg.qr(rng.standard_normal((dim, dim)))[0].astype(np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = VectorIndex(tmp, "bench")
+        started = time.perf_counter()
+        for start in range(0, rows, 100_000):
+            count = min(100_000, rows - start)
+            latent = rng.standard_normal((count, dim), dtype=np.float32) * scale
+            index.append(range(start, start + count), latent @ rotation)
+        build_s = time.perf_counter() - started
+
+        vectors = index._mapped[0]
+        q = vectors[rng.integers(0, rows, queries)] + 0.02 * rng.standard_normal(
+            (queries, dim), dtype=np.float32
+        )
+        index.search(q[0])  # fault the files into the page cache
+        single, found = [], []
+        for vector in q:
+            started = time.perf_counter()
+            found.append({i for i, _ in index.search(vector, k=10)[0]})
+            single.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        index.search(q, k=10)
+        batched = (time.perf_counter() - started) * 1000
+
+        _, exact_rows = _top_k(vectors, _normalize(q), 10)
+        recall = np.mean(
+            [len(f & set(r.tolist())) / 10 for f, r in zip(found, exact_rows)]
+        )
+        sketch = index.stats()["sketch"]
+
+    single.sort()
+    return {
+        "rows": rows,
+        "dim": dim,
+        "sketch": sketch,
+        "build_s": round(build_s, 2),
+        "single_query_ms_p50": round(single[len(single) // 2], 2),
+        "single_query_ms_max": round(single[-1], 2),
+        f"batch_of_{queries}_ms": round(batched, 2),
+        "recall_at_10": round(float(recall), 3),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    print(json.dumps(_benchmark(*args), indent=2))
@@ -19,16 +19,17 @@ function App() {
     setSentiment({})
     setLogs([`🔎 Searching for "${topic}"...`])
 
-    // connect to SSE endpoint
+    // connect to SSE endpoint; articles arrive as "article" events, so the
+    // final result does not need to repeat them
     const es = new EventSource(
-      `${API_URL}/api/news-stream?topic=${encodeURIComponent(topic)}`
+      `${API_URL}/api/news-stream?topic=${encodeURIComponent(topic)}&final_articles=false`
     )
 
     es.onmessage = (event) => {
       try {
         // Final result arrives as JSON
         const parsed = JSON.parse(event.data)
-        setArticles(parsed.articles || [])
+        if (parsed.articles) setArticles(parsed.articles)
         setSentiment(parsed.sentiment_distribution || {})
         setLogs((prev) => [...prev, "✅ Pipeline complete"])
         setLoading(false)
@@ -39,6 +40,26 @@ function App() {
       }
     }
 
+    // Structured progress: stage started/completed, with timings
+    es.addEventListener("stage", (event) => {
+      const stage = JSON.parse(event.data)
+      const message =
+        stage.type === "stage_started"
+          ? `⏳ Running ${stage.stage}...`
+          : `✅ ${stage.stage} complete (${(stage.duration_ms / 1000).toFixed(1)}s)`
+      setLogs((prev) => [...prev, message])
+    })
+
+    // Each article arrives as soon as it is summarized and scored
+    es.addEventListener("article", (event) => {
+      const { article } = JSON.parse(event.data)
+      setArticles((prev) => [...prev, article])
+      setSentiment((prev) => ({
+        ...prev,
+        [article.sentiment]: (prev[article.sentiment] || 0) + 1,
+      }))
+    })
+
     es.onerror = (err) => {
       console.error("SSE error:", err)
       setError("Stream error. Please try again.")
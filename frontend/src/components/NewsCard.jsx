@@ -1,5 +1,5 @@
 function NewsCard({ article }) {
-  const { headline, summary, sentiment, source, url, publish_date } = article
+  const { headline, summary, sentiment, source, url, publish_date, also_reported_by } = article
 
   // Badge color mapping
   const sentimentColors = {
@@ -31,6 +31,26 @@ function NewsCard({ article }) {
         <span>{new Date(publish_date).toLocaleString()}</span>
       </div>
 
+      {/* Syndicated copies collapsed by the backend */}
+      {also_reported_by?.length > 0 && (
+        <p className="text-xs text-gray-500 mb-3">
+          Also reported by{" "}
+          {also_reported_by.map((other, i) => (
+            <span key={other.url}>
+              {i > 0 && ", "}
+              <a
+                href={other.url}
+                target="_blank"
+                rel="noopener noreferrer"
+                className="hover:underline"
+              >
+                {other.source}
+              </a>
+            </span>
+          ))}
+        </p>
+      )}
+
       {/* Sentiment Badge */}
       <div>
         <span